@@ -1,6 +1,218 @@
+"""PDF text extraction.
+
+Pages are extracted in page ranges on a process pool; each worker parses the PDF once (pool
+initializer) and then only extracts the pages it is handed. A per-page timeout turns a
+pathological page into an empty page instead of stalling the document. Text is assembled
+in page order as ranges complete, and the [start, end) offset of every page in the final
+text is returned so later stages can map chunks back to pages.
+
+Ranges can also be extracted elsewhere (Celery subtasks, see documents.tasks) with
+page_ranges() / extract_page_range(); their output is passed back in as known_pages.
+
+This module has no Django dependency; caching of extracted pages is done by the caller via
+known_pages / PdfExtraction.extracted.
+"""
+
+import io
+import multiprocessing
+import signal
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
 import PyPDF2
 
-def extract_pdf_text(file_obj):
-    reader = PyPDF2.PdfReader(file_obj)
-    pages = [page.extract_text() for page in reader.pages]
-    return "\n\n".join(p for p in pages if p)
+PAGE_SEPARATOR = "\n\n"
+
+# Bump when the text produced for the same bytes changes; PyPDF2's own text extraction
+# changes between releases, so its version is part of it.
+PDF_EXTRACTOR_VERSION = f"v1-pypdf2-{PyPDF2.__version__}"
+
+# Set in each pool worker by _init_worker; the inline path uses its own reader.
+_worker_reader: Optional[PyPDF2.PdfReader] = None
+
+
+class _PageTimeout(Exception):
+    pass
+
+
+@dataclass
+class PdfExtraction:
+    text: str
+    page_offsets: List[List[int]]
+    timed_out_pages: List[int] = field(default_factory=list)
+    # Pages extracted by this call (index -> text), for the caller to cache.
+    extracted: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.page_offsets)
+
+
+class _InlineExecutor(Executor):
+    """Runs submissions synchronously (small PDFs, or inside daemonic Celery prefork children)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _raise_page_timeout(signum, frame):
+    raise _PageTimeout()
+
+
+@contextmanager
+def _page_deadline(seconds: float) -> Iterator[None]:
+    # SIGALRM only exists on POSIX and can only be handled on the main thread.
+    if (
+        seconds <= 0
+        or not hasattr(signal, "setitimer")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_page_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _init_worker(raw: bytes) -> None:
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(io.BytesIO(raw))
+
+
+def _extract_pages(
+    reader: PyPDF2.PdfReader, indexes: List[int], page_timeout: float
+) -> List[Tuple[int, str, bool]]:
+    """[(page index, text, timed_out)] for the given pages."""
+    results = []
+    for index in indexes:
+        try:
+            with _page_deadline(page_timeout):
+                text = reader.pages[index].extract_text() or ""
+            results.append((index, text, False))
+        except _PageTimeout:
+            results.append((index, "", True))
+    return results
+
+
+def extract_page_range(
+    raw: bytes, indexes: List[int], page_timeout: float = 0
+) -> List[Tuple[int, str, bool]]:
+    """[(page index, text, timed_out)] for some pages of a PDF, parsed here."""
+    return _extract_pages(PyPDF2.PdfReader(io.BytesIO(raw)), indexes, page_timeout)
+
+
+def page_count(raw: bytes) -> int:
+    return len(PyPDF2.PdfReader(io.BytesIO(raw)).pages)
+
+
+def page_ranges(total: int, known: Iterable[int], pages_per_task: int) -> List[List[int]]:
+    """The pages not in ``known``, split into ranges of at most pages_per_task pages."""
+    known = set(known)
+    missing = [index for index in range(total) if index not in known]
+    pages_per_task = max(1, pages_per_task)
+    return [missing[start : start + pages_per_task] for start in range(0, len(missing), pages_per_task)]
+
+
+def _extract_pages_in_worker(indexes: List[int], page_timeout: float) -> List[Tuple[int, str, bool]]:
+    return _extract_pages(_worker_reader, indexes, page_timeout)
+
+
+def _executor(workers: int, raw: bytes, reader: PyPDF2.PdfReader) -> Tuple[Executor, Callable]:
+    # Daemonic processes (Celery prefork children) are not allowed to have children.
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return _InlineExecutor(), lambda indexes, timeout: _extract_pages(reader, indexes, timeout)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(raw,))
+    return pool, _extract_pages_in_worker
+
+
+class _TextAssembler:
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._length = 0
+        self.page_offsets: List[List[int]] = []
+
+    def add(self, text: str) -> None:
+        if not text:
+            self.page_offsets.append([self._length, self._length])
+            return
+        if self._length:
+            self._buffer.write(PAGE_SEPARATOR)
+            self._length += len(PAGE_SEPARATOR)
+        start = self._length
+        self._buffer.write(text)
+        self._length += len(text)
+        self.page_offsets.append([start, self._length])
+
+    def text(self) -> str:
+        return self._buffer.getvalue()
+
+
+def extract_pdf(
+    raw: bytes,
+    *,
+    workers: int = 1,
+    pages_per_task: int = 8,
+    page_timeout: float = 0,
+    known_pages: Optional[Dict[int, str]] = None,
+    on_page: Optional[Callable[[int, int], None]] = None,
+) -> PdfExtraction:
+    reader = PyPDF2.PdfReader(io.BytesIO(raw))
+    total = len(reader.pages)
+    known = dict(known_pages or {})
+    ranges = page_ranges(total, known, pages_per_task)
+
+    extraction = PdfExtraction(text="", page_offsets=[])
+    assembler = _TextAssembler()
+    next_page = 0
+
+    def flush() -> None:
+        nonlocal next_page
+        while next_page < total and next_page in known:
+            assembler.add(known.pop(next_page))
+            next_page += 1
+            if on_page is not None:
+                on_page(next_page, total)
+
+    # No pool for documents that fit in a single task.
+    workers = workers if len(ranges) > 1 else 1
+    executor, extract = _executor(workers, raw, reader)
+    # A bounded window of ranges in flight keeps finished-but-unassembled pages few.
+    pending_ranges = iter(ranges)
+    in_flight: Deque[Future] = deque()
+
+    def submit_next() -> None:
+        indexes = next(pending_ranges, None)
+        if indexes is not None:
+            in_flight.append(executor.submit(extract, indexes, page_timeout))
+
+    with executor:
+        for _ in range(max(1, workers) * 2):
+            submit_next()
+        flush()
+        while in_flight:
+            results = in_flight.popleft().result()
+            submit_next()
+            for index, text, timed_out in results:
+                known[index] = text
+                if timed_out:
+                    extraction.timed_out_pages.append(index)
+                else:
+                    extraction.extracted[index] = text
+            flush()
+
+    extraction.text = assembler.text()
+    extraction.page_offsets = assembler.page_offsets
+    return extraction
@@ -1,10 +1,23 @@
+"""Spreadsheet ingestion into the canonical sheets/rows metadata plus document text.
+
+Readers are streaming: csv.reader runs over a lazily decoded text stream and openpyxl's
+read-only iter_rows yields one row at a time. Each row is turned into its canonical form
+and its text line as it arrives, so no intermediate list of raw rows (or a second pass to
+build the text) is held. What remains in memory is the canonical output itself.
+
+Canonical format v2 is columnar: per sheet a ``columns`` header list, ``row_start`` (the
+row number of the first data row; rows are consecutive) and ``rows`` as plain cell arrays
+with trailing empty cells trimmed. Per-row ``cell_map`` and ``text`` are derived on read
+(row_text). v1 metadata (rows as dicts with row_number/cells/cell_map/text) is still read.
+"""
+
 import csv
-from io import BytesIO, StringIO
-from typing import Dict, List, Tuple
+import io
+from typing import IO, Dict, Iterable, Iterator, List, Tuple
 
 from openpyxl import load_workbook
 
-SPREADSHEET_SCHEMA_VERSION = "v1"
+SPREADSHEET_SCHEMA_VERSION = "v2"
 
 
 def _normalize_cell(value) -> str:
@@ -20,76 +33,104 @@ def _row_text_from_map(cell_map: Dict[str, str]) -> str:
     return ""
 
 
-def _sheet_to_canonical(name: str, rows: List[List[str]]) -> Dict:
-    if not rows:
-        return {"name": name, "columns": [], "rows": []}
-
-    header = [h.strip() for h in rows[0]]
-    data_rows = rows[1:] if any(header) else rows
-    row_start = 2 if any(header) else 1
-
-    canonical_rows: List[Dict] = []
-    for offset, row in enumerate(data_rows, start=row_start):
-        col_count = max(len(row), len(header))
-        cells = [row[idx].strip() if idx < len(row) else "" for idx in range(col_count)]
-
-        cell_map: Dict[str, str] = {}
-        for idx, val in enumerate(cells, start=1):
-            key = header[idx - 1] if idx - 1 < len(header) and header[idx - 1] else f"col_{idx}"
-            cell_map[key] = val
-
-        row_text = _row_text_from_map(cell_map)
-        canonical_rows.append(
-            {
-                "row_number": offset,
-                "cells": cells,
-                "cell_map": cell_map,
-                "text": row_text,
-            }
-        )
-
-    return {"name": name, "columns": header if any(header) else [], "rows": canonical_rows}
-
-
-def _canonical_to_text(metadata: Dict) -> str:
-    parts: List[str] = []
-    for sheet in metadata.get("sheets", []):
-        sheet_name = sheet.get("name") or "Sheet"
-        parts.append(f"[Sheet: {sheet_name}]")
-        for row in sheet.get("rows", []):
-            row_num = row.get("row_number")
-            row_text = row.get("text") or ""
-            if row_text:
-                parts.append(f"Row {row_num}: {row_text}")
-        parts.append("")
-    return "\n".join(parts).strip()
+def row_cell_map(columns: List[str], cells: List[str]) -> Dict[str, str]:
+    col_count = max(len(cells), len(columns))
+    cell_map: Dict[str, str] = {}
+    for idx in range(col_count):
+        key = columns[idx] if idx < len(columns) and columns[idx] else f"col_{idx + 1}"
+        cell_map[key] = cells[idx] if idx < len(cells) else ""
+    return cell_map
+
+
+def row_text(columns: List[str], cells: List[str]) -> str:
+    return _row_text_from_map(row_cell_map(columns, cells))
+
+
+def iter_sheet_rows(sheet: Dict) -> Iterator[Tuple[int, str]]:
+    """(row_number, row text) for a v1 or v2 canonical sheet."""
+    columns = sheet.get("columns") or []
+    row_number = sheet.get("row_start", 1)
+    for row in sheet.get("rows") or []:
+        if isinstance(row, dict):
+            yield row.get("row_number"), row.get("text") or ""
+            continue
+        yield row_number, row_text(columns, row)
+        row_number += 1
+
+
+def _trim(row: List[str]) -> List[str]:
+    end = len(row)
+    while end and not row[end - 1]:
+        end -= 1
+    return row[:end]
+
+
+class _CanonicalBuilder:
+    """Consumes sheets row by row, building the canonical metadata and the document text."""
+
+    def __init__(self) -> None:
+        self.sheets: List[Dict] = []
+        self._text = io.StringIO()
+
+    def _line(self, line: str) -> None:
+        if self._text.tell():
+            self._text.write("\n")
+        self._text.write(line)
+
+    def add_sheet(self, name: str, rows: Iterable[Iterable]) -> None:
+        sheet: Dict = {"name": name, "columns": [], "row_start": 1, "rows": []}
+        self.sheets.append(sheet)
+        self._line(f"[Sheet: {name or 'Sheet'}]")
+
+        row_number = 0
+        for raw_row in rows:
+            row = [_normalize_cell(cell) for cell in raw_row]
+            row_number += 1
+            if row_number == 1 and any(row):
+                sheet["columns"] = row
+                sheet["row_start"] = 2
+                continue
+            row = _trim(row)
+            sheet["rows"].append(row)
+            text = row_text(sheet["columns"], row)
+            if text:
+                self._line(f"Row {row_number}: {text}")
+        self._line("")
+
+    def result(self) -> Tuple[str, Dict]:
+        metadata = {
+            "kind": "spreadsheet",
+            "schema_version": SPREADSHEET_SCHEMA_VERSION,
+            "sheets": self.sheets,
+        }
+        return self._text.getvalue().strip(), metadata
+
+
+def parse_csv_file(file_obj: IO[bytes]) -> Tuple[str, Dict]:
+    stream = io.TextIOWrapper(file_obj, encoding="utf-8-sig", errors="ignore", newline="")
+    try:
+        builder = _CanonicalBuilder()
+        builder.add_sheet("Sheet1", csv.reader(stream))
+        return builder.result()
+    finally:
+        # Leave the caller's file open.
+        stream.detach()
+
+
+def parse_xlsx_file(file_obj: IO[bytes]) -> Tuple[str, Dict]:
+    wb = load_workbook(filename=file_obj, read_only=True, data_only=True)
+    try:
+        builder = _CanonicalBuilder()
+        for ws in wb.worksheets:
+            builder.add_sheet(ws.title, ws.iter_rows(values_only=True))
+        return builder.result()
+    finally:
+        wb.close()
 
 
 def parse_csv_bytes(raw: bytes) -> Tuple[str, Dict]:
-    decoded = raw.decode("utf-8-sig", errors="ignore")
-    reader = csv.reader(StringIO(decoded))
-    rows = [[_normalize_cell(cell) for cell in row] for row in reader]
-
-    metadata = {
-        "kind": "spreadsheet",
-        "schema_version": SPREADSHEET_SCHEMA_VERSION,
-        "sheets": [_sheet_to_canonical("Sheet1", rows)],
-    }
-    return _canonical_to_text(metadata), metadata
+    return parse_csv_file(io.BytesIO(raw))
 
 
 def parse_xlsx_bytes(raw: bytes) -> Tuple[str, Dict]:
-    wb = load_workbook(filename=BytesIO(raw), read_only=True, data_only=True)
-    sheets: List[Dict] = []
-    for ws in wb.worksheets:
-        rows: List[List[str]] = []
-        for row in ws.iter_rows(values_only=True):
-            rows.append([_normalize_cell(cell) for cell in row])
-        sheets.append(_sheet_to_canonical(ws.title, rows))
-
-    metadata = {
-        "kind": "spreadsheet",
-        "schema_version": SPREADSHEET_SCHEMA_VERSION,
-        "sheets": sheets,
-    }
-    return _canonical_to_text(metadata), metadata
+    return parse_xlsx_file(io.BytesIO(raw))
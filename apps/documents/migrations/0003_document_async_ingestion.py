@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_document_ingestion_metadata_document_source_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='ingestion_status',
+            field=models.CharField(choices=[('ingesting', 'Ingesting'), ('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='upload',
+            field=models.FileField(blank=True, null=True, upload_to='uploads/%Y/%m/%d/'),
+        ),
+        migrations.AlterField(
+            model_name='document',
+            name='text',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
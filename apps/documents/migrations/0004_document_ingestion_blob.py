@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_document_async_ingestion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='ingestion_blob',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -8,16 +8,33 @@ class DocumentSourceType(models.TextChoices):
     SPREADSHEET = "spreadsheet", "Spreadsheet"
 
 
+class DocumentIngestionStatus(models.TextChoices):
+    INGESTING = "ingesting", "Ingesting"
+    READY = "ready", "Ready"
+    FAILED = "failed", "Failed"
+
+
 class Document(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     title = models.CharField(max_length=255)
-    text = models.TextField()
+    text = models.TextField(blank=True, default="")
     source_type = models.CharField(
         max_length=20,
         choices=DocumentSourceType.choices,
         default=DocumentSourceType.TEXT,
     )
     ingestion_metadata = models.JSONField(default=dict, blank=True)
+    # SHA-256 of the uploaded bytes (see services.upload_content_hash); empty for text-only documents.
+    content_hash = models.CharField(max_length=64, blank=True, default="", db_index=True)
+    ingestion_status = models.CharField(
+        max_length=20,
+        choices=DocumentIngestionStatus.choices,
+        default=DocumentIngestionStatus.READY,
+    )
+    # Large spreadsheet rows, zlib-compressed JSON (see services.document_ingestion_metadata).
+    ingestion_blob = models.BinaryField(null=True, blank=True, editable=False)
+    # Spooled upload; text extraction reads it in a worker.
+    upload = models.FileField(upload_to="uploads/%Y/%m/%d/", blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -0,0 +1,111 @@
+"""Keyset (cursor) pagination for a run's findings.
+
+Each page is fetched with a WHERE on the last row's (ordering key, id) instead of an
+OFFSET, so deep pages cost the same as the first one and are served from the
+(run, key, id) composite indexes on Finding. Cursors are signed, opaque tokens bound to
+the ordering they were issued for.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional
+
+from django.core import signing
+from django.db.models import F, Q, QuerySet
+
+_CURSOR_SALT = "apps.documents.findings-cursor"
+
+# Ordering key -> whether it can be NULL. Ascending puts NULLs last and descending puts
+# them first, i.e. exact reverses of each other, matching a plain B-tree index scan.
+CURSOR_ORDERINGS = {
+    "created_at": False,
+    "severity": False,
+    "source": False,
+    "confidence": True,
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    rows: List[Any]
+    next_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _split(ordering: str):
+    descending = ordering.startswith("-")
+    return ordering.lstrip("-"), descending
+
+
+def _order_by(ordering: str):
+    field, descending = _split(ordering)
+    if descending:
+        return [F(field).desc(nulls_first=True), F("id").desc()]
+    return [F(field).asc(nulls_last=True), F("id").asc()]
+
+
+def _serialize_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(ordering: str, row: Any) -> str:
+    field, _ = _split(ordering)
+    payload = {"o": ordering, "v": _serialize_value(getattr(row, field)), "id": str(row.pk)}
+    return signing.dumps(payload, salt=_CURSOR_SALT)
+
+
+def decode_cursor(cursor: str, ordering: str) -> dict:
+    try:
+        payload = signing.loads(cursor, salt=_CURSOR_SALT)
+    except signing.BadSignature as exc:
+        raise InvalidCursor("Invalid cursor.") from exc
+    if not isinstance(payload, dict) or payload.get("o") != ordering or "id" not in payload:
+        raise InvalidCursor("Cursor does not match the requested ordering.")
+    field, _ = _split(ordering)
+    if field == "created_at" and payload.get("v") is not None:
+        try:
+            payload["v"] = datetime.fromisoformat(payload["v"])
+        except (TypeError, ValueError) as exc:
+            raise InvalidCursor("Invalid cursor.") from exc
+    return payload
+
+
+def _after(ordering: str, value: Any, last_id: str) -> Q:
+    """Rows strictly after (value, last_id) in the given ordering."""
+    field, descending = _split(ordering)
+    id_after = Q(id__lt=last_id) if descending else Q(id__gt=last_id)
+    nullable = CURSOR_ORDERINGS[field]
+    is_null = Q(**{f"{field}__isnull": True})
+
+    if value is None:
+        # Ascending: NULLs come last, so only NULL rows with a later id remain.
+        # Descending: NULLs come first, so the remaining NULLs plus every non-NULL row.
+        condition = is_null & id_after
+        return condition | ~is_null if descending else condition
+
+    beyond = Q(**{f"{field}__lt" if descending else f"{field}__gt": value})
+    tie = Q(**{field: value}) & id_after
+    condition = beyond | tie
+    if nullable and not descending:
+        condition |= is_null
+    return condition
+
+
+def keyset_page(qs: QuerySet, ordering: str, page_size: int, cursor: Optional[str] = None) -> KeysetPage:
+    qs = qs.order_by(*_order_by(ordering))
+    if cursor:
+        payload = decode_cursor(cursor, ordering)
+        qs = qs.filter(_after(ordering, payload.get("v"), payload["id"]))
+    # One extra row tells us whether another page exists without a COUNT.
+    rows = list(qs[: page_size + 1])
+    next_cursor = encode_cursor(ordering, rows[page_size - 1]) if len(rows) > page_size else None
+    return KeysetPage(rows=rows[:page_size], next_cursor=next_cursor)
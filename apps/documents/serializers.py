@@ -1,11 +1,21 @@
 from rest_framework import serializers
+
 from .models import Document
+from .services import INGESTION_KEY
+
 
 class DocumentUploadSerializer(serializers.Serializer):
     title = serializers.CharField()
     file = serializers.FileField()
+    # Defaults to DOCUMENT_DEDUP_ENABLED.
+    dedup = serializers.BooleanField(required=False, allow_null=True, default=None)
 
 class DocumentSerializer(serializers.ModelSerializer):
+    ingestion = serializers.SerializerMethodField()
+
     class Meta:
         model = Document
-        fields = ["id", "title", "created_at"]
+        fields = ["id", "title", "source_type", "ingestion_status", "ingestion", "created_at"]
+
+    def get_ingestion(self, obj):
+        return (obj.ingestion_metadata or {}).get(INGESTION_KEY)
@@ -0,0 +1,388 @@
+"""Document ingestion: text extraction from a spooled upload.
+
+The upload view stores the file and creates the Document as ``ingesting``; the extraction
+below runs in a Celery worker (see tasks.ingest_document_task). PDFs spanning several page
+ranges are fanned out as one Celery task per range and assembled by a chord callback.
+Progress and timings are kept under ingestion_metadata["ingestion"], which is excluded from
+the review pipeline's document hash. Review runs requested while the document is still
+ingesting stay queued and are enqueued here once the text is ready.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import zlib
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from apps.review.admission import release_run_slot
+from apps.review.models import ReviewRun, ReviewRunStatus
+
+from .ingestion.pdf_reader import (
+    PDF_EXTRACTOR_VERSION,
+    PdfExtraction,
+    extract_page_range,
+    extract_pdf,
+    page_count,
+    page_ranges,
+)
+from .ingestion.spreadsheet_reader import (
+    SPREADSHEET_SCHEMA_VERSION,
+    parse_csv_file,
+    parse_xlsx_file,
+)
+from .models import Document, DocumentIngestionStatus, DocumentSourceType
+
+logger = logging.getLogger(__name__)
+
+INGESTION_KEY = "ingestion"
+
+# Part of every content hash; bump when the hashing itself changes. Extraction output for the
+# same bytes is covered by the extractor / canonical schema version of each source type.
+CONTENT_HASH_VERSION = "v1"
+_EXTRACTOR_VERSIONS = {
+    DocumentSourceType.PDF: PDF_EXTRACTOR_VERSION,
+    DocumentSourceType.SPREADSHEET: SPREADSHEET_SCHEMA_VERSION,
+}
+
+# PDF progress is written every N pages rather than on every page.
+_PROGRESS_EVERY_PAGES = 25
+
+
+def source_type_for(filename: str) -> str:
+    name = (filename or "").lower()
+    if name.endswith(".pdf"):
+        return DocumentSourceType.PDF
+    if name.endswith(".csv") or name.endswith(".xlsx"):
+        return DocumentSourceType.SPREADSHEET
+    return DocumentSourceType.TEXT
+
+
+def _ms_since_start(progress: Dict[str, Any]) -> int:
+    # Wall clock from started_at: a fanned-out PDF finishes in a different task than it started.
+    elapsed = timezone.now() - datetime.fromisoformat(progress["started_at"])
+    return max(0, int(elapsed.total_seconds() * 1000))
+
+
+def _save_progress(doc: Document, progress: Dict[str, Any]) -> None:
+    doc.ingestion_metadata = {**(doc.ingestion_metadata or {}), INGESTION_KEY: progress}
+    Document.objects.filter(id=doc.id).update(ingestion_metadata=doc.ingestion_metadata)
+
+
+def upload_content_hash(file, source_type: str) -> str:
+    """SHA-256 over the uploaded bytes, read in chunks; the file is rewound afterwards."""
+    version = ":".join(filter(None, [CONTENT_HASH_VERSION, _EXTRACTOR_VERSIONS.get(source_type)]))
+    digest = hashlib.sha256(f"{version}:{source_type}:".encode())
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def find_duplicate_document(content_hash: str) -> Optional[Document]:
+    return (
+        Document.objects.filter(content_hash=content_hash)
+        .exclude(ingestion_status=DocumentIngestionStatus.FAILED)
+        # Pages that timed out make the text incomplete; a fresh upload may extract them.
+        .exclude(ingestion_metadata__has_key="timed_out_pages")
+        .defer("text", "ingestion_blob")
+        .order_by("-created_at")
+        .first()
+    )
+
+
+def document_ingestion_metadata(doc: Document) -> Dict[str, Any]:
+    """ingestion_metadata with spreadsheet rows inflated from the side blob when stored there."""
+    metadata = doc.ingestion_metadata or {}
+    if not metadata.get("rows_blob") or not doc.ingestion_blob:
+        return metadata
+    rows = json.loads(zlib.decompress(bytes(doc.ingestion_blob)))
+    sheets = [{**sheet, "rows": sheet_rows} for sheet, sheet_rows in zip(metadata["sheets"], rows)]
+    return {**metadata, "sheets": sheets}
+
+
+def _split_rows_blob(metadata: Dict[str, Any]) -> Optional[bytes]:
+    """Move large spreadsheet rows out of the JSON column into a compressed blob."""
+    threshold = int(getattr(settings, "DOCUMENT_SPREADSHEET_BLOB_MIN_BYTES", 262144))
+    sheets = metadata.get("sheets") or []
+    if threshold <= 0 or not sheets:
+        return None
+    encoded = json.dumps([sheet.get("rows") or [] for sheet in sheets], separators=(",", ":")).encode()
+    if len(encoded) < threshold:
+        return None
+    for sheet in sheets:
+        sheet["row_count"] = len(sheet.pop("rows", None) or [])
+    metadata["rows_blob"] = "zlib"
+    return zlib.compress(encoded)
+
+
+def _pdf_workers() -> int:
+    workers = int(getattr(settings, "DOCUMENT_PDF_WORKERS", 0))
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _page_cache_key(file_hash: str, index: int) -> str:
+    return f"ingest:pdf-page:{PDF_EXTRACTOR_VERSION}:{file_hash}:{index}"
+
+
+def _cached_pdf_pages(cache, file_hash: str) -> Dict[int, str]:
+    known: Dict[int, str] = {}
+    if cache is None:
+        return known
+    # Probe page 0 first so a never-seen file costs one lookup, not one per page.
+    if cache.get(_page_cache_key(file_hash, 0)) is not None:
+        index = 0
+        while True:
+            batch = {_page_cache_key(file_hash, i): i for i in range(index, index + 500)}
+            found = cache.get_many(list(batch))
+            known.update({batch[key]: text for key, text in found.items()})
+            if len(found) < len(batch):
+                break
+            index += len(batch)
+    return known
+
+
+def _pdf_page_cache():
+    ttl = int(getattr(settings, "DOCUMENT_PDF_PAGE_CACHE_TTL_SECONDS", 604800))
+    cache = caches[getattr(settings, "DOCUMENT_PDF_PAGE_CACHE_ALIAS", "pipeline")] if ttl > 0 else None
+    return cache, ttl
+
+
+def _pages_per_task() -> int:
+    return int(getattr(settings, "DOCUMENT_PDF_PAGES_PER_TASK", 8))
+
+
+def _page_timeout() -> float:
+    return float(getattr(settings, "DOCUMENT_PDF_PAGE_TIMEOUT_SECONDS", 10))
+
+
+def _extract_pdf(
+    raw: bytes,
+    progress: Dict[str, Any],
+    on_page: Optional[Callable[[int, int], None]],
+    extracted_pages: Optional[Dict[int, Tuple[str, bool]]] = None,
+) -> PdfExtraction:
+    """
+    Parallel page extraction; pages are cached by (file hash, page index). extracted_pages
+    holds (text, timed_out) for pages already extracted by Celery subtasks; anything still
+    missing (a failed subtask, an evicted cache entry) is extracted here.
+    """
+    cache, ttl = _pdf_page_cache()
+    file_hash = hashlib.sha256(raw).hexdigest()
+    known = _cached_pdf_pages(cache, file_hash)
+    fresh = {index: text for index, (text, timed_out) in (extracted_pages or {}).items() if not timed_out}
+    timed_out = [index for index, (_, flag) in (extracted_pages or {}).items() if flag]
+
+    extraction = extract_pdf(
+        raw,
+        workers=_pdf_workers(),
+        pages_per_task=_pages_per_task(),
+        page_timeout=_page_timeout(),
+        known_pages={**known, **fresh, **dict.fromkeys(timed_out, "")},
+        on_page=on_page,
+    )
+    extraction.extracted.update(fresh)
+    extraction.timed_out_pages = sorted(set(extraction.timed_out_pages).union(timed_out))
+    if cache is not None and extraction.extracted:
+        cache.set_many(
+            {_page_cache_key(file_hash, i): text for i, text in extraction.extracted.items()},
+            timeout=ttl,
+        )
+    progress["pages_cached"] = extraction.page_count - len(extraction.extracted) - len(
+        extraction.timed_out_pages
+    )
+    if extraction.timed_out_pages:
+        progress["pages_timed_out"] = len(extraction.timed_out_pages)
+    return extraction
+
+
+def _extract(
+    doc: Document,
+    progress: Dict[str, Any],
+    on_page: Optional[Callable[[int, int], None]],
+    extracted_pages: Optional[Dict[int, Tuple[str, bool]]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    filename = doc.upload.name.lower()
+    with doc.upload.open("rb") as file_obj:
+        # Spreadsheets are parsed straight from the file, one row at a time.
+        if filename.endswith(".csv"):
+            return parse_csv_file(file_obj)
+        if filename.endswith(".xlsx"):
+            return parse_xlsx_file(file_obj)
+        raw = file_obj.read()
+    if filename.endswith(".pdf"):
+        extraction = _extract_pdf(raw, progress, on_page, extracted_pages)
+        metadata = {
+            "kind": "pdf",
+            "page_count": extraction.page_count,
+            # [start, end) character offsets of each page in Document.text.
+            "page_offsets": extraction.page_offsets,
+        }
+        if extraction.timed_out_pages:
+            metadata["timed_out_pages"] = extraction.timed_out_pages
+        return extraction.text, metadata
+    return raw.decode("utf-8", errors="ignore"), {}
+
+
+def _begin(doc: Document) -> Dict[str, Any]:
+    progress: Dict[str, Any] = dict((doc.ingestion_metadata or {}).get(INGESTION_KEY) or {})
+    progress.update({"stage": "extracting", "started_at": timezone.now().isoformat()})
+    timings = progress.setdefault("timings_ms", {})
+    queued_at = progress.get("queued_at")
+    if queued_at:
+        queue_wait = timezone.now() - datetime.fromisoformat(queued_at)
+        timings["queue_wait"] = max(0, int(queue_wait.total_seconds() * 1000))
+    _save_progress(doc, progress)
+    return progress
+
+
+def _complete(doc: Document, progress: Dict[str, Any], extract: Callable) -> Document:
+    """Run extract(doc, progress, on_page) and store its text, or the failure."""
+    timings = progress.setdefault("timings_ms", {})
+
+    def on_page(done: int, total: int) -> None:
+        if done % _PROGRESS_EVERY_PAGES and done != total:
+            return
+        progress.update({"pages_done": done, "pages_total": total})
+        _save_progress(doc, progress)
+
+    try:
+        text, metadata = extract(doc, progress, on_page)
+    except Exception as exc:
+        logger.exception("Ingestion failed for document %s", doc.id)
+        timings["extract"] = _ms_since_start(progress)
+        progress.update({"stage": "failed", "error": f"{type(exc).__name__}: {exc}"})
+        _finish(doc, DocumentIngestionStatus.FAILED, doc.text, doc.ingestion_metadata, progress)
+        return doc
+
+    timings["extract"] = _ms_since_start(progress)
+    doc.ingestion_blob = _split_rows_blob(metadata) if metadata.get("kind") == "spreadsheet" else None
+    progress.update({"stage": "ready", "completed_at": timezone.now().isoformat()})
+    _finish(doc, DocumentIngestionStatus.READY, text, metadata, progress)
+    return doc
+
+
+def ingest_document(document_id: str) -> Document:
+    """Extract text for an ``ingesting`` document, then release any review runs waiting on it."""
+    doc = Document.objects.get(id=document_id)
+    if doc.ingestion_status != DocumentIngestionStatus.INGESTING:
+        return doc
+    return _complete(doc, _begin(doc), _extract)
+
+
+def _read_upload(doc: Document) -> bytes:
+    with doc.upload.open("rb") as file_obj:
+        return file_obj.read()
+
+
+def plan_pdf_fan_out(document_id: str) -> Optional[List[List[int]]]:
+    """
+    Page ranges to extract as separate Celery tasks, or None when the document is ingested in
+    one piece by ingest_document (not a PDF, fits in one range, or fan-out is disabled).
+    Celery prefork children cannot start a process pool, so this is how a large PDF gets
+    more than one core in a worker deployment.
+    """
+    if not getattr(settings, "DOCUMENT_PDF_CELERY_FAN_OUT", True):
+        return None
+    doc = Document.objects.get(id=document_id)
+    if (
+        doc.ingestion_status != DocumentIngestionStatus.INGESTING
+        or doc.source_type != DocumentSourceType.PDF
+    ):
+        return None
+    try:
+        raw = _read_upload(doc)
+        cache, _ = _pdf_page_cache()
+        known = _cached_pdf_pages(cache, hashlib.sha256(raw).hexdigest())
+        ranges = page_ranges(page_count(raw), known, _pages_per_task())
+    except Exception:
+        # Unreadable files fail in ingest_document, which records the error.
+        return None
+    if len(ranges) <= 1:
+        return None
+    progress = _begin(doc)
+    progress["page_ranges"] = len(ranges)
+    _save_progress(doc, progress)
+    return ranges
+
+
+def extract_pdf_page_range(document_id: str, indexes: List[int]) -> List[Tuple[int, str, bool]]:
+    """One fanned-out range. Errors are logged, not raised: the range is redone when assembling."""
+    try:
+        doc = Document.objects.only("id", "upload").get(id=document_id)
+        return extract_page_range(_read_upload(doc), indexes, _page_timeout())
+    except Exception:
+        logger.exception("Extracting pages %s of document %s failed", indexes, document_id)
+        return []
+
+
+def finish_pdf_fan_out(
+    document_id: str, range_results: List[List[Tuple[int, str, bool]]]
+) -> Document:
+    """Assemble fanned-out ranges in page order and finish ingestion."""
+    doc = Document.objects.get(id=document_id)
+    if doc.ingestion_status != DocumentIngestionStatus.INGESTING:
+        return doc
+    pages = {
+        index: (text, timed_out) for result in range_results for index, text, timed_out in result
+    }
+    progress = dict((doc.ingestion_metadata or {}).get(INGESTION_KEY) or {})
+    return _complete(doc, progress, partial(_extract, extracted_pages=pages))
+
+
+def _finish(
+    doc: Document,
+    status: str,
+    text: str,
+    metadata: Dict[str, Any],
+    progress: Dict[str, Any],
+) -> None:
+    with transaction.atomic():
+        # Same row lock as the review run view takes, so a run is either created before this
+        # commit (and released below) or sees the final status and is enqueued directly.
+        Document.objects.select_for_update().filter(id=doc.id).first()
+        doc.text = text
+        doc.ingestion_metadata = {
+            **{key: value for key, value in (metadata or {}).items() if key != INGESTION_KEY},
+            INGESTION_KEY: progress,
+        }
+        doc.ingestion_status = status
+        doc.save(update_fields=["text", "ingestion_metadata", "ingestion_blob", "ingestion_status"])
+        waiting: List[str] = [
+            str(run_id)
+            for run_id in ReviewRun.objects.filter(
+                document=doc, status=ReviewRunStatus.QUEUED
+            ).values_list("id", flat=True)
+        ]
+        if waiting and status == DocumentIngestionStatus.FAILED:
+            ReviewRun.objects.filter(id__in=waiting).update(
+                status=ReviewRunStatus.FAILED,
+                error=f"Document ingestion failed: {progress.get('error', '')}",
+                completed_at=timezone.now(),
+            )
+
+    if not waiting:
+        return
+    # Imported here: apps.review.tasks pulls in the review pipeline, which imports this module.
+    from apps.review.tasks import process_review_run_task
+
+    for run_id in waiting:
+        if status == DocumentIngestionStatus.FAILED:
+            release_run_slot(run_id)
+            continue
+        try:
+            process_review_run_task.delay(run_id)
+        except Exception as exc:
+            ReviewRun.objects.filter(id=run_id).update(
+                status=ReviewRunStatus.FAILED,
+                error=f"Failed to enqueue review run: {exc}",
+                completed_at=timezone.now(),
+            )
+            release_run_slot(run_id)
@@ -0,0 +1,26 @@
+from celery import chord, shared_task
+
+from .services import extract_pdf_page_range, finish_pdf_fan_out, ingest_document, plan_pdf_fan_out
+
+
+@shared_task
+def ingest_document_task(document_id: str) -> None:
+    ranges = plan_pdf_fan_out(document_id)
+    if ranges is None:
+        ingest_document(document_id)
+        return
+    # One task per page range across the worker pool; the callback gets the results in
+    # header order and assembles the text.
+    chord([extract_pdf_pages_task.s(document_id, indexes) for indexes in ranges])(
+        finish_pdf_ingest_task.s(document_id)
+    )
+
+
+@shared_task
+def extract_pdf_pages_task(document_id: str, indexes: list) -> list:
+    return extract_pdf_page_range(document_id, indexes)
+
+
+@shared_task
+def finish_pdf_ingest_task(range_results: list, document_id: str) -> None:
+    finish_pdf_fan_out(document_id, range_results)
@@ -1,15 +1,78 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+import time
+import warnings
+from datetime import timedelta
 from io import BytesIO
+from unittest.mock import patch
 
+from django.core.cache import caches
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.db import connection
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from openpyxl import Workbook
+from PyPDF2 import PageObject, PdfWriter
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
 from rest_framework.test import APIClient
 
+from apps.documents.ingestion.pdf_reader import PAGE_SEPARATOR, extract_page_range, extract_pdf
+from apps.documents.ingestion.spreadsheet_reader import (
+    iter_sheet_rows,
+    parse_csv_file,
+    parse_xlsx_file,
+    row_cell_map,
+)
 from apps.documents.models import Document
+from apps.documents.services import (
+    document_ingestion_metadata,
+    find_duplicate_document,
+    ingest_document,
+    upload_content_hash,
+)
+from apps.documents.tasks import ingest_document_task
 from apps.review.models import Finding, ReviewRun
+from apps.review.preprocessing import preprocess_document_to_chunks
+from apps.review.services import build_pipeline_cache_key
+from apps.review.tasks import process_review_run_task
 
+_MEDIA_ROOT = tempfile.mkdtemp()
 
+
+def _pdf_bytes(page_texts):
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for text in page_texts:
+        page = PageObject.create_blank_page(width=612, height=792)
+        content = DecodedStreamObject()
+        content.set_data(f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode())
+        page[NameObject("/Contents")] = content
+        page[NameObject("/Resources")] = DictionaryObject(
+            {NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})}
+        )
+        writer.add_page(page)
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+@override_settings(CELERY_TASK_ALWAYS_EAGER=True, MEDIA_ROOT=_MEDIA_ROOT)
 class DocumentAPITests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(_MEDIA_ROOT, ignore_errors=True)
+
     def setUp(self):
         self.client = APIClient()
 
@@ -34,6 +97,19 @@ class DocumentAPITests(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(resp.data["run"], None)
         self.assertEqual(resp.data["findings"], [])
+        self.assertEqual(
+            resp.data["pagination"],
+            {
+                "page_size": 50,
+                "ordering": "created_at",
+                "next_cursor": None,
+                "has_next": False,
+                "total": None,
+            },
+        )
+
+        legacy = self.client.get(f"/v1/documents/{doc.id}/findings?page=1")
+        self.assertEqual(legacy.data["pagination"]["total_pages"], 0)
 
     def test_upload_csv_document_creates_spreadsheet_record(self):
         upload = SimpleUploadedFile(
@@ -83,6 +159,72 @@ class DocumentAPITests(TestCase):
         self.assertIn("Terms", [s["name"] for s in doc.ingestion_metadata.get("sheets", [])])
         self.assertIn("[Sheet: Terms]", doc.text)
 
+    def _upload_bytes(self, name, content, **extra):
+        with patch("apps.documents.views.ingest_document_task.delay") as delay:
+            resp = self.client.post(
+                "/v1/documents/upload",
+                {"title": name, "file": SimpleUploadedFile(name, content), **extra},
+                format="multipart",
+            )
+        return resp, delay
+
+    def test_upload_content_hash_keys_the_pipeline_cache(self):
+        first, _ = self._upload_bytes("a.txt", b"Termination: thirty days notice.")
+        second, _ = self._upload_bytes("b.txt", b"Termination: thirty days notice.")
+        other, _ = self._upload_bytes("c.txt", b"Termination: sixty days notice.")
+        docs = [Document.objects.get(id=resp.data["id"]) for resp in (first, second, other)]
+
+        self.assertNotEqual(docs[0].id, docs[1].id)
+        self.assertEqual(len(docs[0].content_hash), 64)
+        self.assertEqual(docs[0].content_hash, docs[1].content_hash)
+        self.assertNotEqual(docs[0].content_hash, docs[2].content_hash)
+        self.assertEqual(build_pipeline_cache_key(docs[0]), build_pipeline_cache_key(docs[1]))
+        self.assertIn(docs[0].content_hash, build_pipeline_cache_key(docs[0]))
+
+    def test_content_hash_tracks_extractor_version_and_incomplete_pdf_text(self):
+        upload = SimpleUploadedFile("a.csv", b"Clause,Text\nTermination,thirty days")
+        with patch.dict("apps.documents.services._EXTRACTOR_VERSIONS", {"spreadsheet": "v-next"}):
+            bumped = upload_content_hash(upload, "spreadsheet")
+        self.assertNotEqual(upload_content_hash(upload, "spreadsheet"), bumped)
+
+        partial_metadata = {"kind": "pdf", "page_count": 2, "timed_out_pages": [1]}
+        complete = Document.objects.create(title="a.pdf", text="Page one.\n\nPage two.", content_hash="f" * 64)
+        partial = Document.objects.create(
+            title="b.pdf", text="Page one.", content_hash="f" * 64, ingestion_metadata=partial_metadata
+        )
+        self.assertIn("f" * 64, build_pipeline_cache_key(complete))
+        self.assertNotIn("f" * 64, build_pipeline_cache_key(partial))
+        self.assertNotEqual(
+            build_pipeline_cache_key(partial),
+            build_pipeline_cache_key(
+                Document(text="Page two.", content_hash="f" * 64, ingestion_metadata=partial_metadata)
+            ),
+        )
+        # An incomplete extraction is never handed out as the deduplicated document.
+        complete.delete()
+        self.assertIsNone(find_duplicate_document("f" * 64))
+
+    def test_dedup_upload_returns_existing_document_and_latest_run(self):
+        original, _ = self._upload_bytes("a.txt", b"Confidentiality clause.")
+        doc = Document.objects.get(id=original.data["id"])
+        ReviewRun.objects.create(document=doc, status="failed")
+        succeeded = ReviewRun.objects.create(document=doc, status="succeeded")
+
+        resp, delay = self._upload_bytes("renamed.txt", b"Confidentiality clause.", dedup="true")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.data["deduplicated"])
+        self.assertEqual(resp.data["id"], str(doc.id))
+        self.assertEqual(resp.data["latest_run"]["id"], str(succeeded.id))
+        delay.assert_not_called()
+        self.assertEqual(Document.objects.count(), 1)
+
+        with self.settings(DOCUMENT_DEDUP_ENABLED=True):
+            resp, _ = self._upload_bytes("new.txt", b"Different clause.")
+        self.assertEqual(resp.status_code, 202)
+        self.assertFalse(resp.data["deduplicated"])
+        self.assertIsNone(resp.data["latest_run"])
+
     def test_findings_endpoint_supports_pagination(self):
         doc = Document.objects.create(title="Paged Findings", text="Simple contract body.")
         run = ReviewRun.objects.create(document=doc, status="succeeded")
@@ -150,3 +292,472 @@ class DocumentAPITests(TestCase):
         self.assertEqual(resp.status_code, 200)
         severities = [row["severity"] for row in resp.data["findings"]]
         self.assertEqual(severities, ["high", "low", "medium"])
+
+    def _walk_cursor_pages(self, doc, run, ordering, page_size=2):
+        seen = []
+        params = {"run_id": str(run.id), "ordering": ordering, "page_size": page_size}
+        while True:
+            resp = self.client.get(f"/v1/documents/{doc.id}/findings", params)
+            self.assertEqual(resp.status_code, 200)
+            self.assertIsNone(resp.data["pagination"]["total"])
+            seen.extend(row["id"] for row in resp.data["findings"])
+            if not resp.data["pagination"]["has_next"]:
+                return seen
+            params["cursor"] = resp.data["pagination"]["next_cursor"]
+
+    def test_findings_cursor_pages_cover_every_ordering_without_gaps(self):
+        doc = Document.objects.create(title="Cursor Findings", text="Simple contract body.")
+        run = ReviewRun.objects.create(document=doc, status="succeeded")
+        confidences = [0.9, None, 0.5, 0.9, None, 0.1, 0.5]
+        for idx, confidence in enumerate(confidences):
+            Finding.objects.create(
+                document=doc,
+                run=run,
+                clause_id=f"c-{idx}",
+                summary=f"Finding {idx}",
+                severity=["low", "medium", "high"][idx % 3],
+                evidence=f"Evidence {idx}",
+                source=["rule", "llm"][idx % 2],
+                confidence=confidence,
+            )
+
+        for ordering in ["created_at", "-created_at", "severity", "-severity", "source", "confidence", "-confidence"]:
+            with self.subTest(ordering=ordering):
+                seen = self._walk_cursor_pages(doc, run, ordering)
+                self.assertEqual(len(seen), len(confidences))
+                self.assertEqual(len(set(seen)), len(confidences))
+
+        by_id = {str(f.id): f.confidence for f in Finding.objects.filter(run=run)}
+        ascending = [by_id[fid] for fid in self._walk_cursor_pages(doc, run, "confidence")]
+        self.assertEqual(ascending, [0.1, 0.5, 0.5, 0.9, 0.9, None, None])
+        descending = [by_id[fid] for fid in self._walk_cursor_pages(doc, run, "-confidence")]
+        self.assertEqual(descending, [None, None, 0.9, 0.9, 0.5, 0.5, 0.1])
+
+    def test_findings_cursor_total_is_opt_in_and_cursors_are_validated(self):
+        doc = Document.objects.create(title="Cursor Totals", text="Simple contract body.")
+        run = ReviewRun.objects.create(document=doc, status="succeeded")
+        for idx in range(3):
+            Finding.objects.create(
+                document=doc,
+                run=run,
+                summary=f"Finding {idx}",
+                severity="low",
+                evidence=f"Evidence {idx}",
+                source="rule",
+            )
+
+        resp = self.client.get(
+            f"/v1/documents/{doc.id}/findings",
+            {"run_id": str(run.id), "page_size": 2, "include_total": "1"},
+        )
+        self.assertEqual(resp.data["pagination"]["total"], 3)
+        cursor = resp.data["pagination"]["next_cursor"]
+
+        mismatched = self.client.get(
+            f"/v1/documents/{doc.id}/findings",
+            {"run_id": str(run.id), "cursor": cursor, "ordering": "severity"},
+        )
+        self.assertEqual(mismatched.status_code, 400)
+        tampered = self.client.get(
+            f"/v1/documents/{doc.id}/findings",
+            {"run_id": str(run.id), "cursor": cursor[:-2] + "xx"},
+        )
+        self.assertEqual(tampered.status_code, 400)
+
+    def test_finished_run_findings_support_conditional_get(self):
+        doc = Document.objects.create(title="Conditional Findings", text="Simple contract body.")
+        run = ReviewRun.objects.create(document=doc, status="succeeded", completed_at=timezone.now())
+        Finding.objects.create(
+            document=doc,
+            run=run,
+            summary="Finding",
+            severity="low",
+            evidence="Evidence",
+            source="rule",
+        )
+        url = f"/v1/documents/{doc.id}/findings"
+
+        first = self.client.get(url, {"run_id": str(run.id)})
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        self.assertTrue(first["Last-Modified"])
+
+        with self.assertNumQueries(2):  # document + run lookups only
+            revalidated = self.client.get(url, {"run_id": str(run.id)}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated["ETag"], etag)
+
+        with self.assertNumQueries(2):  # served from the response cache
+            cached = self.client.get(url, {"run_id": str(run.id)})
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.data, first.data)
+
+        other_page = self.client.get(url, {"run_id": str(run.id), "ordering": "-created_at"})
+        self.assertNotEqual(other_page["ETag"], etag)
+
+        # Reprocessing moves completed_at, which invalidates the validator.
+        run.completed_at = timezone.now() + timedelta(seconds=5)
+        run.save(update_fields=["completed_at"])
+        stale = self.client.get(url, {"run_id": str(run.id)}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(stale.status_code, 200)
+        self.assertNotEqual(stale["ETag"], etag)
+
+    def test_in_progress_run_findings_are_not_cached(self):
+        doc = Document.objects.create(title="Running Findings", text="Simple contract body.")
+        run = ReviewRun.objects.create(document=doc, status="running")
+        resp = self.client.get(f"/v1/documents/{doc.id}/findings", {"run_id": str(run.id)})
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("ETag", resp)
+
+    def test_findings_sparse_fieldsets_project_columns(self):
+        doc = Document.objects.create(title="Sparse Findings", text="Simple contract body.")
+        run = ReviewRun.objects.create(document=doc, status="running")
+        Finding.objects.create(
+            document=doc,
+            run=run,
+            clause_heading="Termination",
+            clause_body="Either party may terminate with notice.",
+            summary="Termination risk",
+            explanation="Explanation",
+            severity="high",
+            evidence="Evidence",
+            source="rule",
+            embedding=[0.1, 0.2, 0.3],
+        )
+        url = f"/v1/documents/{doc.id}/findings"
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("clause_body", resp.data["findings"][0])
+        self.assertEqual(resp.data["findings"][0]["clause_heading"], "Termination")
+        finding_selects = [q["sql"] for q in ctx.captured_queries if "review_finding" in q["sql"]]
+        self.assertTrue(finding_selects)
+        for sql in finding_selects:
+            self.assertNotIn("embedding", sql)
+            self.assertNotIn("clause_body", sql)
+
+        resp = self.client.get(url, {"fields": "summary,clause_body,severity"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            set(resp.data["findings"][0]),
+            {"summary", "clause_body", "severity"},
+        )
+        self.assertEqual(resp.data["findings"][0]["clause_body"], "Either party may terminate with notice.")
+
+        resp = self.client.get(url, {"fields": "summary,embedding"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("embedding", resp.data["detail"])
+
+    def _export(self, doc, **params):
+        resp = self.client.get(f"/v1/documents/{doc.id}/findings/export", params)
+        body = b"".join(resp.streaming_content).decode() if resp.status_code == 200 else ""
+        return resp, body
+
+    def test_findings_export_streams_ndjson_and_csv_in_chunks(self):
+        doc = Document.objects.create(title="Exported Findings", text="Simple contract body.")
+        run = ReviewRun.objects.create(document=doc, status="succeeded")
+        for idx in range(5):
+            Finding.objects.create(
+                document=doc,
+                run=run,
+                clause_id=f"c-{idx}",
+                summary=f"Finding, \"{idx}\"",
+                severity="high",
+                evidence=f"Evidence {idx}\nsecond line",
+                evidence_span={"start": 0, "end": idx + 1},
+                source="rule",
+                confidence=0.5,
+            )
+
+        with self.settings(REVIEW_EXPORT_CHUNK_SIZE=2):
+            resp = self.client.get(f"/v1/documents/{doc.id}/findings/export")
+            self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+            chunks = list(resp.streaming_content)
+            self.assertEqual(len(chunks), 3)
+            rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+            self.assertEqual([row["clause_id"] for row in rows], [f"c-{idx}" for idx in range(5)])
+            self.assertEqual(rows[0]["evidence_span"], {"start": 0, "end": 1})
+            self.assertEqual(rows[0]["run_id"], str(run.id))
+
+            resp, body = self._export(doc, format="csv", run_id=str(run.id))
+        self.assertEqual(resp["Content-Type"], "text/csv")
+        self.assertIn(f"findings-{run.id}.csv", resp["Content-Disposition"])
+        records = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[4]["summary"], 'Finding, "4"')
+        self.assertEqual(json.loads(records[4]["evidence_span"]), {"start": 0, "end": 5})
+
+    async def test_findings_export_streams_asynchronously_under_asgi(self):
+        doc = await Document.objects.acreate(title="ASGI Export", text="Simple contract body.")
+        run = await ReviewRun.objects.acreate(document=doc, status="succeeded")
+        for idx in range(3):
+            await Finding.objects.acreate(
+                document=doc, run=run, clause_id=f"c-{idx}", summary="s", severity="low", source="rule"
+            )
+
+        with self.settings(REVIEW_EXPORT_CHUNK_SIZE=2), warnings.catch_warnings():
+            warnings.simplefilter("error")
+            response = await AsyncClient().get(f"/v1/documents/{doc.id}/findings/export")
+            self.assertTrue(response.is_async)
+            chunks = [chunk async for chunk in response]
+        self.assertEqual(len(chunks), 2)
+        rows = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+        self.assertEqual([row["clause_id"] for row in rows], ["c-0", "c-1", "c-2"])
+
+    def test_findings_export_rejects_unknown_format_and_missing_run(self):
+        doc = Document.objects.create(title="No Export", text="Simple contract body.")
+        resp, _ = self._export(doc)
+        self.assertEqual(resp.status_code, 404)
+        ReviewRun.objects.create(document=doc, status="succeeded")
+        resp, _ = self._export(doc, format="xml")
+        self.assertEqual(resp.status_code, 400)
+
+
+@override_settings(LLM_PROVIDER="mock", MEDIA_ROOT=_MEDIA_ROOT)
+class AsyncIngestionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        caches["pipeline"].clear()
+
+    def _upload(self, name, content):
+        with patch("apps.documents.views.ingest_document_task.delay") as delay:
+            resp = self.client.post(
+                "/v1/documents/upload",
+                {"title": name, "file": SimpleUploadedFile(name, content)},
+                format="multipart",
+            )
+        delay.assert_called_once_with(resp.data["id"])
+        return resp
+
+    def test_upload_returns_before_extraction_and_worker_records_progress(self):
+        resp = self._upload("clauses.csv", b"Clause,Risk\nTermination notice,High\n")
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.data["ingestion_status"], "ingesting")
+        self.assertEqual(resp.data["source_type"], "spreadsheet")
+        doc = Document.objects.get(id=resp.data["id"])
+        self.assertEqual(doc.text, "")
+        self.assertTrue(doc.upload.name.endswith(".csv"))
+
+        ingest_document(str(doc.id))
+
+        detail = self.client.get(f"/v1/documents/{doc.id}")
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.data["ingestion_status"], "ready")
+        self.assertEqual(detail.data["ingestion"]["stage"], "ready")
+        self.assertIn("extract", detail.data["ingestion"]["timings_ms"])
+        doc.refresh_from_db()
+        self.assertIn("Termination notice", doc.text)
+        self.assertTrue(doc.ingestion_metadata["sheets"][0]["rows"])
+
+    def test_review_run_requested_during_ingestion_is_enqueued_when_ready(self):
+        resp = self._upload("contract.txt", b"Termination: Either party may terminate.")
+        document_id = resp.data["id"]
+
+        with patch.object(process_review_run_task, "delay") as delay:
+            run_resp = self.client.post("/v1/review/run", {"document_id": document_id}, format="json")
+            self.assertEqual(run_resp.status_code, 202)
+            self.assertEqual(run_resp.data["document"]["ingestion_status"], "ingesting")
+            self.assertEqual(run_resp.data["run"]["status"], "queued")
+            delay.assert_not_called()
+
+            ingest_document(document_id)
+            delay.assert_called_once_with(run_resp.data["run"]["id"])
+
+    def test_failed_ingestion_fails_waiting_runs_and_rejects_new_ones(self):
+        resp = self._upload("broken.pdf", b"not really a pdf")
+        document_id = resp.data["id"]
+        with patch.object(process_review_run_task, "delay") as delay:
+            run_resp = self.client.post("/v1/review/run", {"document_id": document_id}, format="json")
+            ingest_document(document_id)
+            delay.assert_not_called()
+
+        doc = Document.objects.get(id=document_id)
+        self.assertEqual(doc.ingestion_status, "failed")
+        self.assertIn("error", doc.ingestion_metadata["ingestion"])
+        run = ReviewRun.objects.get(id=run_resp.data["run"]["id"])
+        self.assertEqual(run.status, "failed")
+        self.assertIn("ingestion failed", run.error)
+
+        again = self.client.post("/v1/review/run", {"document_id": document_id}, format="json")
+        self.assertEqual(again.status_code, 409)
+
+
+class PdfExtractionTests(TestCase):
+    def test_pages_extracted_in_parallel_ranges_with_page_offsets(self):
+        texts = [f"Clause {index} text" for index in range(9)] + [""]
+        progress = []
+
+        result = extract_pdf(
+            _pdf_bytes(texts),
+            workers=2,
+            pages_per_task=2,
+            on_page=lambda done, total: progress.append((done, total)),
+        )
+
+        self.assertEqual(result.text, PAGE_SEPARATOR.join(text for text in texts if text))
+        self.assertEqual(result.page_count, 10)
+        for text, (start, end) in zip(texts, result.page_offsets):
+            self.assertEqual(result.text[start:end], text)
+        self.assertEqual(progress[-1], (10, 10))
+        self.assertEqual(sorted(result.extracted), list(range(10)))
+
+    def test_known_pages_are_not_re_extracted(self):
+        result = extract_pdf(_pdf_bytes(["First", "Second"]), known_pages={0: "Cached first"})
+        self.assertEqual(result.text, f"Cached first{PAGE_SEPARATOR}Second")
+        self.assertEqual(result.extracted, {1: "Second"})
+
+    def test_slow_page_times_out_without_stalling_the_document(self):
+        original = PageObject.extract_text
+
+        def slow_second_page(page, *args, **kwargs):
+            text = original(page, *args, **kwargs)
+            if text == "Slow":
+                time.sleep(2)
+            return text
+
+        with patch.object(PageObject, "extract_text", autospec=True, side_effect=slow_second_page):
+            result = extract_pdf(_pdf_bytes(["Fast", "Slow", "Also fast"]), page_timeout=0.2)
+
+        self.assertEqual(result.timed_out_pages, [1])
+        self.assertEqual(result.text, f"Fast{PAGE_SEPARATOR}Also fast")
+        self.assertEqual(result.page_offsets[1], [4, 4])
+        self.assertNotIn(1, result.extracted)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True, MEDIA_ROOT=_MEDIA_ROOT, DOCUMENT_PDF_WORKERS=1)
+    def test_pdf_upload_records_page_offsets_and_reuses_cached_pages(self):
+        caches["pipeline"].clear()
+        raw = _pdf_bytes(["Termination clause", "Indemnity clause"])
+        client = APIClient()
+
+        ids = []
+        for _ in range(2):
+            resp = client.post(
+                "/v1/documents/upload",
+                {"title": "Scanned", "file": SimpleUploadedFile("contract.pdf", raw)},
+                format="multipart",
+            )
+            self.assertEqual(resp.status_code, 201)
+            ids.append(resp.data["id"])
+
+        first, second = (Document.objects.get(id=doc_id) for doc_id in ids)
+        self.assertEqual(first.ingestion_metadata["page_count"], 2)
+        start, end = first.ingestion_metadata["page_offsets"][1]
+        self.assertEqual(first.text[start:end], "Indemnity clause")
+        self.assertEqual(first.ingestion_metadata["ingestion"]["pages_cached"], 0)
+        self.assertEqual(second.ingestion_metadata["ingestion"]["pages_cached"], 2)
+        self.assertEqual(second.text, first.text)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True, MEDIA_ROOT=_MEDIA_ROOT, DOCUMENT_PDF_PAGES_PER_TASK=2)
+    def test_ingest_task_fans_page_ranges_out_as_celery_subtasks(self):
+        caches["pipeline"].clear()
+        texts = [f"Clause {index} text" for index in range(5)]
+        with patch("apps.documents.views.ingest_document_task.delay"):
+            resp = APIClient().post(
+                "/v1/documents/upload",
+                {"title": "Long", "file": SimpleUploadedFile("long.pdf", _pdf_bytes(texts))},
+                format="multipart",
+            )
+        ranges = []
+
+        def lose_second_range(raw, indexes, page_timeout):
+            ranges.append(indexes)
+            if indexes == [2, 3]:
+                raise RuntimeError("worker lost")
+            return extract_page_range(raw, indexes, page_timeout)
+
+        with patch("apps.documents.services.extract_page_range", side_effect=lose_second_range), patch(
+            "apps.documents.services.extract_pdf", wraps=extract_pdf
+        ) as assemble:
+            ingest_document_task.delay(resp.data["id"])
+
+        self.assertEqual(ranges, [[0, 1], [2, 3], [4]])
+        # The callback only extracts what the failed range left missing.
+        self.assertEqual(sorted(assemble.call_args.kwargs["known_pages"]), [0, 1, 4])
+        doc = Document.objects.get(id=resp.data["id"])
+        self.assertEqual(doc.ingestion_status, "ready")
+        self.assertEqual(doc.text, PAGE_SEPARATOR.join(texts))
+        self.assertEqual(doc.ingestion_metadata["page_count"], 5)
+        self.assertEqual(doc.ingestion_metadata["ingestion"]["page_ranges"], 3)
+        self.assertEqual(doc.ingestion_metadata["ingestion"]["pages_cached"], 0)
+        self.assertIn("extract", doc.ingestion_metadata["ingestion"]["timings_ms"])
+
+
+class SpreadsheetReaderTests(TestCase):
+    def test_csv_is_parsed_from_the_open_file(self):
+        raw = "\ufeffClause,Risk\r\nTermination,High\r\n,\r\nIndemnity,\r\n".encode("utf-8")
+        file_obj = BytesIO(raw)
+
+        text, metadata = parse_csv_file(file_obj)
+
+        self.assertFalse(file_obj.closed)
+        sheet = metadata["sheets"][0]
+        self.assertEqual(metadata["schema_version"], "v2")
+        self.assertEqual(sheet["columns"], ["Clause", "Risk"])
+        self.assertEqual(sheet["row_start"], 2)
+        # Columnar rows: plain cell arrays, trailing empty cells trimmed.
+        self.assertEqual(sheet["rows"], [["Termination", "High"], [], ["Indemnity"]])
+        self.assertEqual(
+            list(iter_sheet_rows(sheet)),
+            [(2, "Clause=Termination ; Risk=High"), (3, ""), (4, "Clause=Indemnity")],
+        )
+        self.assertEqual(
+            text,
+            "[Sheet: Sheet1]\nRow 2: Clause=Termination ; Risk=High\nRow 4: Clause=Indemnity",
+        )
+
+    def test_xlsx_rows_stream_per_sheet(self):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Terms"
+        ws.append([None, None, None])
+        ws.append(["Notice", 30])
+        headers_only = wb.create_sheet("Empty")
+        headers_only.append(["Clause", "Risk"])
+        out = BytesIO()
+        wb.save(out)
+        out.seek(0)
+
+        text, metadata = parse_xlsx_file(out)
+
+        terms, empty = metadata["sheets"]
+        # A blank first row is data, not a header.
+        self.assertEqual(terms["columns"], [])
+        self.assertEqual(terms["row_start"], 1)
+        self.assertEqual(terms["rows"], [[], ["Notice", "30"]])
+        self.assertEqual(row_cell_map(terms["columns"], terms["rows"][1]), {"col_1": "Notice", "col_2": "30"})
+        self.assertEqual(empty["columns"], ["Clause", "Risk"])
+        self.assertEqual(empty["rows"], [])
+        self.assertEqual(text, "[Sheet: Terms]\nRow 2: col_1=Notice ; col_2=30\n\n[Sheet: Empty]")
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True, MEDIA_ROOT=_MEDIA_ROOT)
+    def test_large_sheet_rows_move_to_compressed_blob(self):
+        raw = b"Clause,Risk\n" + b"".join(b"Clause %d,High\n" % index for index in range(40))
+        ids = {}
+        for threshold in (0, 1):
+            with self.settings(DOCUMENT_SPREADSHEET_BLOB_MIN_BYTES=threshold):
+                resp = APIClient().post(
+                    "/v1/documents/upload",
+                    {"title": "Sheet", "file": SimpleUploadedFile("terms.csv", raw)},
+                    format="multipart",
+                )
+            ids[threshold] = resp.data["id"]
+        inline, blobbed = (Document.objects.get(id=ids[threshold]) for threshold in (0, 1))
+
+        self.assertIsNone(inline.ingestion_blob)
+        self.assertNotIn("rows", blobbed.ingestion_metadata["sheets"][0])
+        self.assertEqual(blobbed.ingestion_metadata["sheets"][0]["row_count"], 40)
+        self.assertLess(len(blobbed.ingestion_blob), len(raw))
+        self.assertEqual(
+            document_ingestion_metadata(blobbed)["sheets"][0]["rows"],
+            inline.ingestion_metadata["sheets"][0]["rows"],
+        )
+
+        chunks = [
+            preprocess_document_to_chunks(
+                doc.text, source_type="spreadsheet", ingestion_metadata=document_ingestion_metadata(doc)
+            )
+            for doc in (inline, blobbed)
+        ]
+        self.assertEqual(chunks[0], chunks[1])
+        self.assertEqual(chunks[0][0]["metadata"]["evidence_pointer"]["row_start"], 2)
@@ -1,7 +1,19 @@
 from django.urls import path
-from .views import DocumentUploadView, DocumentFindingsView
+
+from .views import (
+    DocumentDetailView,
+    DocumentFindingsView,
+    DocumentUploadView,
+    document_findings_export,
+)
 
 urlpatterns = [
     path("upload", DocumentUploadView.as_view(), name="document-upload"),
+    path("<uuid:document_id>", DocumentDetailView.as_view(), name="document-detail"),
     path("<uuid:document_id>/findings", DocumentFindingsView.as_view(), name="document-findings"),
+    path(
+        "<uuid:document_id>/findings/export",
+        document_findings_export,
+        name="document-findings-export",
+    ),
 ]
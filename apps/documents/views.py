@@ -1,52 +1,124 @@
+import logging
 import math
 
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.views.decorators.http import require_GET
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .ingestion.pdf_reader import extract_pdf_text
-from .ingestion.spreadsheet_reader import parse_csv_bytes, parse_xlsx_bytes
-from .models import Document, DocumentSourceType
+from apps.review.conditional import conditional_run_response
+from apps.review.export import EXPORT_FORMATS, aiter_chunks, iter_findings_csv, iter_findings_ndjson
+from apps.review.models import Finding, ReviewRun, ReviewRunKind, ReviewRunStatus
+from apps.review.serializers import (
+    FINDING_DEFAULT_FIELDS,
+    FindingSerializer,
+    ReviewRunSerializer,
+    finding_columns,
+)
+
+from .models import Document, DocumentIngestionStatus
+from .pagination import CURSOR_ORDERINGS, InvalidCursor, keyset_page
 from .serializers import DocumentSerializer, DocumentUploadSerializer
+from .services import (
+    INGESTION_KEY,
+    find_duplicate_document,
+    ingest_document,
+    source_type_for,
+    upload_content_hash,
+)
+from .tasks import ingest_document_task
 
-from apps.review.models import Finding, ReviewRun
-from apps.review.serializers import FindingSerializer, ReviewRunSerializer
+logger = logging.getLogger(__name__)
 
 
 class DocumentUploadView(APIView):
+    """Spool the upload to storage and extract its text in a worker.
+
+    Returns 202 with ingestion_status=ingesting while extraction is pending (poll
+    GET /v1/documents/{id}), or 201 when it already finished (eager Celery or
+    DOCUMENT_INGESTION_ASYNC=false).
+
+    In dedup mode (dedup=true, or DOCUMENT_DEDUP_ENABLED) a byte-identical re-upload
+    returns 200 with the existing document and its latest successful review run
+    (latest_run) instead of ingesting again.
+    """
+
     def post(self, request):
         serializer = DocumentUploadSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         file = serializer.validated_data["file"]
         title = serializer.validated_data["title"]
-        filename = file.name.lower()
-        metadata = {}
-
-        # Extract text depending on file type
-        if filename.endswith(".pdf"):
-            text = extract_pdf_text(file)
-            source_type = DocumentSourceType.PDF
-        elif filename.endswith(".csv"):
-            text, metadata = parse_csv_bytes(file.read())
-            source_type = DocumentSourceType.SPREADSHEET
-        elif filename.endswith(".xlsx"):
-            text, metadata = parse_xlsx_bytes(file.read())
-            source_type = DocumentSourceType.SPREADSHEET
-        else:
-            text = file.read().decode("utf-8", errors="ignore")
-            source_type = DocumentSourceType.TEXT
+        dedup = serializer.validated_data.get("dedup")
+        if dedup is None:
+            dedup = getattr(settings, "DOCUMENT_DEDUP_ENABLED", False)
+        source_type = source_type_for(file.name)
+        content_hash = upload_content_hash(file, source_type)
+
+        if dedup:
+            existing = find_duplicate_document(content_hash)
+            if existing is not None:
+                latest_run = (
+                    ReviewRun.objects.filter(
+                        document=existing,
+                        kind=ReviewRunKind.REVIEW,
+                        status=ReviewRunStatus.SUCCEEDED,
+                    )
+                    .order_by("-created_at")
+                    .first()
+                )
+                return Response(
+                    {
+                        **DocumentSerializer(existing).data,
+                        "deduplicated": True,
+                        "latest_run": ReviewRunSerializer(latest_run).data if latest_run else None,
+                    },
+                    status=status.HTTP_200_OK,
+                )
 
         doc = Document.objects.create(
             title=title,
-            text=text,
             source_type=source_type,
-            ingestion_metadata=metadata,
+            content_hash=content_hash,
+            ingestion_status=DocumentIngestionStatus.INGESTING,
+            ingestion_metadata={
+                INGESTION_KEY: {
+                    "stage": "queued",
+                    "queued_at": timezone.now().isoformat(),
+                    "bytes": file.size,
+                }
+            },
+            upload=file,
         )
 
-        return Response(DocumentSerializer(doc).data, status=status.HTTP_201_CREATED)
+        if getattr(settings, "DOCUMENT_INGESTION_ASYNC", True):
+            try:
+                ingest_document_task.delay(str(doc.id))
+            except Exception:
+                logger.warning("Failed to enqueue ingestion for %s; extracting inline", doc.id, exc_info=True)
+                ingest_document(str(doc.id))
+        else:
+            ingest_document(str(doc.id))
+        doc.refresh_from_db(fields=["ingestion_status", "ingestion_metadata"])
+
+        ingesting = doc.ingestion_status == DocumentIngestionStatus.INGESTING
+        return Response(
+            {**DocumentSerializer(doc).data, "deduplicated": False, "latest_run": None},
+            status=status.HTTP_202_ACCEPTED if ingesting else status.HTTP_201_CREATED,
+        )
+
+
+class DocumentDetailView(APIView):
+    """GET /v1/documents/{id} - document summary including ingestion status and progress."""
+
+    def get(self, request, document_id):
+        doc = get_object_or_404(Document.objects.defer("text", "ingestion_blob"), id=document_id)
+        return Response(DocumentSerializer(doc).data, status=status.HTTP_200_OK)
 
 
 class DocumentFindingsView(APIView):
@@ -54,54 +126,151 @@ class DocumentFindingsView(APIView):
 
     GET /v1/documents/{id}/findings
 
-    By default, returns findings for the most recent ReviewRun. You can request
-    a specific run via ?run_id=<uuid>.
+    By default, returns findings for the most recent full review run (rules-only
+    re-evaluation runs are skipped). You can request a specific run via ?run_id=<uuid>.
+
+    Pages are cursor-based: follow pagination.next_cursor via ?cursor=<token>. The total is
+    only computed with ?include_total=1. Passing ?page=N keeps the older offset pagination.
+    ?fields=id,summary,... selects a sparse fieldset and only those columns are read;
+    clause_body is left out unless requested and the embedding column is never loaded.
     """
 
     def get(self, request, document_id):
-        doc = get_object_or_404(Document, id=document_id)
+        doc = get_object_or_404(Document.objects.only("id", "title"), id=document_id)
 
-        run_id = request.query_params.get("run_id")
-        if run_id:
-            run = get_object_or_404(ReviewRun, id=run_id, document=doc)
-        else:
-            run = ReviewRun.objects.filter(document=doc).order_by("-created_at").first()
+        run = _resolve_run(doc, request.query_params.get("run_id"))
+
+        page_size = _parse_positive_int(
+            request.query_params.get("page_size"),
+            default=_default_page_size(),
+        )
+        page_size = min(page_size, _max_page_size())
+        ordering = _safe_ordering(request.query_params.get("ordering"))
 
         if not run:
+            if "page" in request.query_params:
+                pagination = _pagination_payload(page=1, page_size=page_size, total=0)
+            else:
+                total = 0 if _truthy(request.query_params.get("include_total")) else None
+                pagination = _cursor_pagination_payload(
+                    page_size, ordering, next_cursor=None, has_next=False, total=total
+                )
             return Response(
                 {
                     "document": {"id": str(doc.id), "title": doc.title},
                     "run": None,
                     "findings": [],
-                    "pagination": _pagination_payload(page=1, page_size=_default_page_size(), total=0),
+                    "pagination": pagination,
                 },
                 status=status.HTTP_200_OK,
             )
-
-        page = _parse_positive_int(request.query_params.get("page"), default=1)
-        page_size = _parse_positive_int(
-            request.query_params.get("page_size"),
-            default=_default_page_size(),
+        try:
+            fields = _parse_fields(request.query_params.get("fields"))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        params = request.query_params
+        variant = "|".join(
+            f"{name}={params.get(name, '')}" for name in ("page", "cursor", "include_total")
         )
-        page_size = min(page_size, _max_page_size())
-        ordering = _safe_ordering(request.query_params.get("ordering"))
+        return conditional_run_response(
+            request,
+            run,
+            f"findings|{ordering}|{page_size}|{','.join(fields)}|{variant}",
+            lambda: self._findings_response(request, doc, run, page_size, ordering, fields),
+        )
+
+    def _findings_response(
+        self, request, doc, run, page_size: int, ordering: str, fields: list
+    ) -> Response:
+        # The ordering key is loaded too: the next cursor is built from it.
+        columns = finding_columns([*fields, ordering.lstrip("-")])
+        qs = Finding.objects.filter(run=run).only(*dict.fromkeys(columns))
 
-        qs = Finding.objects.filter(document=doc, run=run).order_by(ordering, "id")
-        total = qs.count()
-        start = (page - 1) * page_size
-        end = start + page_size
+        if "page" in request.query_params:
+            # Legacy offset pagination; deep pages cost an OFFSET scan plus a COUNT.
+            page = _parse_positive_int(request.query_params.get("page"), default=1)
+            qs = qs.order_by(ordering, "id")
+            total = qs.count()
+            start = (page - 1) * page_size
+            end = start + page_size
+            findings = qs[start:end]
+            pagination = _pagination_payload(page=page, page_size=page_size, total=total)
+        else:
+            try:
+                keyset = keyset_page(qs, ordering, page_size, request.query_params.get("cursor"))
+            except InvalidCursor as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            findings = keyset.rows
+            pagination = _cursor_pagination_payload(
+                page_size,
+                ordering,
+                next_cursor=keyset.next_cursor,
+                has_next=keyset.has_next,
+                total=qs.count() if _truthy(request.query_params.get("include_total")) else None,
+            )
 
         return Response(
             {
                 "document": {"id": str(doc.id), "title": doc.title},
                 "run": ReviewRunSerializer(run).data,
-                "findings": FindingSerializer(qs[start:end], many=True).data,
-                "pagination": _pagination_payload(page=page, page_size=page_size, total=total),
+                "findings": FindingSerializer(findings, many=True, fields=fields).data,
+                "pagination": pagination,
             },
             status=status.HTTP_200_OK,
         )
 
 
+@require_GET
+def document_findings_export(request, document_id):
+    """Stream every finding of a run as NDJSON (default) or CSV.
+
+    GET /v1/documents/{id}/findings/export?format=ndjson|csv[&run_id=<uuid>]
+
+    Uses the same run selection as DocumentFindingsView (latest full review run unless
+    run_id is given). Rows are streamed from a database cursor in chunks of
+    REVIEW_EXPORT_CHUNK_SIZE, so memory does not grow with the number of findings. Under
+    ASGI the chunks are served through an async iterator so they are not buffered first.
+    """
+    doc = get_object_or_404(Document.objects.only("id", "title"), id=document_id)
+    export_format = (request.GET.get("format") or "ndjson").strip().lower()
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse(
+            {"detail": f"Unsupported export format. Use one of: {', '.join(EXPORT_FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    run = _resolve_run(doc, request.GET.get("run_id"))
+    if run is None:
+        raise Http404("Document has no review runs.")
+
+    rows = iter_findings_csv(run) if export_format == "csv" else iter_findings_ndjson(run)
+    if isinstance(request, ASGIRequest):
+        rows = aiter_chunks(rows)
+    response = StreamingHttpResponse(rows, content_type=EXPORT_FORMATS[export_format])
+    response["Content-Disposition"] = f'attachment; filename="findings-{run.id}.{export_format}"'
+    return response
+
+
+def _resolve_run(doc: Document, run_id: str | None) -> ReviewRun | None:
+    if run_id:
+        return get_object_or_404(ReviewRun, id=run_id, document=doc)
+    return (
+        ReviewRun.objects.filter(document=doc, kind=ReviewRunKind.REVIEW)
+        .order_by("-created_at")
+        .first()
+    )
+
+
+def _parse_fields(raw: str | None) -> list:
+    """?fields=a,b,c -> sparse fieldset; the default omits heavy columns (clause_body)."""
+    if not raw or not raw.strip():
+        return list(FINDING_DEFAULT_FIELDS)
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in FindingSerializer.Meta.fields]
+    if unknown:
+        raise ValueError(f"Unknown finding fields: {', '.join(unknown)}.")
+    return list(dict.fromkeys(requested))
+
+
 def _safe_ordering(ordering: str | None) -> str:
     if not ordering:
         return "created_at"
@@ -109,8 +278,7 @@ def _safe_ordering(ordering: str | None) -> str:
     if not normalized:
         return "created_at"
     base = normalized[1:] if normalized.startswith("-") else normalized
-    allowed_fields = {"created_at", "severity", "source", "confidence"}
-    if base not in allowed_fields:
+    if base not in CURSOR_ORDERINGS:
         return "created_at"
     return normalized
 
@@ -123,6 +291,10 @@ def _max_page_size() -> int:
     return max(1, int(getattr(settings, "REVIEW_FINDINGS_MAX_PAGE_SIZE", 200)))
 
 
+def _truthy(value: str | None) -> bool:
+    return (value or "").strip().lower() in {"1", "true", "yes", "on"}
+
+
 def _parse_positive_int(value: str | None, default: int) -> int:
     if value is None:
         return default
@@ -143,3 +315,20 @@ def _pagination_payload(page: int, page_size: int, total: int) -> dict:
         "has_next": total_pages > 0 and page < total_pages,
         "has_prev": page > 1 and total_pages > 0,
     }
+
+
+def _cursor_pagination_payload(
+    page_size: int,
+    ordering: str,
+    *,
+    next_cursor: str | None,
+    has_next: bool,
+    total: int | None,
+) -> dict:
+    return {
+        "page_size": page_size,
+        "ordering": ordering,
+        "next_cursor": next_cursor,
+        "has_next": has_next,
+        "total": total,
+    }
@@ -8,6 +8,7 @@ class ReviewRunAdmin(admin.ModelAdmin):
     list_display = (
         "id",
         "document",
+        "kind",
         "status",
         "current_stage",
         "idempotency_key",
@@ -15,11 +16,12 @@ class ReviewRunAdmin(admin.ModelAdmin):
         "cache_misses",
         "llm_model",
         "prompt_rev",
+        "rule_pack",
         "started_at",
         "completed_at",
         "created_at",
     )
-    list_filter = ("status", "llm_model", "prompt_rev", "request_fingerprint")
+    list_filter = ("kind", "status", "llm_model", "prompt_rev", "request_fingerprint")
     search_fields = ("id", "document__title", "idempotency_key", "cache_key", "request_fingerprint")
 
 
@@ -0,0 +1,206 @@
+"""Admission control for review runs.
+
+Two O(1) checks guard POST /v1/review/run:
+
+- an active-run limit. On a Redis admission alias every slot is a member of a sorted set
+  scored by its expiry: a slot is taken (pruning expired members first) by one Lua script
+  before the run is created, moved onto the run once it exists, and removed when the run's
+  task finishes. A slot whose worker was killed expires on its own after
+  REVIEW_ADMISSION_SLOT_TTL_SECONDS instead of shrinking capacity for good.
+  Any other cache backend is not shared between the web process and Celery workers, so the
+  limit falls back to counting queued/running ReviewRun rows. The count runs under a
+  SELECT ... FOR UPDATE on an AdmissionLock row, and the caller inserts the run in the same
+  transaction, so concurrent requests are admitted one at a time;
+- a token bucket per requester, refilled continuously at REVIEW_RATE_LIMIT_PER_MINUTE and
+  updated by a single Lua script, so concurrent requests never read a stale balance.
+  Without Redis each process keeps its own buckets in memory, so the limit is per process.
+"""
+
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.review.cache import redis_client
+from apps.review.models import AdmissionLock, ReviewRun, ReviewRunStatus
+
+_SLOTS_KEY = "review:admission:slots"
+# Token returned while the limit is enforced from the database (no slot to give back).
+_DB_SLOT = "db"
+# AdmissionLock row (created by migration 0017) serializing the database fallback.
+_ACTIVE_RUNS_LOCK = "active-runs"
+
+# Per-process token buckets used without Redis: requester -> (tokens, updated_at wall time).
+_local_buckets: Dict[str, Tuple[float, float]] = {}
+_local_lock = threading.Lock()
+# Idle buckets are full again after a minute; past this many entries those are dropped.
+_MAX_LOCAL_BUCKETS = 10_000
+
+# KEYS[1] = slots zset; ARGV = limit, ttl seconds, member. Members are scored by expiry on
+# the Redis clock, so expired slots are pruned before counting.
+_ACQUIRE_SLOT_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+  return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return 1
+"""
+
+# KEYS[1] = slots zset; ARGV = ttl seconds, acquisition token member, run member.
+_BIND_SLOT_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+redis.call('ZREM', KEYS[1], ARGV[2])
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[1]), ARGV[3])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+return 1
+"""
+
+# KEYS[1] = bucket; ARGV = capacity, refill per second, ttl seconds. Uses the Redis clock
+# so web processes with skewed clocks agree on the refill.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return allowed
+"""
+
+
+def _alias() -> str:
+    return getattr(settings, "REVIEW_ADMISSION_CACHE_ALIAS", "pipeline")
+
+
+def _cache():
+    return caches[_alias()]
+
+
+def _redis(key: str):
+    """(client, prefixed key) when the admission alias is Redis, else None."""
+    client = redis_client(_alias())
+    if client is None:
+        return None
+    return client, _cache().make_and_validate_key(key)
+
+
+def _slot_store():
+    """(client, zset key) when slots live in Redis; None means count runs in the database."""
+    return _redis(_SLOTS_KEY)
+
+
+def _slot_ttl() -> int:
+    return int(settings.REVIEW_ADMISSION_SLOT_TTL_SECONDS)
+
+
+def _run_member(run_id) -> str:
+    return f"run:{run_id}"
+
+
+def concurrent_run_limit() -> int:
+    return max(1, int(settings.REVIEW_MAX_CONCURRENT_RUNS))
+
+
+def rate_limit_per_minute() -> int:
+    return max(1, int(settings.REVIEW_RATE_LIMIT_PER_MINUTE))
+
+
+def _active_runs_in_db() -> int:
+    return ReviewRun.objects.filter(status__in=[ReviewRunStatus.QUEUED, ReviewRunStatus.RUNNING]).count()
+
+
+def active_run_slots() -> int:
+    store = _slot_store()
+    if store is None:
+        return _active_runs_in_db()
+    client, key = store
+    return int(client.zcount(key, time.time(), "+inf"))
+
+
+def try_acquire_run_slot() -> Optional[str]:
+    """
+    Take one active-run slot and return its token, or None when all slots are in use.
+
+    Must be called inside transaction.atomic(): without Redis the admission lock row stays
+    locked until the caller's transaction, which inserts the run, commits.
+    """
+    store = _slot_store()
+    if store is None:
+        AdmissionLock.objects.select_for_update().get_or_create(name=_ACTIVE_RUNS_LOCK)
+        return _DB_SLOT if _active_runs_in_db() < concurrent_run_limit() else None
+    client, key = store
+    token = f"token:{uuid.uuid4().hex}"
+    if not client.eval(_ACQUIRE_SLOT_LUA, 1, key, concurrent_run_limit(), _slot_ttl(), token):
+        return None
+    return token
+
+
+def bind_run_slot(run_id, token: str) -> None:
+    """Move an acquired slot onto its run so the run's task can release it exactly once."""
+    store = _slot_store()
+    if store is None or token == _DB_SLOT:
+        return
+    client, key = store
+    client.eval(_BIND_SLOT_LUA, 1, key, _slot_ttl(), token, _run_member(run_id))
+
+
+def release_unbound_run_slot(token: str) -> None:
+    """Give back a slot that was acquired but never attached to a run."""
+    store = _slot_store()
+    if store is None or token == _DB_SLOT:
+        return
+    client, key = store
+    client.zrem(key, token)
+
+
+def release_run_slot(run_id) -> bool:
+    """Release the run's slot. Idempotent: retries and duplicate calls release nothing."""
+    store = _slot_store()
+    if store is None:
+        # The run's own status change frees its place in the database count.
+        return False
+    client, key = store
+    return bool(client.zrem(key, _run_member(run_id)))
+
+
+def take_rate_token(requester: str) -> bool:
+    """Spend one token from the requester's bucket; False when the bucket is empty."""
+    capacity = rate_limit_per_minute()
+    refill_per_second = capacity / 60.0
+    key = f"review:admission:bucket:{requester}"
+    # Long enough for an idle bucket to refill completely before it is dropped.
+    ttl = 120
+    store = _redis(key)
+    if store is not None:
+        client, redis_key = store
+        return bool(client.eval(_TOKEN_BUCKET_LUA, 1, redis_key, capacity, refill_per_second, ttl))
+
+    with _local_lock:
+        now = time.time()
+        if len(_local_buckets) >= _MAX_LOCAL_BUCKETS:
+            for idle in [k for k, (_, ts) in _local_buckets.items() if now - ts > ttl]:
+                del _local_buckets[idle]
+        tokens, updated_at = _local_buckets.get(key, (float(capacity), now))
+        tokens = min(float(capacity), tokens + max(0.0, now - updated_at) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        _local_buckets[key] = (tokens, now)
+        return allowed
@@ -0,0 +1,330 @@
+"""Tiered pipeline cache shared by review runs.
+
+L1 is a process-local LRU bounded by compressed bytes. L2 is a shared Django cache alias
+(Redis in Compose) so every Celery worker sees the same hits. Values are JSON-serialized
+and zlib-compressed once, and the same blob is stored in both tiers.
+
+Single-flight locks live in L2 as well: the first worker to miss a key takes the lock with
+an atomic add and computes; concurrent workers get FlightInProgress and come back later for
+the payload instead of recomputing it. On Redis the owner releases its lock with a
+compare-and-delete script, so a lock that expired and was taken over is left alone; on any
+other L2 backend release is a best-effort get-then-delete.
+"""
+
+import contextvars
+import json
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+
+@dataclass
+class CacheStats:
+    l1_hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    l1_evictions: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.l1_hits + self.l2_hits + self.misses
+        if not lookups:
+            return None
+        return round((self.l1_hits + self.l2_hits) / lookups, 4)
+
+    def as_dict(self) -> Dict[str, Any]:
+        payload = asdict(self)
+        payload["hit_rate"] = self.hit_rate
+        return payload
+
+
+_run_stats: contextvars.ContextVar[Optional[CacheStats]] = contextvars.ContextVar(
+    "review_pipeline_cache_stats", default=None
+)
+
+
+class FlightInProgress(Exception):
+    """Another worker holds the single-flight lock for this key."""
+
+
+# KEYS[1] = flight lock; ARGV[1] = owner token. Deletes the lock only while this owner holds it.
+_RELEASE_FLIGHT_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@lru_cache(maxsize=None)
+def _redis_from_url(url: str) -> redis.Redis:
+    return redis.Redis.from_url(url)
+
+
+def redis_client(alias: str) -> Optional[redis.Redis]:
+    """The redis-py client behind a Django cache alias, or None when the alias is not Redis.
+
+    Keys passed to the client must be built with the cache's make_and_validate_key().
+    """
+    cache = caches[alias]
+    client = getattr(cache, "client", None)
+    if client is not None and hasattr(client, "get_client"):
+        # django-redis exposes its connection publicly.
+        return client.get_client(write=True)
+    if not isinstance(cache, RedisCache):
+        return None
+    location = settings.CACHES[alias]["LOCATION"]
+    servers = location if isinstance(location, (list, tuple)) else location.split(",")
+    # Django's RedisCache writes to the first server.
+    return _redis_from_url(servers[0].strip())
+
+
+def _encode(value: Any) -> bytes:
+    level = int(getattr(settings, "REVIEW_CACHE_COMPRESS_LEVEL", 6))
+    raw = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    return zlib.compress(raw, level)
+
+
+def _flight_key(key: str) -> str:
+    return f"{key}:flight"
+
+
+def _decode(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class _ByteBoundedLRU:
+    """Thread-safe LRU of compressed blobs, bounded by total blob size."""
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, Tuple[Optional[float], bytes]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, blob = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return blob
+
+    def set(self, key: str, blob: bytes, timeout: Optional[int], max_bytes: int) -> int:
+        """Store a blob and return how many entries were evicted to make room."""
+        with self._lock:
+            self._pop(key)
+            if len(blob) > max_bytes:
+                return 0
+            expires_at = time.monotonic() + timeout if timeout else None
+            self._entries[key] = (expires_at, blob)
+            self._size += len(blob)
+            evicted = 0
+            while self._size > max_bytes:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class TieredPipelineCache:
+    def __init__(self) -> None:
+        self._l1 = _ByteBoundedLRU()
+        self.totals = CacheStats()
+        # LLM batch threads hit the cache concurrently; counter updates are read-modify-write.
+        self._stats_lock = threading.Lock()
+
+    @property
+    def l2(self):
+        alias = getattr(settings, "REVIEW_CACHE_ALIAS", "default")
+        return caches[alias] if alias else None
+
+    @property
+    def l1_size_bytes(self) -> int:
+        return self._l1.size_bytes
+
+    @contextmanager
+    def collect_stats(self) -> Iterator[CacheStats]:
+        """Collect stats for cache operations made inside the block (e.g. one review run)."""
+        stats = CacheStats()
+        token = _run_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _run_stats.reset(token)
+
+    def describe(self, stats: CacheStats) -> Dict[str, Any]:
+        payload = stats.as_dict()
+        payload["l1_size_bytes"] = self._l1.size_bytes
+        payload["l1_entries"] = len(self._l1)
+        payload["l1_max_bytes"] = self._l1_max_bytes()
+        return payload
+
+    def get(self, key: str) -> Any:
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, bytes] = {}
+        for key in keys:
+            blob = self._l1.get(key)
+            if blob is not None:
+                found[key] = blob
+        self._count(l1_hits=len(found))
+
+        remaining = [key for key in keys if key not in found]
+        l2 = self.l2
+        if remaining and l2 is not None:
+            promoted = l2.get_many(remaining)
+            timeout = int(getattr(settings, "REVIEW_CACHE_L1_TTL_SECONDS", 300))
+            for key, blob in promoted.items():
+                found[key] = blob
+                self._remember(key, blob, timeout)
+            self._count(l2_hits=len(promoted))
+
+        self._count(
+            misses=len(keys) - len(found),
+            bytes_read=sum(len(blob) for blob in found.values()),
+        )
+        return {key: _decode(blob) for key, blob in found.items()}
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        self.set_many({key: value}, timeout=timeout)
+
+    def set_many(self, values: Dict[str, Any], timeout: Optional[int] = None) -> None:
+        blobs = {key: _encode(value) for key, value in values.items()}
+        if not blobs:
+            return
+        l2 = self.l2
+        if l2 is not None:
+            l2.set_many(blobs, timeout=timeout)
+        l1_timeout = int(getattr(settings, "REVIEW_CACHE_L1_TTL_SECONDS", 300))
+        if timeout:
+            l1_timeout = min(l1_timeout, timeout)
+        for key, blob in blobs.items():
+            self._remember(key, blob, l1_timeout)
+        self._count(sets=len(blobs), bytes_written=sum(len(b) for b in blobs.values()))
+
+    def delete(self, key: str) -> None:
+        self._l1.delete(key)
+        l2 = self.l2
+        if l2 is not None:
+            l2.delete(key)
+
+    def acquire_flight(self, key: str, ttl: int) -> Optional[str]:
+        """Take the single-flight lock for a key. Returns the owner token, or None if held."""
+        l2 = self.l2
+        if l2 is None:
+            return None
+        token = uuid.uuid4().hex
+        client = self._l2_redis()
+        if client is not None:
+            # Stored raw (not pickled by the cache) so release can compare it in Redis.
+            redis_key = l2.make_and_validate_key(_flight_key(key))
+            return token if client.set(redis_key, token, nx=True, ex=ttl) else None
+        # add() is atomic on every shared backend, so exactly one worker wins.
+        return token if l2.add(_flight_key(key), token, timeout=ttl) else None
+
+    def release_flight(self, key: str, token: str) -> None:
+        l2 = self.l2
+        if l2 is None:
+            return
+        client = self._l2_redis()
+        if client is not None:
+            client.eval(_RELEASE_FLIGHT_LUA, 1, l2.make_and_validate_key(_flight_key(key)), token)
+        elif l2.get(_flight_key(key)) == token:
+            # Best effort: not atomic outside Redis.
+            l2.delete(_flight_key(key))
+
+    @contextmanager
+    def single_flight(self, key: str, *, ttl: int) -> Iterator[Any]:
+        """
+        Hold the single-flight lock for a missed key while the caller computes it. Yields the
+        payload when another worker cached it in the meantime, else None. Raises
+        FlightInProgress when another worker holds the lock and has not cached the value yet,
+        so the caller can come back later instead of blocking. A no-op without an L2.
+        """
+        if self.l2 is None:
+            yield None
+            return
+        token = self.acquire_flight(key, ttl)
+        # The previous owner may have finished between our miss and the add().
+        payload = self.get(key)
+        if token is None and payload is None:
+            raise FlightInProgress(key)
+        try:
+            yield payload
+        finally:
+            if token is not None:
+                self.release_flight(key, token)
+
+    def clear(self) -> None:
+        """Clear both tiers. Intended for tests and maintenance only."""
+        self._l1.clear()
+        l2 = self.l2
+        if l2 is not None:
+            l2.clear()
+
+    def _l2_redis(self) -> Optional[redis.Redis]:
+        alias = getattr(settings, "REVIEW_CACHE_ALIAS", "default")
+        return redis_client(alias) if alias else None
+
+    def _l1_max_bytes(self) -> int:
+        return max(0, int(getattr(settings, "REVIEW_CACHE_L1_MAX_BYTES", 64 * 1024 * 1024)))
+
+    def _remember(self, key: str, blob: bytes, timeout: Optional[int]) -> None:
+        evicted = self._l1.set(key, blob, timeout, self._l1_max_bytes())
+        if evicted:
+            self._count(l1_evictions=evicted)
+
+    def _count(self, **deltas: int) -> None:
+        targets: List[CacheStats] = [self.totals]
+        run_stats = _run_stats.get()
+        if run_stats is not None:
+            targets.append(run_stats)
+        with self._stats_lock:
+            for stats in targets:
+                for field, delta in deltas.items():
+                    if delta:
+                        setattr(stats, field, getattr(stats, field) + delta)
+
+
+pipeline_cache = TieredPipelineCache()
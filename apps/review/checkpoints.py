@@ -0,0 +1,80 @@
+"""Stage checkpoints for resumable review runs.
+
+Each completed stage (chunks, rule findings) and each completed LLM batch is stored as a
+ReviewRunCheckpoint against the run, so a Celery retry resumes from there instead of
+repeating paid LLM calls. Checkpoints are keyed by what produced them (chunk schema and
+document hash, rule pack hash, batch identity), so a stale checkpoint is never reused.
+"""
+
+import queue
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from apps.review.llm.provider import BatchCheckpoints
+from apps.review.models import ReviewRun, ReviewRunCheckpoint, ReviewRunStage
+
+
+def checkpoints_enabled() -> bool:
+    return bool(getattr(settings, "REVIEW_ENABLE_CHECKPOINTS", True))
+
+
+class RunCheckpoints:
+    """Checkpoint access for one attempt of a run.
+
+    Only the orchestrating thread touches the database: LLM batch threads hand completed
+    batches over through a queue, and flush_llm_batches() writes them.
+    """
+
+    def __init__(self, run: ReviewRun) -> None:
+        self.run = run
+        self.resumed: List[str] = []
+        self._llm_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    def load(self, stage: str, key: str) -> Optional[Any]:
+        checkpoint = (
+            ReviewRunCheckpoint.objects.filter(run=self.run, stage=stage, key=key)
+            .only("payload")
+            .first()
+        )
+        if checkpoint is None:
+            return None
+        self.resumed.append(stage)
+        return checkpoint.payload
+
+    def save(self, stage: str, key: str, payload: Any) -> None:
+        ReviewRunCheckpoint.objects.update_or_create(
+            run=self.run, stage=stage, key=key, defaults={"payload": payload}
+        )
+
+    def llm_batches(self) -> BatchCheckpoints:
+        completed: Dict[str, Dict[str, Any]] = dict(
+            ReviewRunCheckpoint.objects.filter(
+                run=self.run, stage=ReviewRunStage.LLM
+            ).values_list("key", "payload")
+        )
+        return BatchCheckpoints(
+            completed=completed,
+            on_completed=lambda key, payload: self._llm_queue.put((key, payload)),
+        )
+
+    def flush_llm_batches(self) -> int:
+        rows = []
+        while True:
+            try:
+                key, payload = self._llm_queue.get_nowait()
+            except queue.Empty:
+                break
+            rows.append(
+                ReviewRunCheckpoint(run=self.run, stage=ReviewRunStage.LLM, key=key, payload=payload)
+            )
+        if rows:
+            ReviewRunCheckpoint.objects.bulk_create(rows, ignore_conflicts=True)
+        return len(rows)
+
+    def record_resumed_llm(self, usage: Dict[str, Any]) -> None:
+        if usage.get("llm_batches_resumed"):
+            self.resumed.append(ReviewRunStage.LLM)
+
+    def clear(self) -> None:
+        ReviewRunCheckpoint.objects.filter(run=self.run).delete()
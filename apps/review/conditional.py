@@ -0,0 +1,74 @@
+"""Conditional GET and response caching for finished runs.
+
+A run in a terminal state never changes again until it is reprocessed, and reprocessing
+moves its completed_at. Its responses therefore get a strong ETag derived from run id,
+status and completion time (plus the request variant, e.g. page and ordering).
+Revalidations are answered with 304 before any findings are queried. Full responses are
+served from a shared cache of serialized bodies keyed by that ETag.
+"""
+
+import hashlib
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.review.models import ReviewRun, ReviewRunStatus
+
+TERMINAL_STATUSES = {ReviewRunStatus.SUCCEEDED, ReviewRunStatus.FAILED, ReviewRunStatus.PARTIAL}
+
+
+def run_etag(run: ReviewRun, variant: str = "") -> Optional[str]:
+    """Strong ETag for a finished run's response, or None while the run can still change."""
+    if run.status not in TERMINAL_STATUSES or run.completed_at is None:
+        return None
+    basis = f"{run.id}:{run.status}:{run.completed_at.isoformat()}:{variant}"
+    return '"' + hashlib.sha256(basis.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _cache():
+    return caches[getattr(settings, "REVIEW_RESPONSE_CACHE_ALIAS", "pipeline")]
+
+
+def conditional_run_response(
+    request, run: ReviewRun, variant: str, build: Callable[[], Response]
+) -> Response:
+    """
+    Serve build()'s response with validators when the run is finished: 304 when the
+    client's copy is current, otherwise the cached body (building and caching it on a
+    miss). Runs that are still in progress always go through build().
+    """
+    etag = run_etag(run, variant)
+    if etag is None:
+        return build()
+
+    # HTTP dates have one-second resolution.
+    last_modified = int(run.completed_at.timestamp())
+    validators = HttpResponse()
+    validators["ETag"] = etag
+    validators["Last-Modified"] = http_date(last_modified)
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=validators
+    )
+    if conditional is not validators:
+        return conditional
+
+    cache = _cache()
+    key = "review:response:" + etag.strip('"')
+    data = cache.get(key)
+    if data is None:
+        response = build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        data = response.data
+        cache.set(key, data, timeout=int(getattr(settings, "REVIEW_RESPONSE_CACHE_TTL_SECONDS", 3600)))
+
+    response = Response(data, status=status.HTTP_200_OK)
+    response["ETag"] = validators["ETag"]
+    response["Last-Modified"] = validators["Last-Modified"]
+    return response
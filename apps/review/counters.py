@@ -0,0 +1,71 @@
+"""Denormalized finding counters on ReviewRun.
+
+Counters are updated by the code that inserts or deletes a run's findings, so serializing
+a run (status polls, findings pages) reads them from the row instead of issuing a COUNT.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable
+
+from django.db.models import Count
+
+from apps.review.models import Finding, ReviewRun
+
+FINDING_COUNTER_FIELDS = [
+    "findings_count",
+    "findings_by_severity",
+    "findings_by_source",
+    "findings_by_rule_code",
+]
+
+
+def _merge(current: Dict[str, int], counts: Counter) -> Dict[str, int]:
+    merged = Counter(current or {})
+    merged.update(counts)
+    return {key: value for key, value in sorted(merged.items()) if value > 0}
+
+
+def reset_finding_counts(run: ReviewRun) -> None:
+    """Zero the counters after the run's findings were deleted."""
+    run.findings_count = 0
+    run.findings_by_severity = {}
+    run.findings_by_source = {}
+    run.findings_by_rule_code = {}
+    run.save(update_fields=FINDING_COUNTER_FIELDS)
+
+
+def add_finding_counts(run: ReviewRun, rows: Iterable[Finding]) -> None:
+    """Add freshly inserted rows to the run's counters with a single UPDATE."""
+    rows = list(rows)
+    if not rows:
+        return
+    run.findings_count = (run.findings_count or 0) + len(rows)
+    run.findings_by_severity = _merge(run.findings_by_severity, Counter(r.severity for r in rows))
+    run.findings_by_source = _merge(run.findings_by_source, Counter(r.source for r in rows))
+    run.findings_by_rule_code = _merge(
+        run.findings_by_rule_code, Counter(r.rule_code for r in rows if r.rule_code)
+    )
+    run.save(update_fields=FINDING_COUNTER_FIELDS)
+
+
+def refresh_finding_counts(run: ReviewRun) -> None:
+    """Recompute the counters from the findings table (after partial deletes, backfills)."""
+    severity: Counter = Counter()
+    source: Counter = Counter()
+    rule_code: Counter = Counter()
+    grouped = (
+        Finding.objects.filter(run=run)
+        .values("severity", "source", "rule_code")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in grouped:
+        severity[row["severity"]] += row["n"]
+        source[row["source"]] += row["n"]
+        if row["rule_code"]:
+            rule_code[row["rule_code"]] += row["n"]
+    run.findings_count = sum(source.values())
+    run.findings_by_severity = _merge({}, severity)
+    run.findings_by_source = _merge({}, source)
+    run.findings_by_rule_code = _merge({}, rule_code)
+    run.save(update_fields=FINDING_COUNTER_FIELDS)
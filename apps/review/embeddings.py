@@ -4,7 +4,8 @@ from typing import Iterable, List, Sequence
 
 from django.conf import settings
 from django.db import connection
-from openai import OpenAI
+
+from apps.review.llm.clients import get_openai_client
 
 
 def build_finding_embedding_input(summary: str, explanation: str, evidence: str) -> str:
@@ -27,7 +28,7 @@ def generate_embeddings(texts: Sequence[str]) -> List[List[float]]:
         if api_key:
             model = getattr(settings, "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
             try:
-                client = OpenAI(api_key=api_key)
+                client = get_openai_client(api_key)
                 response = client.embeddings.create(model=model, input=list(texts))
                 return [_normalize_dims(item.embedding, dimensions) for item in response.data]
             except Exception:
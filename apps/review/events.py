@@ -0,0 +1,137 @@
+"""Run progress events for the SSE endpoint.
+
+The pipeline publishes small JSON events per run (stage transitions, LLM batch progress,
+findings persisted, final status) on a pub/sub channel. The SSE view relays them to clients
+without re-reading ReviewRun. With REVIEW_EVENTS_REDIS_URL set the channel is Redis pub/sub,
+so events cross from Celery workers to the web process. Without it an in-process broker is
+used, which covers local development and eager Celery.
+
+Publishing is fire-and-forget: a missing subscriber or an unreachable broker never fails a
+run, and the SSE view always starts from a database snapshot.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_EVENT = "status"
+
+_client_lock = threading.Lock()
+_client: Any = None
+_client_pid: Optional[int] = None
+
+
+def _channel(run_id) -> str:
+    return f"review:run-events:{run_id}"
+
+
+def _redis_url() -> str:
+    return getattr(settings, "REVIEW_EVENTS_REDIS_URL", "") or ""
+
+
+class _LocalBroker:
+    """In-process fan-out to asyncio subscribers; publish() is safe from any thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, channel: str) -> Tuple[asyncio.AbstractEventLoop, asyncio.Queue]:
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(entry)
+        return entry
+
+    def unsubscribe(self, channel: str, entry: Tuple[asyncio.AbstractEventLoop, asyncio.Queue]) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(entry)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def publish(self, channel: str, message: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The subscriber's loop has already closed.
+                pass
+
+
+_local_broker = _LocalBroker()
+
+
+def _publisher():
+    """Process-wide synchronous Redis client, rebuilt after a fork."""
+    global _client, _client_pid
+
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = redis.Redis.from_url(_redis_url())
+            _client_pid = os.getpid()
+        return _client
+
+
+def publish_run_event(run_id, event: str, data: Optional[Dict[str, Any]] = None) -> None:
+    message = json.dumps({"event": event, "data": {"run_id": str(run_id), **(data or {})}}, default=str)
+    channel = _channel(run_id)
+    if not _redis_url():
+        _local_broker.publish(channel, message)
+        return
+    try:
+        _publisher().publish(channel, message)
+    except Exception:
+        logger.warning("Failed to publish %s event for run %s", event, run_id, exc_info=True)
+
+
+class RunEventSubscription:
+    """
+    Async context manager subscribed to one run's events. The subscription is live once
+    the block is entered, so a snapshot read inside the block cannot miss an event.
+    """
+
+    def __init__(self, run_id) -> None:
+        self.channel = _channel(run_id)
+        self._local: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = None
+        self._client: Any = None
+        self._pubsub: Any = None
+
+    async def __aenter__(self) -> "RunEventSubscription":
+        if not _redis_url():
+            self._local = _local_broker.subscribe(self.channel)
+            return self
+        self._client = aioredis.Redis.from_url(_redis_url())
+        self._pubsub = self._client.pubsub()
+        await self._pubsub.subscribe(self.channel)
+        return self
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next event, or None when nothing arrived within timeout seconds."""
+        if self._local is not None:
+            try:
+                message = await asyncio.wait_for(self._local[1].get(), timeout=timeout)
+            except TimeoutError:
+                return None
+            return json.loads(message)
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        return json.loads(message["data"]) if message else None
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._local is not None:
+            _local_broker.unsubscribe(self.channel, self._local)
+            return
+        await self._pubsub.unsubscribe(self.channel)
+        await self._pubsub.aclose()
+        await self._client.aclose()
@@ -0,0 +1,113 @@
+"""Streaming export of a run's findings as NDJSON or CSV.
+
+Rows are read with QuerySet.iterator(chunk_size) over values_list(), which uses a
+server-side cursor on PostgreSQL and never builds model instances. Output is produced one
+chunk at a time, so memory stays flat however many findings the run has.
+
+Under ASGI a StreamingHttpResponse over a sync generator is consumed in full before the
+first byte is sent; aiter_chunks() wraps the generator so each chunk is pulled through
+sync_to_async on the thread that owns the cursor instead.
+"""
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, Generator, Iterator, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.review.models import Finding, ReviewRun
+
+# Same fields, in the same order, as FindingSerializer.
+EXPORT_FIELDS: Tuple[str, ...] = (
+    "id",
+    "run_id",
+    "clause_id",
+    "chunk_id",
+    "clause_heading",
+    "clause_body",
+    "summary",
+    "explanation",
+    "recommendation",
+    "severity",
+    "evidence",
+    "evidence_span",
+    "source",
+    "rule_code",
+    "model",
+    "confidence",
+    "prompt_rev",
+    "created_at",
+)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+_EXHAUSTED = object()
+
+
+def _chunk_size() -> int:
+    return max(1, int(getattr(settings, "REVIEW_EXPORT_CHUNK_SIZE", 2000)))
+
+
+def _iter_finding_dicts(run: ReviewRun) -> Iterator[Dict[str, Any]]:
+    rows = (
+        Finding.objects.filter(run=run)
+        .order_by("created_at", "id")
+        .values_list(*EXPORT_FIELDS)
+        .iterator(chunk_size=_chunk_size())
+    )
+    for row in rows:
+        yield dict(zip(EXPORT_FIELDS, row))
+
+
+def _json_value(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if value is not None and not isinstance(value, (str, int, float, bool, dict, list)):
+        return str(value)
+    return value
+
+
+def iter_findings_ndjson(run: ReviewRun) -> Iterator[str]:
+    lines = []
+    for finding in _iter_finding_dicts(run):
+        lines.append(json.dumps({key: _json_value(value) for key, value in finding.items()}))
+        if len(lines) >= _chunk_size():
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def iter_findings_csv(run: ReviewRun) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    written = 0
+    for finding in _iter_finding_dicts(run):
+        span = finding["evidence_span"]
+        finding["evidence_span"] = json.dumps(span) if span is not None else ""
+        writer.writerow(["" if value is None else _json_value(value) for value in finding.values()])
+        written += 1
+        if written % _chunk_size() == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+async def aiter_chunks(chunks: Generator[str, None, None]) -> AsyncIterator[str]:
+    """Async view of an export generator; closes it (and its cursor) if the client goes away."""
+    pull = sync_to_async(next, thread_sensitive=True)
+    try:
+        while True:
+            chunk = await pull(chunks, _EXHAUSTED)
+            if chunk is _EXHAUSTED:
+                return
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
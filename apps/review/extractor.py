@@ -1,6 +1,6 @@
 import re
 import uuid
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 
 
 def normalize_text(text: str) -> str:
@@ -48,12 +48,29 @@ def is_heading_line(line: str) -> bool:
     return False
 
 
+BLOCK_SEPARATOR_RE = re.compile(r"\n\s*\n+")
+
+
+def _iter_blocks(text: str) -> Iterator[str]:
+    """
+    Lazily yield blocks separated by blank lines (same blocks as _split_into_blocks).
+    """
+    start = 0
+    for match in BLOCK_SEPARATOR_RE.finditer(text):
+        block = text[start : match.start()].strip()
+        if block:
+            yield block
+        start = match.end()
+    block = text[start:].strip()
+    if block:
+        yield block
+
+
 def _split_into_blocks(text: str) -> List[str]:
     """
     Split text into blocks separated by blank lines.
     """
-    blocks = re.split(r"\n\s*\n+", text)
-    return [b.strip() for b in blocks if b.strip()]
+    return list(_iter_blocks(text))
 
 
 def extract_clauses(text: str) -> List[Dict]:
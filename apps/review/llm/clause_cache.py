@@ -0,0 +1,71 @@
+"""Content-addressed cache of validated LLM findings per clause."""
+
+import hashlib
+from typing import Dict, List, Tuple
+
+from apps.review.cache import pipeline_cache
+from django.conf import settings
+
+from .prompts import PROMPT_REV
+from .schema import FINDINGS_SCHEMA_VERSION
+
+# Per-finding keys that are bound to a specific run/clause and rebuilt on a cache hit.
+_RUN_BOUND_KEYS = ("id", "clause_id")
+
+
+def clause_cache_enabled() -> bool:
+    return bool(getattr(settings, "REVIEW_ENABLE_CLAUSE_CACHE", True))
+
+
+def clause_content_hash(clause: Dict) -> str:
+    """
+    Hash the clause heading and body.
+
+    Chunk text is already normalized by preprocessing, and cached evidence spans are
+    offsets into the body, so the body is hashed exactly as the LLM saw it.
+    """
+    heading = (clause.get("heading") or "").strip()
+    body = clause.get("body") or ""
+    return hashlib.sha256(f"{heading}\n{body}".encode()).hexdigest()
+
+
+def clause_cache_key(clause: Dict, model: str) -> str:
+    return (
+        f"review:clause:{clause_content_hash(clause)}:{model}:{PROMPT_REV}:{FINDINGS_SCHEMA_VERSION}"
+    )
+
+
+def lookup_cached_clause_findings(
+    clauses: List[Dict], model: str
+) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """
+    Return (cached findings by clause id, clauses that still need an LLM call).
+
+    Clauses with a cached empty list are hits: the LLM already decided they have no finding.
+    """
+    keys = {clause["id"]: clause_cache_key(clause, model) for clause in clauses}
+    found = pipeline_cache.get_many(list(set(keys.values())))
+
+    hits: Dict[str, List[Dict]] = {}
+    misses: List[Dict] = []
+    for clause in clauses:
+        entry = found.get(keys[clause["id"]])
+        if entry is None:
+            misses.append(clause)
+        else:
+            hits[clause["id"]] = entry
+    return hits, misses
+
+
+def store_clause_findings(
+    clauses: List[Dict], findings_by_clause: Dict[str, List[Dict]], model: str
+) -> None:
+    timeout = int(getattr(settings, "REVIEW_CLAUSE_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+    entries = {}
+    for clause in clauses:
+        entries[clause_cache_key(clause, model)] = [
+            {k: v for k, v in finding.items() if k not in _RUN_BOUND_KEYS}
+            for finding in findings_by_clause.get(clause["id"], [])
+        ]
+    if entries:
+        pipeline_cache.set_many(entries, timeout=timeout)
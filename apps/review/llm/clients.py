@@ -0,0 +1,91 @@
+"""Process-wide OpenAI clients.
+
+Building an OpenAI client per call throws away its connection pool and TLS sessions, so
+the chat and embedding calls share one client per configuration per process. The
+underlying httpx pool keeps connections alive between calls and is safe to use from the
+LLM batch threads. Clients are rebuilt after a fork (Celery prefork children) so sockets
+are never shared across processes.
+"""
+
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import httpx
+from django.conf import settings
+from openai import DefaultHttpxClient, OpenAI
+
+
+class ClientConfig(NamedTuple):
+    api_key: str
+    base_url: Optional[str]
+    timeout_seconds: float
+    connect_timeout_seconds: float
+    max_connections: int
+    max_keepalive_connections: int
+    max_retries: int
+
+
+_lock = threading.Lock()
+_clients: Dict[ClientConfig, OpenAI] = {}
+_owner_pid: Optional[int] = None
+
+
+def openai_client_config(api_key: str) -> ClientConfig:
+    return ClientConfig(
+        api_key=api_key,
+        base_url=getattr(settings, "OPENAI_BASE_URL", "") or None,
+        timeout_seconds=float(getattr(settings, "OPENAI_TIMEOUT_SECONDS", 60.0)),
+        connect_timeout_seconds=float(getattr(settings, "OPENAI_CONNECT_TIMEOUT_SECONDS", 5.0)),
+        max_connections=max(1, int(getattr(settings, "OPENAI_MAX_CONNECTIONS", 20))),
+        max_keepalive_connections=max(0, int(getattr(settings, "OPENAI_MAX_KEEPALIVE_CONNECTIONS", 10))),
+        max_retries=max(0, int(getattr(settings, "OPENAI_MAX_RETRIES", 2))),
+    )
+
+
+def build_openai_client(config: ClientConfig) -> OpenAI:
+    timeout = httpx.Timeout(config.timeout_seconds, connect=config.connect_timeout_seconds)
+    http_client = DefaultHttpxClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+        ),
+    )
+    return OpenAI(
+        api_key=config.api_key,
+        base_url=config.base_url,
+        timeout=timeout,
+        max_retries=config.max_retries,
+        http_client=http_client,
+    )
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    """Return the pooled client for the current settings, building it on first use."""
+    global _owner_pid
+
+    config = openai_client_config(api_key)
+    with _lock:
+        pid = os.getpid()
+        if _owner_pid != pid:
+            # Inherited from the parent process; its sockets must not be reused here.
+            _clients.clear()
+            _owner_pid = pid
+        client = _clients.get(config)
+        if client is None:
+            client = build_openai_client(config)
+            _clients[config] = client
+        return client
+
+
+def close_openai_clients() -> None:
+    """Close pooled connections (worker shutdown, tests)."""
+    global _owner_pid
+
+    with _lock:
+        clients = list(_clients.values()) if _owner_pid == os.getpid() else []
+        _clients.clear()
+        _owner_pid = None
+    for client in clients:
+        client.close()
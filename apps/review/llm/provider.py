@@ -1,12 +1,29 @@
+import hashlib
 import json
+import math
+import threading
 import uuid
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.conf import settings
-from openai import OpenAI
 
-from .prompts import SYSTEM_PROMPT, PROMPT_REV
-from .schema import FINDINGS_JSON_SCHEMA, LLMValidationError, validate_llm_response
+from .clause_cache import (
+    clause_cache_enabled,
+    lookup_cached_clause_findings,
+    store_clause_findings,
+)
+from .clients import get_openai_client
+from .prompts import PROMPT_REV, SYSTEM_PROMPT
+from .schema import (
+    FINDINGS_JSON_SCHEMA,
+    LLMValidationError,
+    validate_llm_finding,
+    validate_llm_response,
+)
+from .streaming import FindingsStreamParser
 
 
 def _build_clauses_payload(clauses: List[Dict]) -> List[Dict]:
@@ -23,6 +40,53 @@ def _build_clauses_payload(clauses: List[Dict]) -> List[Dict]:
     ]
 
 
+def estimate_clause_tokens(clause: Dict) -> int:
+    """
+    Cheap token estimate for a clause payload (~4 characters per token).
+    Good enough for budgeting batches without pulling in a tokenizer.
+    """
+    heading = clause.get("heading") or ""
+    body = clause.get("body") or ""
+    # Fixed overhead covers the id and JSON framing around each clause.
+    return math.ceil((len(heading) + len(body)) / 4) + 16
+
+
+def batch_clauses_by_token_budget(clauses: List[Dict], max_tokens: int) -> List[List[Dict]]:
+    """
+    Split clauses into ordered batches whose estimated token cost stays within max_tokens.
+    A single clause larger than the budget is sent on its own rather than truncated.
+    """
+    budget = max(1, int(max_tokens))
+    batches: List[List[Dict]] = []
+    current: List[Dict] = []
+    current_tokens = 0
+
+    for clause in clauses:
+        cost = estimate_clause_tokens(clause)
+        if current and current_tokens + cost > budget:
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(clause)
+        current_tokens += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def sum_token_usage(usages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum usage dicts key by key; keys that are None everywhere stay None."""
+    totals: Dict[str, Any] = {"prompt_tokens": None, "completion_tokens": None, "total_tokens": None}
+    for usage in usages:
+        for key, value in usage.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[key] = (totals.get(key) or 0) + value
+            else:
+                totals.setdefault(key, None)
+    return totals
+
+
 def _mock_findings_for_clauses(clauses: List[Dict]) -> List[Dict]:
     """
     Simple deterministic mock response:
@@ -57,9 +121,31 @@ def _mock_findings_for_clauses(clauses: List[Dict]) -> List[Dict]:
     return findings
 
 
-def call_llm_for_clauses(clauses: List[Dict]) -> Tuple[List[Dict], str, Dict[str, Any]]:
+FindingCallback = Callable[[Dict], None]
+# Called with (batches done, batches total) as each LLM batch finishes.
+BatchProgressCallback = Callable[[int, int], None]
+
+
+def _zero_usage() -> Dict[str, Any]:
+    return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+
+def _emit_all(findings: List[Dict], on_finding: Optional[FindingCallback]) -> None:
+    if on_finding is not None:
+        for finding in findings:
+            on_finding(finding)
+
+
+def call_llm_for_clauses(
+    clauses: List[Dict], on_finding: Optional[FindingCallback] = None
+) -> Tuple[List[Dict], str, Dict[str, Any]]:
     """
-    Calls the LLM once with all clauses and returns (raw_findings, model_name).
+    Calls the LLM once with a single batch of clauses and returns
+    (raw_findings, model_name, usage).
+
+    When on_finding is given, each raw finding is validated and passed to it as soon as
+    it is complete; with REVIEW_LLM_STREAM_FINDINGS the completion is streamed and parsed
+    incrementally. The full response is still validated before returning.
 
     Raw JSON response shape:
     {
@@ -80,34 +166,24 @@ def call_llm_for_clauses(clauses: List[Dict]) -> Tuple[List[Dict], str, Dict[str
     # 1) Quick mock check
     if provider == "mock":
         validated = validate_llm_response({"findings": _mock_findings_for_clauses(clauses)})
-        return validated["findings"], "mock", {
-            "prompt_tokens": 0,
-            "completion_tokens": 0,
-            "total_tokens": 0,
-        }
+        _emit_all(validated["findings"], on_finding)
+        return validated["findings"], "mock", _zero_usage()
 
     model = getattr(settings, "OPENAI_MODEL", "gpt-4o-mini")
 
     # Always return a tuple (findings, model)
     if not clauses:
-        return [], model, {
-            "prompt_tokens": 0,
-            "completion_tokens": 0,
-            "total_tokens": 0,
-        }
+        return [], model, _zero_usage()
 
     api_key = getattr(settings, "OPENAI_API_KEY", None)
 
     # Optional: if no key, silently fall back to mock so you can keep working.
     if not api_key:
         validated = validate_llm_response({"findings": _mock_findings_for_clauses(clauses)})
-        return validated["findings"], "mock", {
-            "prompt_tokens": 0,
-            "completion_tokens": 0,
-            "total_tokens": 0,
-        }
+        _emit_all(validated["findings"], on_finding)
+        return validated["findings"], "mock", _zero_usage()
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
 
     payload = {"clauses": _build_clauses_payload(clauses)}
 
@@ -121,12 +197,11 @@ def call_llm_for_clauses(clauses: List[Dict]) -> Tuple[List[Dict], str, Dict[str
             ),
         },
     ]
-
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=0.1,
-        response_format={
+    request = {
+        "model": model,
+        "messages": messages,
+        "temperature": 0.1,
+        "response_format": {
             "type": "json_schema",
             "json_schema": {
                 "name": "contract_clause_findings",
@@ -134,14 +209,20 @@ def call_llm_for_clauses(clauses: List[Dict]) -> Tuple[List[Dict], str, Dict[str
                 "schema": FINDINGS_JSON_SCHEMA,
             },
         },
-    )
+    }
+
+    if on_finding is not None and llm_streaming_enabled():
+        validated, usage = _stream_chat_completion(client, request, on_finding)
+    else:
+        response = client.chat.completions.create(**request)
+        content = response.choices[0].message.content
+        raw = json.loads(content)
 
-    content = response.choices[0].message.content
-    raw = json.loads(content)
+        validated = validate_llm_response(raw)
+        _emit_all(validated["findings"], on_finding)
+        usage = getattr(response, "usage", None)
 
-    validated = validate_llm_response(raw)
     findings_raw = validated["findings"]
-    usage = getattr(response, "usage", None)
     usage_dict = {
         "prompt_tokens": getattr(usage, "prompt_tokens", None),
         "completion_tokens": getattr(usage, "completion_tokens", None),
@@ -151,6 +232,136 @@ def call_llm_for_clauses(clauses: List[Dict]) -> Tuple[List[Dict], str, Dict[str
     return findings_raw, model, usage_dict
 
 
+def llm_streaming_enabled() -> bool:
+    return bool(getattr(settings, "REVIEW_LLM_STREAM_FINDINGS", False))
+
+
+def _stream_chat_completion(
+    client, request: Dict[str, Any], on_finding: FindingCallback
+) -> Tuple[Dict[str, Any], Any]:
+    """Stream a completion, handing each finding to on_finding as soon as its object closes."""
+    parser = FindingsStreamParser()
+    usage = None
+    stream = client.chat.completions.create(
+        **request, stream=True, stream_options={"include_usage": True}
+    )
+    for event in stream:
+        if getattr(event, "usage", None) is not None:
+            usage = event.usage
+        for choice in getattr(event, "choices", None) or []:
+            fragment = getattr(choice.delta, "content", None)
+            items = parser.feed(fragment or "")
+            first_index = parser.emitted - len(items)
+            for offset, item in enumerate(items):
+                on_finding(validate_llm_finding(item, f"finding[{first_index + offset}]"))
+    return parser.close(), usage
+
+
+@dataclass
+class BatchCheckpoints:
+    """
+    Per-batch LLM results saved by an earlier attempt of the same run, plus a hook that
+    receives each newly completed batch (called from batch threads). Keys come from
+    batch_checkpoint_key; values are {"findings", "model", "usage"} with raw findings.
+    """
+
+    completed: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    on_completed: Optional[Callable[[str, Dict[str, Any]], None]] = None
+
+
+def batch_checkpoint_key(batch: List[Dict]) -> str:
+    """Stable identity of a batch: its clause ids (content-derived), model and prompt revision."""
+    ids = "|".join(str(clause["id"]) for clause in batch)
+    digest = hashlib.sha256(f"{ids}|{resolve_llm_model()}|{PROMPT_REV}".encode())
+    return digest.hexdigest()
+
+
+def call_llm_for_clause_batches(
+    clauses: List[Dict],
+    *,
+    max_batch_tokens: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    on_finding: Optional[FindingCallback] = None,
+    checkpoints: Optional[BatchCheckpoints] = None,
+    on_batch_done: Optional[BatchProgressCallback] = None,
+) -> Tuple[List[Dict], str, Dict[str, Any]]:
+    """
+    Split clauses into token-budgeted batches and call the LLM for each batch concurrently.
+
+    Findings are merged in batch order and usage is summed across batches, so the result
+    has the same shape as call_llm_for_clauses. Any batch failure propagates to the caller.
+    on_finding and on_batch_done are called from the batch threads, in completion order.
+    Batches found in checkpoints are served from there instead of calling the LLM again.
+    """
+    if max_batch_tokens is None:
+        max_batch_tokens = getattr(settings, "REVIEW_LLM_BATCH_MAX_TOKENS", 6000)
+    if max_concurrency is None:
+        max_concurrency = getattr(settings, "REVIEW_LLM_MAX_CONCURRENCY", 4)
+
+    call = call_llm_for_clauses
+    if on_finding is not None:
+        call = partial(call_llm_for_clauses, on_finding=on_finding)
+
+    batches = batch_clauses_by_token_budget(clauses, max_batch_tokens)
+    keys = [batch_checkpoint_key(batch) for batch in batches] if checkpoints else []
+    resumed = sum(1 for key in keys if key in checkpoints.completed) if checkpoints else 0
+
+    progress_lock = threading.Lock()
+    done = 0
+
+    def report_progress() -> None:
+        nonlocal done
+        if on_batch_done is None:
+            return
+        with progress_lock:
+            done += 1
+            on_batch_done(done, len(batches))
+
+    def run_batch(index: int) -> Tuple[List[Dict], str, Dict[str, Any]]:
+        batch = batches[index]
+        if not checkpoints:
+            result = call(batch)
+            report_progress()
+            return result
+        key = keys[index]
+        saved = checkpoints.completed.get(key)
+        if saved is not None:
+            _emit_all(saved["findings"], on_finding)
+            report_progress()
+            return saved["findings"], saved["model"], dict(saved["usage"])
+        result = call(batch)
+        if checkpoints.on_completed is not None:
+            checkpoints.on_completed(key, {"findings": result[0], "model": result[1], "usage": result[2]})
+        report_progress()
+        return result
+
+    if not batches:
+        findings, model, usage = call(clauses)
+        usage["llm_batches"] = 0
+        return findings, model, usage
+    if len(batches) == 1:
+        findings, model, usage = run_batch(0)
+        usage["llm_batches"] = 1
+        if checkpoints:
+            usage["llm_batches_resumed"] = resumed
+        return findings, model, usage
+
+    workers = max(1, min(int(max_concurrency), len(batches)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-batch") as executor:
+        # map() preserves batch order regardless of completion order.
+        results = list(executor.map(run_batch, range(len(batches))))
+
+    findings: List[Dict] = []
+    for batch_findings, _, _ in results:
+        findings.extend(batch_findings)
+    model = results[0][1]
+    usage = sum_token_usage([batch_usage for _, _, batch_usage in results])
+    usage["llm_batches"] = len(batches)
+    if checkpoints:
+        usage["llm_batches_resumed"] = resumed
+    return findings, model, usage
+
+
 def _is_span_in_clause_body(span: Dict[str, int], body: str) -> bool:
     if not isinstance(span, dict):
         return False
@@ -163,58 +374,150 @@ def _is_span_in_clause_body(span: Dict[str, int], body: str) -> bool:
     return end <= len(body)
 
 
+def resolve_llm_model() -> str:
+    """Model name that call_llm_for_clauses will report for the current settings."""
+    provider = getattr(settings, "LLM_PROVIDER", "openai").lower()
+    if provider == "mock" or not getattr(settings, "OPENAI_API_KEY", None):
+        return "mock"
+    return getattr(settings, "OPENAI_MODEL", "gpt-4o-mini")
+
+
+def _normalize_llm_finding(
+    item: Dict, by_clause_id: Dict[str, Dict], model: str
+) -> Optional[Dict]:
+    """Normalize one raw LLM finding, gating on evidence; None when it is dropped."""
+    clause_id = item.get("clause_id")
+    if clause_id not in by_clause_id:
+        return None
+
+    severity = item.get("severity", "medium")
+    summary = (item.get("summary") or "").strip()
+    explanation = (item.get("explanation") or "").strip()
+    evidence_text = (item.get("evidence_text") or "").strip()
+    evidence_span = item.get("evidence_span")
+    confidence = item.get("confidence", 0.8)
+
+    if not evidence_text:
+        # Simple "evidence gating": skip items without evidence.
+        return None
+
+    clause_body = (by_clause_id[clause_id].get("body") or "")
+    if not _is_span_in_clause_body(evidence_span, clause_body):
+        raise LLMValidationError(
+            f"evidence_span out of bounds for clause_id={clause_id}"
+        )
+
+    return {
+        "id": str(uuid.uuid4()),
+        "clause_id": clause_id,
+        "rule_code": None,  # only for deterministic rules
+        "severity": severity,
+        "summary": summary,
+        "explanation": explanation,
+        "evidence_text": evidence_text,
+        "evidence_span": evidence_span,
+        "source": "llm",
+        "confidence": float(confidence),
+        "model": model,
+        "prompt_rev": PROMPT_REV,
+    }
+
+
+def _normalize_llm_findings(
+    raw_findings: List[Dict], clauses: List[Dict], model: str
+) -> List[Dict]:
+    """Normalize raw LLM findings into internal finding dicts, gating on evidence."""
+    by_clause_id = {c["id"]: c for c in clauses}
+
+    normalized: List[Dict] = []
+    for item in raw_findings:
+        finding = _normalize_llm_finding(item, by_clause_id, model)
+        if finding is not None:
+            normalized.append(finding)
+
+    return normalized
+
+
+def _group_by_clause(findings: List[Dict]) -> Dict[str, List[Dict]]:
+    grouped: Dict[str, List[Dict]] = {}
+    for finding in findings:
+        grouped.setdefault(finding["clause_id"], []).append(finding)
+    return grouped
+
+
 def generate_llm_findings_with_usage_for_clauses(
     clauses: List[Dict],
+    on_finding: Optional[FindingCallback] = None,
+    checkpoints: Optional[BatchCheckpoints] = None,
+    on_batch_done: Optional[BatchProgressCallback] = None,
 ) -> Tuple[List[Dict], str, Dict[str, Any]]:
     """
     Public function:
-    - Calls the LLM (or mock)
+    - Serves clauses seen before from the per-clause findings cache
+    - Calls the LLM (or mock) in token-budgeted, concurrent batches for the rest
     - Normalizes the raw JSON into internal finding dicts
-    """
-    raw_findings, model, usage = call_llm_for_clauses(clauses)
 
-    by_clause_id = {c["id"]: c for c in clauses}
-
-    normalized: List[Dict] = []
-    for item in raw_findings:
-        clause_id = item.get("clause_id")
-        if clause_id not in by_clause_id:
-            continue
-
-        severity = item.get("severity", "medium")
-        summary = (item.get("summary") or "").strip()
-        explanation = (item.get("explanation") or "").strip()
-        evidence_text = (item.get("evidence_text") or "").strip()
-        evidence_span = item.get("evidence_span")
-        confidence = item.get("confidence", 0.8)
-
-        if not evidence_text:
-            # Simple "evidence gating": skip items without evidence.
-            continue
-
-        clause_body = (by_clause_id[clause_id].get("body") or "")
-        if not _is_span_in_clause_body(evidence_span, clause_body):
-            raise LLMValidationError(
-                f"evidence_span out of bounds for clause_id={clause_id}"
-            )
-
-        normalized.append(
-            {
-                "id": str(uuid.uuid4()),
-                "clause_id": clause_id,
-                "rule_code": None,  # only for deterministic rules
-                "severity": severity,
-                "summary": summary,
-                "explanation": explanation,
-                "evidence_text": evidence_text,
-                "evidence_span": evidence_span,
-                "source": "llm",
-                "confidence": float(confidence),
-                "model": model,
-                "prompt_rev": PROMPT_REV,
-            }
+    Usage includes clause_cache_hits/clause_cache_misses so callers can record them.
+    When on_finding is given, every normalized finding in the returned list is also passed
+    to it as soon as it is available (cached ones first, then LLM ones as they stream in,
+    possibly from batch threads). Findings already emitted are not retracted if the call
+    later fails; callers decide what to keep. checkpoints and on_batch_done are passed
+    through to call_llm_for_clause_batches (resume unfinished batches, report progress).
+    """
+    use_cache = clause_cache_enabled()
+    cached: Dict[str, List[Dict]] = {}
+    pending = clauses
+    if use_cache and clauses:
+        cached, pending = lookup_cached_clause_findings(clauses, resolve_llm_model())
+
+    served: Dict[str, List[Dict]] = {
+        clause_id: [
+            {**finding, "id": str(uuid.uuid4()), "clause_id": clause_id} for finding in findings
+        ]
+        for clause_id, findings in cached.items()
+    }
+    for findings in served.values():
+        _emit_all(findings, on_finding)
+
+    if pending:
+        streamed: List[Dict] = []
+        on_raw = None
+        if on_finding is not None:
+            pending_by_id = {c["id"]: c for c in pending}
+            streamed_model = resolve_llm_model()
+            lock = threading.Lock()
+
+            def on_raw(item: Dict) -> None:
+                finding = _normalize_llm_finding(item, pending_by_id, streamed_model)
+                if finding is not None:
+                    with lock:
+                        streamed.append(finding)
+                    on_finding(finding)
+
+        raw_findings, model, usage = call_llm_for_clause_batches(
+            pending, on_finding=on_raw, checkpoints=checkpoints, on_batch_done=on_batch_done
         )
+        if on_raw is not None:
+            fresh = _group_by_clause(streamed)
+        else:
+            fresh = _group_by_clause(_normalize_llm_findings(raw_findings, pending, model))
+        if use_cache:
+            store_clause_findings(pending, fresh, model)
+    else:
+        model = resolve_llm_model()
+        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "llm_batches": 0}
+        fresh = {}
 
+    normalized: List[Dict] = []
+    for clause in clauses:
+        clause_id = clause["id"]
+        if clause_id in served:
+            normalized.extend(served[clause_id])
+        else:
+            normalized.extend(fresh.get(clause_id, []))
+
+    usage["clause_cache_hits"] = len(cached)
+    usage["clause_cache_misses"] = len(pending) if use_cache else 0
     return normalized, model, usage
 
 
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
+# Bump whenever FINDINGS_JSON_SCHEMA or the normalized finding shape changes.
+FINDINGS_SCHEMA_VERSION = "v1"
 
 FINDINGS_JSON_SCHEMA: Dict[str, Any] = {
     "type": "object",
@@ -68,6 +70,56 @@ def _require_non_empty_str(value: Any, context: str) -> None:
         raise LLMValidationError(f"{context}: expected non-empty string")
 
 
+_FINDING_KEYS = [
+    "clause_id",
+    "severity",
+    "summary",
+    "explanation",
+    "evidence_text",
+    "evidence_span",
+    "confidence",
+]
+
+
+def validate_llm_finding(finding: Any, ctx: str = "finding") -> Dict[str, Any]:
+    """Validate a single finding strictly; used per item while a response streams in."""
+    if not isinstance(finding, dict):
+        raise LLMValidationError(f"{ctx}: expected object")
+
+    _require_keys(finding, _FINDING_KEYS, ctx)
+    _reject_extra_keys(finding, _FINDING_KEYS, ctx)
+
+    _require_non_empty_str(finding["clause_id"], f"{ctx}.clause_id")
+    severity = finding["severity"]
+    if severity not in ("low", "medium", "high"):
+        raise LLMValidationError(f"{ctx}.severity: expected one of low|medium|high")
+
+    _require_non_empty_str(finding["summary"], f"{ctx}.summary")
+    _require_non_empty_str(finding["explanation"], f"{ctx}.explanation")
+    _require_non_empty_str(finding["evidence_text"], f"{ctx}.evidence_text")
+
+    span = finding["evidence_span"]
+    if not isinstance(span, dict):
+        raise LLMValidationError(f"{ctx}.evidence_span: expected object")
+    _require_keys(span, ["start", "end"], f"{ctx}.evidence_span")
+    _reject_extra_keys(span, ["start", "end"], f"{ctx}.evidence_span")
+
+    start = span["start"]
+    end = span["end"]
+    if not isinstance(start, int) or not isinstance(end, int):
+        raise LLMValidationError(f"{ctx}.evidence_span: start/end must be integers")
+    if start < 0 or end <= start:
+        raise LLMValidationError(f"{ctx}.evidence_span: expected 0 <= start < end")
+
+    confidence = finding["confidence"]
+    if not isinstance(confidence, (int, float)):
+        raise LLMValidationError(f"{ctx}.confidence: expected number")
+    if confidence < 0 or confidence > 1:
+        raise LLMValidationError(f"{ctx}.confidence: expected between 0 and 1")
+
+    return finding
+
+
 def validate_llm_response(raw: Any) -> Dict[str, Any]:
     """Validate the top-level LLM response and each finding strictly."""
     if not isinstance(raw, dict):
@@ -80,50 +132,7 @@ def validate_llm_response(raw: Any) -> Dict[str, Any]:
     if not isinstance(findings, list):
         raise LLMValidationError("root.findings: expected array")
 
-    allowed_finding_keys = [
-        "clause_id",
-        "severity",
-        "summary",
-        "explanation",
-        "evidence_text",
-        "evidence_span",
-        "confidence",
-    ]
-
     for idx, finding in enumerate(findings):
-        ctx = f"finding[{idx}]"
-        if not isinstance(finding, dict):
-            raise LLMValidationError(f"{ctx}: expected object")
-
-        _require_keys(finding, allowed_finding_keys, ctx)
-        _reject_extra_keys(finding, allowed_finding_keys, ctx)
-
-        _require_non_empty_str(finding["clause_id"], f"{ctx}.clause_id")
-        severity = finding["severity"]
-        if severity not in ("low", "medium", "high"):
-            raise LLMValidationError(f"{ctx}.severity: expected one of low|medium|high")
-
-        _require_non_empty_str(finding["summary"], f"{ctx}.summary")
-        _require_non_empty_str(finding["explanation"], f"{ctx}.explanation")
-        _require_non_empty_str(finding["evidence_text"], f"{ctx}.evidence_text")
-
-        span = finding["evidence_span"]
-        if not isinstance(span, dict):
-            raise LLMValidationError(f"{ctx}.evidence_span: expected object")
-        _require_keys(span, ["start", "end"], f"{ctx}.evidence_span")
-        _reject_extra_keys(span, ["start", "end"], f"{ctx}.evidence_span")
-
-        start = span["start"]
-        end = span["end"]
-        if not isinstance(start, int) or not isinstance(end, int):
-            raise LLMValidationError(f"{ctx}.evidence_span: start/end must be integers")
-        if start < 0 or end <= start:
-            raise LLMValidationError(f"{ctx}.evidence_span: expected 0 <= start < end")
-
-        confidence = finding["confidence"]
-        if not isinstance(confidence, (int, float)):
-            raise LLMValidationError(f"{ctx}.confidence: expected number")
-        if confidence < 0 or confidence > 1:
-            raise LLMValidationError(f"{ctx}.confidence: expected between 0 and 1")
+        validate_llm_finding(finding, f"finding[{idx}]")
 
     return raw
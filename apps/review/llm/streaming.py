@@ -0,0 +1,101 @@
+"""Incremental parsing of streamed LLM findings responses."""
+
+import json
+import re
+from typing import Any, Dict, List
+
+from .schema import LLMValidationError, validate_llm_response
+
+_FINDINGS_ARRAY_RE = re.compile(r'"findings"\s*:\s*\[')
+
+
+class FindingsStreamParser:
+    """
+    Extract finding objects from a streamed {"findings": [...]} completion as each object
+    closes, without waiting for the rest of the document.
+
+    feed() accepts arbitrary text fragments (token deltas) and returns the raw finding
+    dicts completed by that fragment. close() parses and validates the full document, so
+    the final result is exactly what the non-streaming path would have accepted.
+    """
+
+    def __init__(self) -> None:
+        self._text: List[str] = []
+        self._buffer = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start = 0
+        self.emitted = 0
+
+    def feed(self, fragment: str) -> List[Dict[str, Any]]:
+        if not fragment:
+            return []
+        self._text.append(fragment)
+        if self._done:
+            return []
+        self._buffer += fragment
+
+        if not self._in_array:
+            match = _FINDINGS_ARRAY_RE.search(self._buffer)
+            if not match:
+                return []
+            self._in_array = True
+            self._pos = match.end()
+
+        completed: List[Dict[str, Any]] = []
+        buffer = self._buffer
+        for idx in range(self._pos, len(buffer)):
+            char = buffer[idx]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._object_start = idx
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.append(
+                        self._parse_object(
+                            buffer[self._object_start : idx + 1], self.emitted + len(completed)
+                        )
+                    )
+            elif char == "]" and self._depth == 0:
+                self._done = True
+                break
+
+        # Drop everything before the open object so the scan buffer stays small.
+        keep_from = self._object_start if self._depth else len(buffer)
+        self._buffer = buffer[keep_from:]
+        self._object_start = 0
+        self._pos = len(self._buffer)
+        self.emitted += len(completed)
+        return completed
+
+    def close(self) -> Dict[str, Any]:
+        content = "".join(self._text)
+        try:
+            raw = json.loads(content)
+        except ValueError as exc:
+            raise LLMValidationError(f"root: invalid JSON in streamed response: {exc}") from exc
+        validated = validate_llm_response(raw)
+        if len(validated["findings"]) != self.emitted:
+            raise LLMValidationError("root.findings: streamed findings do not match final response")
+        return validated
+
+    def _parse_object(self, text: str, index: int) -> Dict[str, Any]:
+        try:
+            return json.loads(text)
+        except ValueError as exc:
+            raise LLMValidationError(f"finding[{index}]: invalid JSON: {exc}") from exc
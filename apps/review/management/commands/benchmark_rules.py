@@ -0,0 +1,116 @@
+import random
+import re
+import time
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand
+
+from apps.review.rules import RuleScanner, RuleTrigger, _make_finding, get_rule_registry
+
+
+def _presence_rule(code: str, pattern: str):
+    compiled = re.compile(pattern, re.IGNORECASE)
+
+    def rule(clause: Dict, **kwargs) -> List[Dict]:
+        text = f"{clause.get('heading', '')}\n{clause.get('body', '')}"
+        if not compiled.search(text):
+            return []
+        return [
+            _make_finding(
+                clause_id=clause["id"],
+                rule_code=code,
+                severity="low",
+                summary=f"{code} present.",
+                explanation="Synthetic benchmark rule.",
+                evidence_text=text[:80],
+                evidence_span={"start": 0, "end": min(80, len(text))},
+            )
+        ]
+
+    return rule
+
+
+def _synthetic_triggers(count: int) -> List[RuleTrigger]:
+    base = get_rule_registry().triggers
+    triggers = list(base)
+    for idx in range(max(0, count - len(triggers))):
+        keyword = f"covenant{idx:03d}"
+        triggers.append(
+            RuleTrigger(_presence_rule(f"SYN_{idx:03d}", keyword), keyword, frozenset({keyword}))
+        )
+    return triggers[:count] if count >= len(base) else triggers
+
+
+def _synthetic_clauses(count: int, rule_count: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    filler = (
+        "The parties agree that this Agreement sets out the entire understanding between them "
+        "and supersedes all prior negotiations, representations and agreements."
+    )
+    fragments = [
+        "Either party may terminate this Agreement with 15 days notice.",
+        "Vendor shall indemnify and hold harmless the Customer.",
+        "Confidential Information shall be protected for 7 years.",
+        "This Agreement is governed by the laws of New York.",
+    ] + [f"The covenant{idx:03d} applies." for idx in range(rule_count)]
+    clauses = []
+    for idx in range(count):
+        body = filler
+        if rng.random() < 0.3:
+            body = f"{filler} {rng.choice(fragments)}"
+        clauses.append({"id": f"chk_{idx}", "heading": f"Section {idx + 1}", "body": body})
+    return clauses
+
+
+def _run_naive(clauses, triggers) -> int:
+    total = 0
+    for clause in clauses:
+        for trigger in triggers:
+            total += len(trigger.func(clause, preferred_jurisdiction="California"))
+    return total
+
+
+def _run_scanner(clauses, scanner) -> int:
+    total = 0
+    for clause in clauses:
+        text = f"{clause.get('heading', '')}\n{clause.get('body', '')}"
+        for trigger in scanner.matching(text):
+            total += len(trigger.func(clause, preferred_jurisdiction="California"))
+    return total
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-rule evaluation against the compiled rule scanner as rule count grows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clauses", dest="clauses", type=int, default=2000)
+        parser.add_argument("--rule-counts", dest="rule_counts", default="4,16,64,256")
+        parser.add_argument("--seed", dest="seed", type=int, default=7)
+
+    def handle(self, *args, **options):
+        clause_count = max(1, int(options["clauses"]))
+        rule_counts = [int(v) for v in str(options["rule_counts"]).split(",") if v.strip()]
+
+        self.stdout.write(f"clauses={clause_count}")
+        self.stdout.write(f"{'rules':>6} {'naive_ms':>10} {'scanner_ms':>11} {'speedup':>8}")
+        for rule_count in rule_counts:
+            triggers = _synthetic_triggers(rule_count)
+            scanner = RuleScanner(triggers)
+            clauses = _synthetic_clauses(clause_count, rule_count, options["seed"])
+
+            start = time.perf_counter()
+            naive_total = _run_naive(clauses, triggers)
+            naive_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            scanner_total = _run_scanner(clauses, scanner)
+            scanner_ms = (time.perf_counter() - start) * 1000
+
+            if naive_total != scanner_total:
+                self.stderr.write(
+                    f"Finding count mismatch at {rule_count} rules: {naive_total} != {scanner_total}"
+                )
+            speedup = naive_ms / scanner_ms if scanner_ms else float("inf")
+            self.stdout.write(
+                f"{len(triggers):>6} {naive_ms:>10.1f} {scanner_ms:>11.1f} {speedup:>7.1f}x"
+            )
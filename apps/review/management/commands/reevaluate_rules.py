@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.review.reevaluation import reevaluate_rules
+
+
+class Command(BaseCommand):
+    help = "Re-run the current rule packs over persisted chunks as rules-only runs (no LLM calls)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--document-id", dest="document_ids", action="append", default=None)
+        parser.add_argument("--page-size", dest="page_size", type=int, default=None)
+        parser.add_argument("--workers", dest="workers", type=int, default=None)
+        parser.add_argument("--jurisdiction", dest="jurisdiction", default="California")
+
+    def handle(self, *args, **options):
+        result = reevaluate_rules(
+            document_ids=options.get("document_ids"),
+            page_size=options.get("page_size"),
+            workers=options.get("workers"),
+            preferred_jurisdiction=options["jurisdiction"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Re-evaluation complete. "
+                f"runs={result.runs}, chunks={result.chunks}, findings={result.findings}, "
+                f"workers={result.workers}, elapsed_s={result.elapsed_s:.2f}, "
+                f"chunks_per_sec={result.chunks_per_sec}"
+            )
+        )
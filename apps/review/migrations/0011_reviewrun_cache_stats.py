@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0010_pgvector_bootstrap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewrun',
+            name='cache_stats',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0011_reviewrun_cache_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewrun',
+            name='rule_pack',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+    ]
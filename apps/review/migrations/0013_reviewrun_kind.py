@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0012_reviewrun_rule_pack'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewrun',
+            name='kind',
+            field=models.CharField(choices=[('review', 'Review'), ('rules_only', 'Rules only')], default='review', max_length=20),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:46
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0013_reviewrun_kind'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewRunCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('stage', models.CharField(choices=[('preprocess', 'Preprocess'), ('extract', 'Extract'), ('rules', 'Rules'), ('llm', 'LLM'), ('persist', 'Persist')], max_length=20)),
+                ('key', models.CharField(blank=True, default='', max_length=128)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='review.reviewrun')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('run', 'stage', 'key'), name='uniq_reviewruncheckpoint_run_stage_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_document_ingestion_metadata_document_source_type'),
+        ('review', '0014_reviewruncheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='finding',
+            index=models.Index(fields=['run', 'created_at', 'id'], name='finding_run_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finding',
+            index=models.Index(fields=['run', 'severity', 'id'], name='finding_run_severity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finding',
+            index=models.Index(fields=['run', 'source', 'id'], name='finding_run_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='finding',
+            index=models.Index(fields=['run', 'confidence', 'id'], name='finding_run_confidence_idx'),
+        ),
+    ]
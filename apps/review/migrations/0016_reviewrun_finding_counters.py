@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:55
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_finding_counters(apps, schema_editor):
+    review_run = apps.get_model("review", "ReviewRun")
+    finding = apps.get_model("review", "Finding")
+    counters = {}
+    grouped = (
+        finding.objects.filter(run__isnull=False)
+        .values("run_id", "severity", "source", "rule_code")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for row in grouped.iterator():
+        severity, source, rule_code = counters.setdefault(row["run_id"], (Counter(), Counter(), Counter()))
+        severity[row["severity"]] += row["n"]
+        source[row["source"]] += row["n"]
+        if row["rule_code"]:
+            rule_code[row["rule_code"]] += row["n"]
+    for run_id, (severity, source, rule_code) in counters.items():
+        review_run.objects.filter(id=run_id).update(
+            findings_count=sum(source.values()),
+            findings_by_severity=dict(sorted(severity.items())),
+            findings_by_source=dict(sorted(source.items())),
+            findings_by_rule_code=dict(sorted(rule_code.items())),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0015_finding_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewrun',
+            name='findings_by_rule_code',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='reviewrun',
+            name='findings_by_severity',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='reviewrun',
+            name='findings_by_source',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='reviewrun',
+            name='findings_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_finding_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:49
+
+from django.db import migrations, models
+
+
+def create_active_runs_lock(apps, schema_editor):
+    apps.get_model("review", "AdmissionLock").objects.get_or_create(name="active-runs")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0016_reviewrun_finding_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionLock',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+            ],
+        ),
+        migrations.RunPython(create_active_runs_lock, migrations.RunPython.noop),
+    ]
@@ -20,6 +20,11 @@ class ReviewRunStage(models.TextChoices):
     PERSIST = "persist", "Persist"
 
 
+class ReviewRunKind(models.TextChoices):
+    REVIEW = "review", "Review"
+    RULES_ONLY = "rules_only", "Rules only"
+
+
 class FindingSeverity(models.TextChoices):
     LOW = "low", "Low"
     MEDIUM = "medium", "Medium"
@@ -38,6 +43,11 @@ class ReviewRun(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name="review_runs")
     idempotency_key = models.CharField(max_length=255, null=True, blank=True)
+    kind = models.CharField(
+        max_length=20,
+        choices=ReviewRunKind.choices,
+        default=ReviewRunKind.REVIEW,
+    )
 
     status = models.CharField(
         max_length=20,
@@ -46,11 +56,18 @@ class ReviewRun(models.Model):
     )
     llm_model = models.CharField(max_length=50, null=True, blank=True)
     prompt_rev = models.CharField(max_length=200, null=True, blank=True)
+    rule_pack = models.CharField(max_length=200, null=True, blank=True)
     error = models.TextField(null=True, blank=True)
     request_fingerprint = models.CharField(max_length=255, null=True, blank=True, db_index=True)
     cache_key = models.CharField(max_length=255, null=True, blank=True)
     cache_hits = models.PositiveIntegerField(default=0)
     cache_misses = models.PositiveIntegerField(default=0)
+    cache_stats = models.JSONField(default=dict, blank=True)
+    # Denormalized at persist time (apps.review.counters) so serializing a run never counts.
+    findings_count = models.PositiveIntegerField(default=0)
+    findings_by_severity = models.JSONField(default=dict, blank=True)
+    findings_by_source = models.JSONField(default=dict, blank=True)
+    findings_by_rule_code = models.JSONField(default=dict, blank=True)
     token_usage = models.JSONField(default=dict, blank=True)
     stage_timings = models.JSONField(default=dict, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
@@ -113,6 +130,40 @@ class Finding(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # One (run, key, id) index per ordering the findings endpoint pages by.
+        indexes = [
+            models.Index(fields=["run", "created_at", "id"], name="finding_run_created_idx"),
+            models.Index(fields=["run", "severity", "id"], name="finding_run_severity_idx"),
+            models.Index(fields=["run", "source", "id"], name="finding_run_source_idx"),
+            models.Index(fields=["run", "confidence", "id"], name="finding_run_confidence_idx"),
+        ]
+
+
+class ReviewRunCheckpoint(models.Model):
+    """Output of a completed pipeline stage (or LLM batch), kept so a retried run can resume."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    run = models.ForeignKey(ReviewRun, on_delete=models.CASCADE, related_name="checkpoints")
+    stage = models.CharField(max_length=20, choices=ReviewRunStage.choices)
+    key = models.CharField(max_length=128, default="", blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["run", "stage", "key"],
+                name="uniq_reviewruncheckpoint_run_stage_key",
+            )
+        ]
+
+
+class AdmissionLock(models.Model):
+    """A named row locked with SELECT ... FOR UPDATE to serialize admission decisions."""
+
+    name = models.CharField(primary_key=True, max_length=64)
+
 
 class ReviewChunk(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -0,0 +1,255 @@
+"""Rules-only re-evaluation of persisted chunks.
+
+Streams ReviewChunk rows from the latest completed review run of each document with keyset
+pagination over (run_id, ordinal), evaluates the current rule packs in a process pool and
+writes the findings to a new rules-only ReviewRun per source run. The LLM is never called.
+"""
+
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.review.counters import add_finding_counts
+from apps.review.models import (
+    Finding,
+    ReviewChunk,
+    ReviewRun,
+    ReviewRunKind,
+    ReviewRunStage,
+    ReviewRunStatus,
+)
+from apps.review.rules import get_rule_registry, load_rule_registry, run_rules
+from apps.review.services import _attach_chunk_pointers_to_findings, _finding_rows
+
+_CHUNK_FIELDS = (
+    "id",
+    "run_id",
+    "document_id",
+    "chunk_id",
+    "schema_version",
+    "ordinal",
+    "heading",
+    "body",
+    "start_offset",
+    "end_offset",
+    "metadata",
+)
+
+# (source run id, clause) pairs in, (source run id, findings) pairs out.
+_PageInput = List[Tuple[str, Dict[str, Any]]]
+_PageOutput = List[Tuple[str, List[Dict[str, Any]]]]
+
+
+@dataclass
+class ReevaluationResult:
+    runs: int = 0
+    chunks: int = 0
+    findings: int = 0
+    elapsed_s: float = 0.0
+    workers: int = 0
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return round(self.chunks / self.elapsed_s, 1) if self.elapsed_s else 0.0
+
+
+def select_source_runs(document_ids: Optional[Sequence[str]] = None) -> List[str]:
+    """Latest succeeded/partial full review run per document."""
+    qs = ReviewRun.objects.filter(
+        kind=ReviewRunKind.REVIEW,
+        status__in=[ReviewRunStatus.SUCCEEDED, ReviewRunStatus.PARTIAL],
+    )
+    if document_ids:
+        qs = qs.filter(document_id__in=list(document_ids))
+
+    latest: Dict[str, str] = {}
+    for run_id, document_id in qs.order_by("document_id", "-created_at").values_list("id", "document_id"):
+        latest.setdefault(str(document_id), str(run_id))
+    return sorted(latest.values())
+
+
+def iter_chunk_pages(run_ids: Sequence[str], page_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Yield chunk rows of the given runs in (run_id, ordinal) order, one keyset page at a time."""
+    remaining = sorted(str(run_id) for run_id in run_ids)
+    after_ordinal = -1
+    while remaining:
+        run_id = remaining[0]
+        # Keyset on the (run, ordinal) index: no OFFSET scans, stable under concurrent inserts.
+        page = list(
+            ReviewChunk.objects.filter(run_id=run_id, ordinal__gt=after_ordinal)
+            .order_by("ordinal")
+            .values(*_CHUNK_FIELDS)[:page_size]
+        )
+        if page:
+            after_ordinal = page[-1]["ordinal"]
+            yield page
+        if len(page) < page_size:
+            remaining.pop(0)
+            after_ordinal = -1
+
+
+def evaluate_page(
+    pack_paths: Tuple[str, ...], page: _PageInput, preferred_jurisdiction: str
+) -> _PageOutput:
+    """Pool entry point: evaluate one page of clauses against the given rule packs."""
+    scanner = load_rule_registry(pack_paths).scanner
+    return [
+        (
+            run_id,
+            run_rules([clause], preferred_jurisdiction=preferred_jurisdiction, scanner=scanner),
+        )
+        for run_id, clause in page
+    ]
+
+
+class _InlineExecutor(Executor):
+    """Runs submissions synchronously (e.g. inside daemonic Celery prefork children)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+def _executor(workers: int) -> Executor:
+    # Daemonic processes (Celery prefork children) are not allowed to have children.
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        return _InlineExecutor()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+class _RulesOnlyRunWriter:
+    def __init__(self, rule_pack: str) -> None:
+        self.rule_pack = rule_pack
+        self.runs: Dict[str, ReviewRun] = {}
+        self.started: Dict[str, float] = {}
+        self.findings = 0
+
+    def run_for(self, source_run_id: str, document_id: Any) -> ReviewRun:
+        run = self.runs.get(source_run_id)
+        if run is None:
+            run = ReviewRun.objects.create(
+                document_id=document_id,
+                kind=ReviewRunKind.RULES_ONLY,
+                status=ReviewRunStatus.RUNNING,
+                current_stage=ReviewRunStage.RULES,
+                rule_pack=self.rule_pack,
+                started_at=timezone.now(),
+            )
+            self.runs[source_run_id] = run
+            self.started[source_run_id] = time.perf_counter()
+        return run
+
+    @transaction.atomic
+    def write_page(self, chunks: List[Dict[str, Any]], results: _PageOutput) -> None:
+        chunk_rows: List[ReviewChunk] = []
+        finding_rows: List[Finding] = []
+        for chunk, (source_run_id, findings) in zip(chunks, results):
+            run = self.run_for(source_run_id, chunk["document_id"])
+            chunk_rows.append(
+                ReviewChunk(
+                    run=run,
+                    document_id=chunk["document_id"],
+                    chunk_id=chunk["chunk_id"],
+                    schema_version=chunk["schema_version"],
+                    ordinal=chunk["ordinal"],
+                    heading=chunk["heading"],
+                    body=chunk["body"],
+                    start_offset=chunk["start_offset"],
+                    end_offset=chunk["end_offset"],
+                    metadata=chunk["metadata"],
+                )
+            )
+            # Same rows and spreadsheet evidence pointers as a full review run writes.
+            _attach_chunk_pointers_to_findings(findings, [chunk])
+            finding_rows.extend(_finding_rows(run, {chunk["chunk_id"]: chunk}, findings))
+        ReviewChunk.objects.bulk_create(chunk_rows)
+        Finding.objects.bulk_create(finding_rows)
+        rows_by_run: Dict[Any, List[Finding]] = {}
+        for row in finding_rows:
+            rows_by_run.setdefault(row.run, []).append(row)
+        for run, rows in rows_by_run.items():
+            add_finding_counts(run, rows)
+        self.findings += len(finding_rows)
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        now = timezone.now()
+        for source_run_id, run in self.runs.items():
+            run.status = status
+            run.error = error
+            run.current_stage = None
+            run.completed_at = now
+            run.stage_timings = {
+                "rules_ms": int((time.perf_counter() - self.started[source_run_id]) * 1000)
+            }
+            run.save(
+                update_fields=[
+                    "status",
+                    "error",
+                    "current_stage",
+                    "completed_at",
+                    "stage_timings",
+                ]
+            )
+
+
+def reevaluate_rules(
+    *,
+    document_ids: Optional[Sequence[str]] = None,
+    page_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    preferred_jurisdiction: str = "California",
+) -> ReevaluationResult:
+    """Re-run the current rule packs over persisted chunks and store rules-only runs."""
+    page_size = max(1, int(page_size or getattr(settings, "REVIEW_REEVALUATE_PAGE_SIZE", 500)))
+    if workers is None:
+        workers = int(getattr(settings, "REVIEW_REEVALUATE_WORKERS", 0)) or multiprocessing.cpu_count()
+    workers = max(1, workers)
+    pack_paths = tuple(settings.REVIEW_RULE_PACKS)
+    writer = _RulesOnlyRunWriter(get_rule_registry().label)
+    result = ReevaluationResult(workers=workers)
+
+    start = time.perf_counter()
+    pending: Deque[Tuple[List[Dict[str, Any]], Future]] = deque()
+    executor = _executor(workers)
+    try:
+        with executor:
+            for chunks in iter_chunk_pages(select_source_runs(document_ids), page_size):
+                page = [
+                    (
+                        str(chunk["run_id"]),
+                        {"id": chunk["chunk_id"], "heading": chunk["heading"], "body": chunk["body"]},
+                    )
+                    for chunk in chunks
+                ]
+                pending.append(
+                    (chunks, executor.submit(evaluate_page, pack_paths, page, preferred_jurisdiction))
+                )
+                # Keep a bounded number of pages in flight and write results in page order.
+                while len(pending) > workers * 2:
+                    done_chunks, future = pending.popleft()
+                    writer.write_page(done_chunks, future.result())
+                    result.chunks += len(done_chunks)
+            while pending:
+                done_chunks, future = pending.popleft()
+                writer.write_page(done_chunks, future.result())
+                result.chunks += len(done_chunks)
+    except Exception as exc:
+        writer.finish(ReviewRunStatus.FAILED, f"Rules re-evaluation failed: {exc}")
+        raise
+
+    writer.finish(ReviewRunStatus.SUCCEEDED)
+    result.runs = len(writer.runs)
+    result.findings = writer.findings
+    result.elapsed_s = time.perf_counter() - start
+    return result
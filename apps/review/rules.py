@@ -1,10 +1,34 @@
+import hashlib
+import json
 import re
+import string
 import uuid
-from typing import List, Dict, Sequence, Optional
-from typing import Literal
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Literal, Optional, Sequence, Set, Tuple
+
+from django.conf import settings
+
+# The stdlib regex parser, used to validate rule triggers. It is private and was renamed from
+# sre_parse in Python 3.11; the trigger validation tests fail if its shape changes again.
+try:
+    from re import _parser as _sre
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse as _sre
 
 Severity = Literal["low", "medium", "high"]
 
+_DAYS_RE = re.compile(r"(\d+)\s+(business\s+)?days?", re.IGNORECASE)
+_YEARS_RE = re.compile(r"(\d+)\s+years?", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _compiled(pattern: str) -> "re.Pattern[str]":
+    # Same semantics as re.search(pattern, text, re.IGNORECASE); parameter values such as
+    # the preferred jurisdiction are used as patterns too, so compile them once.
+    return re.compile(pattern, re.IGNORECASE)
+
 
 def _make_finding(
     *,
@@ -34,9 +58,8 @@ def _find_min_days(text: str) -> Optional[int]:
     Find the smallest 'X days' mentioned in the text.
     Matches things like '30 days', '15 business days', etc.
     """
-    pattern = re.compile(r"(\d+)\s+(business\s+)?days?", re.IGNORECASE)
     days = []
-    for match in pattern.finditer(text):
+    for match in _DAYS_RE.finditer(text):
         try:
             days.append(int(match.group(1)))
         except ValueError:
@@ -49,9 +72,8 @@ def _find_max_years(text: str) -> Optional[int]:
     Find the largest 'X years' mentioned in the text.
     Useful for confidentiality duration.
     """
-    pattern = re.compile(r"(\d+)\s+years?", re.IGNORECASE)
     years = []
-    for match in pattern.finditer(text):
+    for match in _YEARS_RE.finditer(text):
         try:
             years.append(int(match.group(1)))
         except ValueError:
@@ -84,210 +106,451 @@ def _span_for_evidence(text: str, evidence_text: str) -> Dict[str, int]:
 
 
 # --------------------------------------------------------------------
-# Individual rules
+# Compiled scanner
 # --------------------------------------------------------------------
 
-def rule_termination_notice_period(clause: Dict, **kwargs) -> List[Dict]:
-    """
-    Flag if termination notice period appears shorter than 30 days.
-    """
-    heading = clause.get("heading", "")
-    body = clause.get("body", "")
-    text = f"{heading}\n{body}"
+# Characters Python's re treats as case-insensitive equivalents of ASCII letters but that
+# str.lower() does not map to them. Folding them keeps the keyword prefilter exact.
+_RE_CASE_EQUIVALENTS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
 
-    if not re.search(r"terminate|termination", text, re.IGNORECASE):
-        return []
 
-    min_days = _find_min_days(text)
-    if min_days is None:
-        return []
+def _fold(text: str) -> str:
+    return text.translate(_RE_CASE_EQUIVALENTS).lower()
 
-    findings: List[Dict] = []
 
-    if min_days < 30:
-        severity: Severity = "high"
-        summary = "Short termination notice period (< 30 days)."
-    elif min_days < 60:
-        severity = "medium"
-        summary = "Termination notice period between 30 and 60 days."
-    else:
-        # 60+ days: don't flag for now
-        return []
+@dataclass(frozen=True)
+class RuleTrigger:
+    """A rule function plus the trigger it checks first.
 
-    explanation = (
-        f"The termination clause appears to allow termination with only {min_days} days' notice. "
-        f"This may be shorter than a typical minimum of 30 days."
-    )
-    evidence = _short_snippet(text)
-
-    findings.append(
-        _make_finding(
-            clause_id=clause["id"],
-            rule_code="TERM_NOTICE_MIN",
-            severity=severity,
-            summary=summary,
-            explanation=explanation,
-            evidence_text=evidence,
-            evidence_span=_span_for_evidence(text, evidence),
-        )
-    )
-    return findings
+    keywords are lowercase literals, at least one of which appears in every text the
+    trigger matches; they form the prefilter index.
+    """
 
+    func: Callable[..., List[Dict]]
+    pattern: str
+    keywords: FrozenSet[str]
+    code: str = ""
+
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    """Build a regex alternation factored by common prefixes (much faster than a flat one)."""
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Dict]) -> str:
+        ends_here = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends_here:
+            body = "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class RuleScanner:
+    """Scans each clause once and returns only the rules whose trigger matches.
+
+    All rule keywords are merged into a single prefix-trie pattern that is run once over the
+    case-folded clause text; the keyword index maps each hit to its candidate rules. Only
+    candidates are checked against their own precompiled trigger, so the cost no longer
+    grows with rules x clauses. Every trigger match contains one of its rule's keywords
+    (rule packs are rejected otherwise), so results are identical to running every rule.
+    """
 
-def rule_indemnity_clause(clause: Dict, **kwargs) -> List[Dict]:
+    def __init__(self, triggers: Sequence[RuleTrigger]):
+        self.triggers = list(triggers)
+        self._patterns = [re.compile(t.pattern, re.IGNORECASE) for t in self.triggers]
+        self._keyword_index: Dict[str, List[int]] = {}
+        for idx, trigger in enumerate(self.triggers):
+            for keyword in trigger.keywords:
+                self._keyword_index.setdefault(keyword, []).append(idx)
+
+        keywords = sorted(self._keyword_index)
+        # A lookahead reports one keyword per position; a shorter keyword that is a prefix
+        # of the reported one is implied at the same position.
+        self._implied = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        self._keyword_scan = re.compile(f"(?=({_trie_pattern(keywords)}))") if keywords else None
+
+    def candidates(self, text: str) -> List[int]:
+        if self._keyword_scan is None:
+            return []
+        found = set()
+        for match in self._keyword_scan.finditer(_fold(text)):
+            found.add(match.group(1))
+        indexes = set()
+        for keyword in found:
+            for implied in self._implied[keyword]:
+                indexes.update(self._keyword_index[implied])
+        return sorted(indexes)
+
+    def matching(self, text: str) -> List[RuleTrigger]:
+        return [
+            self.triggers[idx]
+            for idx in self.candidates(text)
+            if self._patterns[idx].search(text)
+        ]
+
+
+# --------------------------------------------------------------------
+# Declarative rule packs
+# --------------------------------------------------------------------
+
+class RulePackError(ValueError):
+    """Raised when a rule pack file is missing, malformed or has an invalid rule spec."""
+
+
+_SEVERITIES = {"low", "medium", "high"}
+
+# Numeric extractors a rule spec can name in "measure".
+_MEASURES: Dict[str, Callable[[str], Optional[int]]] = {
+    "min_days": _find_min_days,
+    "max_years": _find_max_years,
+}
+
+# Rule parameters that can be passed to run_rules and referenced by specs.
+_RULE_PARAMS = {"preferred_jurisdiction"}
+
+
+def _band_matches(band: Dict[str, Any], value: int) -> bool:
+    if "lt" in band and not value < band["lt"]:
+        return False
+    if "gt" in band and not value > band["gt"]:
+        return False
+    return True
+
+
+# Bound on the number of strings a run of literal pattern items is expanded into.
+_MAX_EXPANSIONS = 256
+_REPEATS = (_sre.MAX_REPEAT, _sre.MIN_REPEAT, getattr(_sre, "POSSESSIVE_REPEAT", _sre.MAX_REPEAT))
+
+
+def _exact_item(op, arg) -> Optional[Set[str]]:
+    """Every (case-folded) string one parsed pattern item can match, if few and known."""
+    if op is _sre.LITERAL:
+        return {_fold(chr(arg))}
+    if op in (_sre.AT, _sre.ASSERT, _sre.ASSERT_NOT):
+        return {""}
+    if op is _sre.IN:
+        if any(in_op is not _sre.LITERAL for in_op, _ in arg):
+            return None
+        return {_fold(chr(in_arg)) for _, in_arg in arg}
+    if op is _sre.SUBPATTERN:
+        return _exact_strings(arg[-1])
+    if op is _sre.BRANCH:
+        options: Set[str] = set()
+        for branch in arg[1]:
+            strings = _exact_strings(branch)
+            if strings is None:
+                return None
+            options |= strings
+        return options
+    if op in _REPEATS:
+        low, high, child = arg
+        strings = _exact_strings(child)
+        if strings is None or high > 3:
+            return None
+        options = set()
+        for count in range(low, high + 1):
+            repeated = {""}
+            for _ in range(count):
+                repeated = {a + b for a in repeated for b in strings}
+            options |= repeated
+        return options if len(options) <= _MAX_EXPANSIONS else None
+    return None
+
+
+def _exact_strings(items) -> Optional[Set[str]]:
+    strings = {""}
+    for op, arg in items:
+        options = _exact_item(op, arg)
+        if options is None:
+            return None
+        strings = {a + b for a in strings for b in options}
+        if len(strings) > _MAX_EXPANSIONS:
+            return None
+    return strings
+
+
+def _implies_keyword(items, keywords: FrozenSet[str]) -> bool:
     """
-    Identify indemnity clauses. For MVP, simply flag presence as 'high' risk.
+    Whether every match of a parsed pattern contains one of the keywords. Conservative: a
+    run of consecutive literal items is expanded into the strings it can match, and groups
+    that always take part in the match are checked recursively; anything else (classes,
+    unbounded repeats) neither proves nor disproves it.
     """
-    heading = clause.get("heading", "")
-    body = clause.get("body", "")
-    text = f"{heading}\n{body}"
 
-    if not re.search(r"indemnify|indemnification", text, re.IGNORECASE):
-        return []
+    def covered(strings: Set[str]) -> bool:
+        return all(any(keyword in string for keyword in keywords) for string in strings)
+
+    if len(items) == 1 and items[0][0] is _sre.BRANCH:
+        return all(_implies_keyword(branch, keywords) for branch in items[0][1][1])
+    run: Set[str] = {""}
+    for op, arg in items:
+        options = _exact_item(op, arg)
+        if options is not None:
+            run = {a + b for a in run for b in options}
+            if len(run) > _MAX_EXPANSIONS:
+                run = set(options)
+            if covered(run):
+                return True
+            continue
+        run = {""}
+        if op is _sre.SUBPATTERN and _implies_keyword(arg[-1], keywords):
+            return True
+        if op is _sre.BRANCH and all(_implies_keyword(branch, keywords) for branch in arg[1]):
+            return True
+        if op in _REPEATS and arg[0] >= 1 and _implies_keyword(arg[2], keywords):
+            return True
+    return False
+
+
+def _validate_template(code: str, key: str, template: str) -> None:
+    """Templates are rendered with str.format on every match, so check their fields up front."""
+    allowed = {"value"} | _RULE_PARAMS
+    formatter = string.Formatter()
+    fields: List[str] = []
+    try:
+        for _, field, format_spec, _ in formatter.parse(template):
+            if field is not None:
+                fields.append(field)
+                # A format spec can nest fields of its own, e.g. {value:{width}}.
+                nested = formatter.parse(format_spec or "")
+                fields.extend(name for _, name, _, _ in nested if name is not None)
+    except ValueError as exc:
+        raise RulePackError(f"Rule {code}: invalid '{key}' template: {exc}") from exc
+    unknown = sorted(set(fields) - allowed)
+    if unknown:
+        raise RulePackError(
+            f"Rule {code}: '{key}' uses unknown placeholders {unknown}; use {sorted(allowed)}."
+        )
+
 
-    summary = "Indemnity clause present."
-    explanation = (
-        "This clause includes indemnity language (e.g., 'indemnify' or 'indemnification'). "
-        "Indemnity provisions can shift significant liability and should be reviewed carefully."
-    )
-    evidence = _short_snippet(text)
-
-    return [
-        _make_finding(
-            clause_id=clause["id"],
-            rule_code="INDEMNITY_PRESENT",
-            severity="high",
-            summary=summary,
-            explanation=explanation,
-            evidence_text=evidence,
-            evidence_span=_span_for_evidence(text, evidence),
+def _validate_rule_spec(spec: Dict[str, Any]) -> None:
+    code = spec.get("code")
+    if not isinstance(code, str) or not code:
+        raise RulePackError("Rule spec is missing 'code'.")
+    for key in ("trigger", "explanation"):
+        if not isinstance(spec.get(key), str) or not spec[key]:
+            raise RulePackError(f"Rule {code}: '{key}' must be a non-empty string.")
+    keywords = spec.get("keywords")
+    if not isinstance(keywords, list) or not keywords:
+        raise RulePackError(f"Rule {code}: 'keywords' must be a non-empty list.")
+    for keyword in keywords:
+        if not isinstance(keyword, str) or not keyword or keyword != _fold(keyword):
+            raise RulePackError(f"Rule {code}: keywords must be non-empty lowercase strings.")
+
+    measure = spec.get("measure")
+    if measure is not None and measure not in _MEASURES:
+        raise RulePackError(f"Rule {code}: unknown measure '{measure}'.")
+    unless_param = spec.get("unless_param")
+    if unless_param is not None and unless_param not in _RULE_PARAMS:
+        raise RulePackError(f"Rule {code}: unknown parameter '{unless_param}'.")
+
+    bands = spec.get("bands")
+    if measure is not None:
+        if not isinstance(bands, list) or not bands:
+            raise RulePackError(f"Rule {code}: a measured rule needs 'bands'.")
+    else:
+        bands = [spec]
+    for band in bands:
+        if band.get("severity") not in _SEVERITIES:
+            raise RulePackError(f"Rule {code}: severity must be one of {sorted(_SEVERITIES)}.")
+        if not isinstance(band.get("summary"), str) or not band["summary"]:
+            raise RulePackError(f"Rule {code}: 'summary' must be a non-empty string.")
+        _validate_template(code, "summary", band["summary"])
+    _validate_template(code, "explanation", spec["explanation"])
+
+    for key in ("trigger", "requires", "unless"):
+        if spec.get(key) is None:
+            continue
+        try:
+            re.compile(spec[key], re.IGNORECASE)
+        except re.error as exc:
+            raise RulePackError(f"Rule {code}: invalid '{key}' pattern: {exc}") from exc
+
+    # The scanner only checks a trigger when one of its keywords occurs in the clause.
+    trigger = _sre.parse(spec["trigger"], re.IGNORECASE)
+    if not _implies_keyword(list(trigger), frozenset(keywords)):
+        raise RulePackError(
+            f"Rule {code}: every match of 'trigger' must contain one of its 'keywords'."
         )
-    ]
 
 
-def rule_confidentiality_duration(clause: Dict, **kwargs) -> List[Dict]:
+def compile_rule_spec(spec: Dict[str, Any]) -> RuleTrigger:
     """
-    Flag confidentiality clauses with long or perpetual duration.
+    Compile one declarative rule spec into a RuleTrigger.
+
+    A spec names a trigger pattern and its prefilter keywords, optional "requires"/"unless"
+    patterns, an optional "unless_param" (skip when that run parameter matches the text) and
+    either a fixed severity/summary or a "measure" with ordered "bands" ({"lt": n} or
+    {"gt": n}); the first matching band wins. Summaries and explanations are str.format
+    templates over {value} and the run parameters.
     """
-    heading = clause.get("heading", "")
-    body = clause.get("body", "")
-    text = f"{heading}\n{body}"
-
-    if not re.search(
-        r"confidentiality|confidential information|non[- ]disclosure|nondisclosure",
-        text,
-        re.IGNORECASE,
-    ):
-        return []
-
-    # Perpetual / indefinite language
-    if re.search(r"perpetual|in\s+perpetuity|indefinite", text, re.IGNORECASE):
-        summary = "Confidentiality obligations appear perpetual."
-        explanation = (
-            "The confidentiality clause appears to impose obligations in perpetuity or indefinitely. "
-            "This may be more restrictive than typical time-limited confidentiality provisions."
-        )
+    _validate_rule_spec(spec)
+
+    code = spec["code"]
+    trigger_re = _compiled(spec["trigger"])
+    requires_re = _compiled(spec["requires"]) if spec.get("requires") else None
+    unless_re = _compiled(spec["unless"]) if spec.get("unless") else None
+    unless_param = spec.get("unless_param")
+    measure = _MEASURES.get(spec.get("measure"))
+    bands = spec.get("bands") if measure else [spec]
+    explanation_template = spec["explanation"]
+
+    def rule(clause: Dict, **params) -> List[Dict]:
+        heading = clause.get("heading", "")
+        body = clause.get("body", "")
+        text = f"{heading}\n{body}"
+
+        if not trigger_re.search(text):
+            return []
+        if requires_re is not None and not requires_re.search(text):
+            return []
+        if unless_re is not None and unless_re.search(text):
+            return []
+        if unless_param is not None and _compiled(params[unless_param]).search(text):
+            return []
+
+        value = None
+        if measure is not None:
+            value = measure(text)
+            if value is None:
+                return []
+        band = next((b for b in bands if value is None or _band_matches(b, value)), None)
+        if band is None:
+            return []
+
+        context = {**params, "value": value}
         evidence = _short_snippet(text)
         return [
             _make_finding(
                 clause_id=clause["id"],
-                rule_code="CONF_PERPETUAL",
-                severity="high",
-                summary=summary,
-                explanation=explanation,
+                rule_code=code,
+                severity=band["severity"],
+                summary=band["summary"].format(**context),
+                explanation=explanation_template.format(**context),
                 evidence_text=evidence,
                 evidence_span=_span_for_evidence(text, evidence),
             )
         ]
 
-    # Explicit number of years
-    max_years = _find_max_years(text)
-    if max_years is None:
-        return []
-
-    findings: List[Dict] = []
-    if max_years > 5:
-        severity: Severity = "medium"
-        summary = "Confidentiality obligations longer than 5 years."
-        explanation = (
-            f"The confidentiality clause appears to apply for {max_years} years, "
-            "which may be longer than common 2-5 year periods."
-        )
-        evidence = _short_snippet(text)
-        findings.append(
-            _make_finding(
-                clause_id=clause["id"],
-                rule_code="CONF_LONG_TERM",
-                severity=severity,
-                summary=summary,
-                explanation=explanation,
-                evidence_text=evidence,
-                evidence_span=_span_for_evidence(text, evidence),
-            )
-        )
+    rule.__name__ = f"rule_{code.lower()}"
+    return RuleTrigger(rule, spec["trigger"], frozenset(spec["keywords"]), code)
+
+
+@dataclass(frozen=True)
+class RulePack:
+    name: str
+    version: str
+    content_hash: str
+    triggers: Tuple[RuleTrigger, ...]
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}@{self.version}"
+
+
+def _canonical_hash(payload: Any) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def parse_rule_pack(payload: Dict[str, Any]) -> RulePack:
+    if not isinstance(payload, dict):
+        raise RulePackError("Rule pack must be a JSON object.")
+    name = payload.get("name")
+    version = payload.get("version")
+    rules = payload.get("rules")
+    if not isinstance(name, str) or not name or not isinstance(version, str) or not version:
+        raise RulePackError("Rule pack needs a non-empty 'name' and 'version'.")
+    if not isinstance(rules, list):
+        raise RulePackError(f"Rule pack {name}: 'rules' must be a list.")
+    return RulePack(
+        name=name,
+        version=version,
+        content_hash=_canonical_hash(payload),
+        triggers=tuple(compile_rule_spec(spec) for spec in rules),
+    )
 
-    return findings
 
+def load_rule_pack(path: str) -> RulePack:
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise RulePackError(f"Could not load rule pack {path}: {exc}") from exc
+    return parse_rule_pack(payload)
 
-def rule_governing_law_mismatch(clause: Dict, *, preferred_jurisdiction: str = "California", **kwargs) -> List[Dict]:
-    """
-    Flag governing law clauses that don't match the preferred jurisdiction.
+
+class RuleRegistry:
+    """The rule packs a worker evaluates, compiled into one scanner.
+
+    content_hash covers the parsed content of every pack in order, so it changes exactly
+    when a rule spec changes and can be folded into cache keys.
     """
-    heading = clause.get("heading", "")
-    body = clause.get("body", "")
-    text = f"{heading}\n{body}"
 
-    if not re.search(r"governing law|laws of", text, re.IGNORECASE):
-        return []
+    def __init__(self, packs: Sequence[RulePack]):
+        self.packs = list(packs)
+        triggers = [trigger for pack in self.packs for trigger in pack.triggers]
+        codes = [trigger.code for trigger in triggers]
+        duplicates = sorted({code for code in codes if codes.count(code) > 1})
+        if duplicates:
+            raise RulePackError(f"Duplicate rule codes across packs: {', '.join(duplicates)}")
+        self.scanner = RuleScanner(triggers)
+        self.content_hash = _canonical_hash([pack.content_hash for pack in self.packs])
 
-    if re.search(preferred_jurisdiction, text, re.IGNORECASE):
-        return []
+    @property
+    def triggers(self) -> List[RuleTrigger]:
+        return self.scanner.triggers
 
-    summary = f"Governing law differs from preferred jurisdiction ({preferred_jurisdiction})."
-    explanation = (
-        f"The clause appears to specify a governing law other than {preferred_jurisdiction}. "
-        "This may affect dispute resolution and should be reviewed."
-    )
-    evidence = _short_snippet(text)
-
-    return [
-        _make_finding(
-            clause_id=clause["id"],
-            rule_code="GOV_LAW_MISMATCH",
-            severity="medium",
-            summary=summary,
-            explanation=explanation,
-            evidence_text=evidence,
-            evidence_span=_span_for_evidence(text, evidence),
-        )
-    ]
+    @property
+    def label(self) -> str:
+        """Short identifier recorded on runs, e.g. 'default@1:3f2a9c1b0d4e'."""
+        packs = "+".join(pack.label for pack in self.packs) or "none"
+        return f"{packs}:{self.content_hash[:12]}"
+
+
+@lru_cache(maxsize=8)
+def load_rule_registry(paths: Tuple[str, ...]) -> RuleRegistry:
+    """Load and compile the given packs; does not read Django settings, so pool workers can call it."""
+    return RuleRegistry([load_rule_pack(path) for path in paths])
+
+
+def get_rule_registry() -> RuleRegistry:
+    """Return the compiled registry for settings.REVIEW_RULE_PACKS (loaded once per process)."""
+    return load_rule_registry(tuple(settings.REVIEW_RULE_PACKS))
 
 
 # --------------------------------------------------------------------
 # Orchestrator
 # --------------------------------------------------------------------
 
-RULE_FUNCTIONS = [
-    rule_termination_notice_period,
-    rule_indemnity_clause,
-    rule_confidentiality_duration,
-    rule_governing_law_mismatch,
-]
-
-
 def run_rules(
     clauses: Sequence[Dict],
     *,
     preferred_jurisdiction: str = "California",
+    scanner: Optional[RuleScanner] = None,
 ) -> List[Dict]:
     """
     Run all deterministic rules on a list of clauses.
+    Each clause is scanned once and only rules whose trigger matches are dispatched.
     Returns a flat list of findings.
     """
+    scanner = scanner or get_rule_registry().scanner
     all_findings: List[Dict] = []
     for clause in clauses:
-        for rule_func in RULE_FUNCTIONS:
-            findings = rule_func(
+        text = f"{clause.get('heading', '')}\n{clause.get('body', '')}"
+        for trigger in scanner.matching(text):
+            findings = trigger.func(
                 clause,
                 preferred_jurisdiction=preferred_jurisdiction,
             )
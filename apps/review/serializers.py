@@ -13,11 +13,7 @@ class ReviewRunRequestSerializer(serializers.Serializer):
 class ReviewRunSerializer(serializers.ModelSerializer):
     """Serializer for ReviewRun metadata."""
 
-    document_id = serializers.UUIDField(source="document.id", read_only=True)
-    findings_count = serializers.SerializerMethodField()
-
-    def get_findings_count(self, obj):
-        return obj.findings.count()
+    document_id = serializers.UUIDField(read_only=True)
 
     class Meta:
         model = ReviewRun
@@ -25,13 +21,16 @@ class ReviewRunSerializer(serializers.ModelSerializer):
             "id",
             "document_id",
             "idempotency_key",
+            "kind",
             "status",
             "current_stage",
             "cache_key",
             "cache_hits",
             "cache_misses",
+            "cache_stats",
             "llm_model",
             "prompt_rev",
+            "rule_pack",
             "error",
             "token_usage",
             "stage_timings",
@@ -39,11 +38,22 @@ class ReviewRunSerializer(serializers.ModelSerializer):
             "completed_at",
             "created_at",
             "findings_count",
+            "findings_by_severity",
+            "findings_by_source",
+            "findings_by_rule_code",
         ]
 
 
 class FindingSerializer(serializers.ModelSerializer):
-    run_id = serializers.UUIDField(source="run.id", read_only=True, allow_null=True)
+    """Finding payload. Pass fields=[...] to serialize a sparse fieldset."""
+
+    run_id = serializers.UUIDField(read_only=True, allow_null=True)
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     class Meta:
         model = Finding
@@ -67,3 +77,13 @@ class FindingSerializer(serializers.ModelSerializer):
             "prompt_rev",
             "created_at",
         ]
+
+
+# Large columns left out of findings reads unless asked for via ?fields=.
+FINDING_HEAVY_FIELDS = frozenset({"clause_body"})
+FINDING_DEFAULT_FIELDS = [name for name in FindingSerializer.Meta.fields if name not in FINDING_HEAVY_FIELDS]
+
+
+def finding_columns(fields) -> list:
+    """Model columns to load (QuerySet.only) for a fieldset; never includes the embedding."""
+    return ["id", *("run" if name == "run_id" else name for name in fields if name != "id")]
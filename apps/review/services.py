@@ -1,24 +1,38 @@
+import contextvars
 import hashlib
 import json
+import queue
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from django.conf import settings
-from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 
 from apps.documents.models import Document
+from apps.documents.services import INGESTION_KEY, document_ingestion_metadata
+from apps.review.cache import CacheStats, FlightInProgress, pipeline_cache
+from apps.review.checkpoints import RunCheckpoints, checkpoints_enabled
+from apps.review.counters import add_finding_counts, refresh_finding_counts, reset_finding_counts
 from apps.review.embeddings import (
     build_finding_embedding_input,
     generate_embeddings,
     sync_pgvector_embeddings,
 )
+from apps.review.events import STATUS_EVENT, publish_run_event
 from apps.review.llm.prompts import PROMPT_REV
 from apps.review.llm.provider import (
+    BatchCheckpoints,
+    estimate_clause_tokens,
     generate_llm_findings_for_clauses,
     generate_llm_findings_with_usage_for_clauses,
+    llm_streaming_enabled,
+    sum_token_usage,
 )
 from apps.review.models import (
     Finding,
@@ -29,8 +43,13 @@ from apps.review.models import (
     ReviewRunStage,
     ReviewRunStatus,
 )
-from apps.review.preprocessing import CHUNK_SCHEMA_VERSION, preprocess_document_to_chunks
-from apps.review.rules import run_rules
+from apps.review.preprocessing import (
+    CHUNK_SCHEMA_VERSION,
+    iter_document_chunks,
+    preprocess_document_to_chunks,
+)
+from apps.review.rules import get_rule_registry, run_rules
+from apps.review.triage import score_clause, triage_clauses, triage_enabled, triage_threshold
 
 IDEMPOTENCY_WINDOW = timedelta(hours=24)
 
@@ -44,7 +63,7 @@ def run_full_analysis_for_instance(doc: Document) -> Dict[str, Any]:
     chunks = preprocess_document_to_chunks(
         doc.text,
         source_type=getattr(doc, "source_type", "text"),
-        ingestion_metadata=getattr(doc, "ingestion_metadata", {}),
+        ingestion_metadata=document_ingestion_metadata(doc),
     )
     clauses = [
         {"id": chunk["chunk_id"], "heading": chunk.get("heading"), "body": chunk.get("body")}
@@ -96,14 +115,26 @@ def _attach_chunk_pointers_to_findings(findings: List[Dict[str, Any]], chunks: L
 
 
 def _document_hash(doc: Document) -> str:
-    source_type = getattr(doc, "source_type", "text") or "text"
     metadata = getattr(doc, "ingestion_metadata", {}) or {}
+    # Uploads carry a hash of their bytes computed once at upload time. It only identifies the
+    # extracted text when extraction was complete: timed-out PDF pages come out empty, and may
+    # not time out the next time the same bytes are ingested.
+    if getattr(doc, "content_hash", "") and not metadata.get("timed_out_pages"):
+        return doc.content_hash
+    source_type = getattr(doc, "source_type", "text") or "text"
+    # Ingestion progress and timings differ per upload and do not affect the review.
+    metadata = {key: value for key, value in metadata.items() if key != INGESTION_KEY}
+    content = {
+        "source_type": source_type,
+        "text": doc.text or "",
+        "ingestion_metadata": metadata,
+    }
+    blob = getattr(doc, "ingestion_blob", None)
+    if blob:
+        # Spreadsheet rows kept in the compressed side blob are hashed as bytes.
+        content["ingestion_blob"] = hashlib.sha256(bytes(blob)).hexdigest()
     payload = json.dumps(
-        {
-            "source_type": source_type,
-            "text": doc.text or "",
-            "ingestion_metadata": metadata,
-        },
+        content,
         sort_keys=True,
         separators=(",", ":"),
     )
@@ -111,49 +142,29 @@ def _document_hash(doc: Document) -> str:
 
 
 def build_pipeline_cache_key(doc: Document) -> str:
-    return f"review:{_document_hash(doc)}:{PROMPT_REV}:{CHUNK_SCHEMA_VERSION}"
-
-
-@transaction.atomic
-def persist_findings_for_run(
-    run: ReviewRun, clauses: List[Dict[str, Any]], findings: List[Dict[str, Any]]
-) -> ReviewRun:
-    """Persist findings for an existing run.
-
-    Existing findings for the run are deleted before insert so retries remain idempotent.
-    """
-
-    doc = run.document
-
-    by_chunk_id = {c.get("id"): c for c in (clauses or [])}
+    rules_hash = get_rule_registry().content_hash[:16]
+    key = f"review:{_document_hash(doc)}:{PROMPT_REV}:{CHUNK_SCHEMA_VERSION}:{rules_hash}"
+    if triage_enabled():
+        # Triage changes which clauses get LLM findings, so it is part of the payload identity.
+        key = f"{key}:triage{triage_threshold():g}"
+    return key
 
-    # Best-effort extraction of run-level metadata from LLM findings.
-    llm_model = None
-    prompt_rev = None
-    for f in findings or []:
-        if f.get("source") == "llm":
-            llm_model = f.get("model") or llm_model
-            prompt_rev = f.get("prompt_rev") or prompt_rev
-            break
-
-    run.llm_model = llm_model
-    run.prompt_rev = prompt_rev
-    run.save(update_fields=["llm_model", "prompt_rev"])
-
-    Finding.objects.filter(run=run).delete()
 
+def _finding_rows(
+    run: ReviewRun, clause_by_id: Dict[str, Dict[str, Any]], findings: List[Dict[str, Any]]
+) -> List[Finding]:
     rows: List[Finding] = []
     for f in findings or []:
         clause_id = f.get("clause_id")
         chunk_id = f.get("chunk_id") or clause_id
-        clause = by_chunk_id.get(chunk_id) or by_chunk_id.get(clause_id) or {}
+        clause = clause_by_id.get(chunk_id) or clause_by_id.get(clause_id) or {}
 
         # Normalize across rule + llm finding shapes
         evidence = f.get("evidence") or f.get("evidence_text") or ""
 
         rows.append(
             Finding(
-                document=doc,
+                document_id=run.document_id,
                 run=run,
                 clause_id=clause_id,
                 chunk_id=chunk_id,
@@ -172,22 +183,51 @@ def persist_findings_for_run(
                 prompt_rev=f.get("prompt_rev"),
             )
         )
+    return rows
+
 
+def _insert_findings(run: ReviewRun, rows: List[Finding], embed: bool = True) -> None:
     if rows:
         Finding.objects.bulk_create(rows)
-        _store_findings_embeddings(run)
+        add_finding_counts(run, rows)
+        publish_run_event(run.id, "findings", {"findings_count": run.findings_count})
+        if embed:
+            _store_findings_embeddings(rows)
 
-    return run
 
+@transaction.atomic
+def persist_findings_for_run(
+    run: ReviewRun, clauses: List[Dict[str, Any]], findings: List[Dict[str, Any]]
+) -> ReviewRun:
+    """Persist findings for an existing run.
+
+    Existing findings for the run are deleted before insert so retries remain idempotent.
+    """
 
-def _store_findings_embeddings(run: ReviewRun) -> None:
-    if not settings.REVIEW_ENABLE_EMBEDDINGS:
-        return
+    by_chunk_id = {c.get("id"): c for c in (clauses or [])}
 
-    finding_rows = list(
-        Finding.objects.filter(run=run).only("id", "summary", "explanation", "evidence", "embedding")
-    )
-    if not finding_rows:
+    # Best-effort extraction of run-level metadata from LLM findings.
+    llm_model = None
+    prompt_rev = None
+    for f in findings or []:
+        if f.get("source") == "llm":
+            llm_model = f.get("model") or llm_model
+            prompt_rev = f.get("prompt_rev") or prompt_rev
+            break
+
+    run.llm_model = llm_model
+    run.prompt_rev = prompt_rev
+    run.save(update_fields=["llm_model", "prompt_rev"])
+
+    Finding.objects.filter(run=run).delete()
+    reset_finding_counts(run)
+    _insert_findings(run, _finding_rows(run, by_chunk_id, findings))
+
+    return run
+
+
+def _store_findings_embeddings(finding_rows: List[Finding]) -> None:
+    if not settings.REVIEW_ENABLE_EMBEDDINGS or not finding_rows:
         return
 
     embedding_inputs = [
@@ -206,26 +246,26 @@ def _store_findings_embeddings(run: ReviewRun) -> None:
     sync_pgvector_embeddings(finding_rows)
 
 
+def _chunk_row(run: ReviewRun, chunk: Dict[str, Any]) -> ReviewChunk:
+    return ReviewChunk(
+        run=run,
+        document_id=run.document_id,
+        chunk_id=chunk["chunk_id"],
+        schema_version=chunk.get("schema_version", "v1"),
+        ordinal=chunk.get("ordinal") or 0,
+        heading=chunk.get("heading"),
+        body=chunk.get("body") or "",
+        start_offset=chunk.get("start_offset"),
+        end_offset=chunk.get("end_offset"),
+        metadata=chunk.get("metadata") or {},
+    )
+
+
 @transaction.atomic
 def persist_chunks_for_run(run: ReviewRun, chunks: List[Dict[str, Any]]) -> None:
     ReviewChunk.objects.filter(run=run).delete()
 
-    rows: List[ReviewChunk] = []
-    for chunk in chunks or []:
-        rows.append(
-            ReviewChunk(
-                run=run,
-                document=run.document,
-                chunk_id=chunk["chunk_id"],
-                schema_version=chunk.get("schema_version", "v1"),
-                ordinal=chunk.get("ordinal") or 0,
-                heading=chunk.get("heading"),
-                body=chunk.get("body") or "",
-                start_offset=chunk.get("start_offset"),
-                end_offset=chunk.get("end_offset"),
-                metadata=chunk.get("metadata") or {},
-            )
-        )
+    rows = [_chunk_row(run, chunk) for chunk in chunks or []]
     if rows:
         ReviewChunk.objects.bulk_create(rows)
 
@@ -264,13 +304,188 @@ def find_idempotent_run(
     return existing, False, True
 
 
-def process_review_run(run_id: str) -> ReviewRun:
+@dataclass
+class _LLMStageResult:
+    findings: List[Dict[str, Any]] = field(default_factory=list)
+    model: Optional[str] = None
+    usage: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    elapsed_ms: int = 0
+
+
+def _run_llm_stage(
+    clauses: List[Dict[str, Any]],
+    on_finding: Optional[Callable[[Dict[str, Any]], None]] = None,
+    checkpoints: Optional[BatchCheckpoints] = None,
+    on_batch_done: Optional[Callable[[int, int], None]] = None,
+) -> _LLMStageResult:
+    """Run the LLM stage, converting failures into a partial-run error message."""
+    result = _LLMStageResult()
+    start = time.perf_counter()
+    options: Dict[str, Any] = {}
+    if on_finding is not None:
+        options["on_finding"] = on_finding
+    if checkpoints is not None:
+        options["checkpoints"] = checkpoints
+    if on_batch_done is not None:
+        options["on_batch_done"] = on_batch_done
+    try:
+        output = generate_llm_findings_with_usage_for_clauses(clauses, **options)
+        result.findings, result.model, result.usage = output
+    except TimeoutError as exc:
+        result.error = f"LLM stage timeout: {exc}"
+    except Exception as exc:
+        result.error = f"LLM stage failed: {exc}"
+    result.elapsed_ms = int((time.perf_counter() - start) * 1000)
+    return result
+
+
+class _IncrementalFindingWriter:
+    """Persists findings while the LLM stage is still running (REVIEW_LLM_STREAM_FINDINGS).
+
+    LLM threads only put findings on the queue; the orchestrating thread drains it and does
+    all database writes, so GET /v1/documents/{id}/findings shows results while the run is
+    still running. Chunks are written up front so evidence pointers resolve immediately.
+    Embeddings are generated for the inserted rows in large batches, not on every drain.
+    """
+
+    DRAIN_WAIT_SECONDS = 0.05
+    EMBED_BATCH_ROWS = 500
+
+    def __init__(
+        self,
+        run: ReviewRun,
+        chunks: List[Dict[str, Any]],
+        clauses: List[Dict[str, Any]],
+        stage_timings: Dict[str, int],
+        started: float,
+    ) -> None:
+        self.run = run
+        self.chunks = chunks
+        self.clause_by_id = {c.get("id"): c for c in clauses}
+        self.stage_timings = stage_timings
+        self.started = started
+        self.queue: queue.SimpleQueue[Dict[str, Any]] = queue.SimpleQueue()
+        self.persisted_ids: set = set()
+        self.unembedded: List[Finding] = []
+
+    def begin(self) -> None:
+        persist_chunks_for_run(self.run, self.chunks)
+        Finding.objects.filter(run=self.run).delete()
+        reset_finding_counts(self.run)
+
+    def add(self, findings: List[Dict[str, Any]]) -> None:
+        fresh = [f for f in findings if f.get("id") not in self.persisted_ids]
+        if not fresh:
+            return
+        _attach_chunk_pointers_to_findings(fresh, self.chunks)
+        rows = _finding_rows(self.run, self.clause_by_id, fresh)
+        _insert_findings(self.run, rows, embed=False)
+        self.unembedded.extend(rows)
+        if len(self.unembedded) >= self.EMBED_BATCH_ROWS:
+            self._embed()
+        self.persisted_ids.update(f.get("id") for f in fresh)
+        self.stage_timings.setdefault(
+            "first_finding_ms", int((time.perf_counter() - self.started) * 1000)
+        )
+
+    def drain_until_done(self, future: Future) -> None:
+        while True:
+            done = future.done()
+            batch: List[Dict[str, Any]] = []
+            try:
+                batch.append(self.queue.get(timeout=0 if done else self.DRAIN_WAIT_SECONDS))
+                while True:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            self.add(batch)
+            if done and not batch:
+                return
+
+    def finish(self, findings: List[Dict[str, Any]], llm_error: Optional[str]) -> None:
+        if llm_error:
+            # Same policy as the non-streaming path: a partial run keeps rule findings only.
+            Finding.objects.filter(run=self.run, source=FindingSource.LLM).delete()
+            refresh_finding_counts(self.run)
+            self.unembedded = [row for row in self.unembedded if row.source != FindingSource.LLM]
+        else:
+            self.add(findings)
+        self._embed()
+
+        llm_finding = None
+        if not llm_error:
+            llm_finding = next((f for f in findings if f.get("source") == "llm"), None)
+        self.run.llm_model = llm_finding.get("model") if llm_finding else None
+        self.run.prompt_rev = llm_finding.get("prompt_rev") if llm_finding else None
+        self.run.save(update_fields=["llm_model", "prompt_rev"])
+
+    def _embed(self) -> None:
+        rows, self.unembedded = self.unembedded, []
+        _store_findings_embeddings(rows)
+
+
+def _set_stage(run: ReviewRun, stage: Optional[str]) -> None:
+    run.current_stage = stage
+    run.save(update_fields=["current_stage"])
+    if stage is not None:
+        publish_run_event(run.id, "stage", {"stage": stage})
+
+
+def _publish_batch_progress(run_id, done: int, total: int) -> None:
+    # Called from LLM batch threads; publishing never touches the database.
+    publish_run_event(run_id, "llm_batch", {"done": done, "total": total})
+
+
+def _publish_final_status(run: ReviewRun) -> None:
+    publish_run_event(
+        run.id,
+        STATUS_EVENT,
+        {
+            "status": run.status,
+            "error": run.error,
+            "completed_at": run.completed_at.isoformat() if run.completed_at else None,
+            "findings_count": run.findings_count,
+        },
+    )
+
+
+def _clause_from_chunk(chunk: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": chunk["chunk_id"], "heading": chunk.get("heading"), "body": chunk.get("body")}
+
+
+def _use_streaming_pipeline(doc: Document) -> bool:
+    threshold = int(getattr(settings, "REVIEW_STREAMING_MIN_CHARS", 0))
+    return threshold > 0 and len(doc.text or "") >= threshold
+
+
+def _record_clause_cache_usage(run: ReviewRun, usage: Dict[str, Any]) -> None:
+    run.cache_hits += int(usage.get("clause_cache_hits") or 0)
+    run.cache_misses += int(usage.get("clause_cache_misses") or 0)
+    run.save(update_fields=["cache_hits", "cache_misses"])
+
+
+def process_review_run(
+    run_id: str, *, single_flight: bool = True, single_flight_since: Optional[float] = None
+) -> ReviewRun:
+    """
+    Run the review pipeline for a run. With single_flight, raises FlightInProgress (with the
+    run back in ``queued``) when another run is computing the same pipeline cache key; the
+    caller should try again later, passing the time of the first deferral as
+    single_flight_since so the wait is recorded in stage_timings.
+    """
+    with pipeline_cache.collect_stats() as cache_stats:
+        run = _process_review_run(run_id, cache_stats, single_flight, single_flight_since)
+    return run
+
+
+def _process_review_run(
+    run_id: str, cache_stats: CacheStats, single_flight: bool, single_flight_since: Optional[float]
+) -> ReviewRun:
     run = ReviewRun.objects.select_related("document").get(id=run_id)
     doc = run.document
     stage_timings: Dict[str, int] = {}
     token_usage: Dict[str, Any] = {}
-    llm_failed = False
-    llm_error: Optional[str] = None
 
     now = timezone.now()
     update_fields = {
@@ -280,113 +495,45 @@ def process_review_run(run_id: str) -> ReviewRun:
         "current_stage": ReviewRunStage.PREPROCESS,
         "stage_timings": {},
         "token_usage": {},
+        "cache_stats": {},
     }
     if run.started_at is None:
         update_fields["started_at"] = now
     cache_key = build_pipeline_cache_key(doc)
     update_fields["cache_key"] = cache_key
-    for field, value in update_fields.items():
-        setattr(run, field, value)
+    update_fields["rule_pack"] = get_rule_registry().label
+    for field_name, value in update_fields.items():
+        setattr(run, field_name, value)
     run.save(update_fields=list(update_fields.keys()))
+    single_flight = single_flight and settings.REVIEW_SINGLE_FLIGHT_ENABLED
 
     try:
-        cache_lookup_start = time.perf_counter()
-        cached_payload = None
-        if settings.REVIEW_ENABLE_PIPELINE_CACHE:
-            cached_payload = cache.get(cache_key)
-        stage_timings["cache_lookup_ms"] = int((time.perf_counter() - cache_lookup_start) * 1000)
-
-        if cached_payload:
-            run.cache_hits += 1
-            chunks = cached_payload.get("chunks", [])
-            clauses = [
-                {"id": chunk["chunk_id"], "heading": chunk.get("heading"), "body": chunk.get("body")}
-                for chunk in chunks
-            ]
-            all_findings = cached_payload.get("findings", [])
-            token_usage = cached_payload.get("token_usage") or {}
-            if cached_payload.get("llm_model"):
-                run.llm_model = cached_payload.get("llm_model")
-            if cached_payload.get("prompt_rev"):
-                run.prompt_rev = cached_payload.get("prompt_rev")
-            run.save(update_fields=["cache_hits", "llm_model", "prompt_rev"])
+        if _use_streaming_pipeline(doc):
+            llm_error = _StreamingReviewPipeline(run, stage_timings, token_usage).execute()
         else:
-            run.cache_misses += 1
-            run.save(update_fields=["cache_misses"])
-
-            run.current_stage = ReviewRunStage.PREPROCESS
-            run.save(update_fields=["current_stage"])
-            preprocess_start = time.perf_counter()
-            chunks = preprocess_document_to_chunks(
-                doc.text,
-                source_type=getattr(doc, "source_type", "text"),
-                ingestion_metadata=getattr(doc, "ingestion_metadata", {}),
-            )
-            clauses = [
-                {"id": chunk["chunk_id"], "heading": chunk.get("heading"), "body": chunk.get("body")}
-                for chunk in chunks
-            ]
-            stage_timings["preprocess_ms"] = int((time.perf_counter() - preprocess_start) * 1000)
-
-            run.current_stage = ReviewRunStage.RULES
-            run.save(update_fields=["current_stage"])
-            rules_start = time.perf_counter()
-            rule_findings = run_rules(clauses, preferred_jurisdiction="California")
-            stage_timings["rules_ms"] = int((time.perf_counter() - rules_start) * 1000)
-
-            run.current_stage = ReviewRunStage.LLM
-            run.save(update_fields=["current_stage"])
-            llm_start = time.perf_counter()
-            llm_findings: List[Dict[str, Any]] = []
-            llm_model = None
-            try:
-                llm_findings, llm_model, token_usage = generate_llm_findings_with_usage_for_clauses(clauses)
-            except TimeoutError as exc:
-                llm_failed = True
-                llm_error = f"LLM stage timeout: {exc}"
-            except Exception as exc:
-                llm_failed = True
-                llm_error = f"LLM stage failed: {exc}"
-            stage_timings["llm_ms"] = int((time.perf_counter() - llm_start) * 1000)
-
-            if llm_failed:
-                all_findings = rule_findings
-            else:
-                all_findings = rule_findings + llm_findings
-            _attach_chunk_pointers_to_findings(all_findings, chunks)
-
-            if settings.REVIEW_ENABLE_PIPELINE_CACHE:
-                # Cache only fully successful runs.
-                if not llm_failed:
-                    cache.set(
-                        cache_key,
-                        {
-                            "chunks": chunks,
-                            "findings": all_findings,
-                            "llm_model": llm_model,
-                            "prompt_rev": PROMPT_REV,
-                            "token_usage": token_usage,
-                        },
-                        timeout=settings.REVIEW_CACHE_TTL_SECONDS,
-                    )
-
-        run.current_stage = ReviewRunStage.PERSIST
-        run.save(update_fields=["current_stage"])
-        persist_start = time.perf_counter()
-        persist_chunks_for_run(run, chunks)
-        persist_findings_for_run(run, clauses, all_findings)
-        stage_timings["persist_ms"] = int((time.perf_counter() - persist_start) * 1000)
-
-        if llm_failed:
+            with ExitStack() as flight:
+                llm_error = _run_batch_pipeline(
+                    run, cache_key, stage_timings, token_usage, flight if single_flight else None
+                )
+        if single_flight_since is not None:
+            stage_timings["single_flight_wait_ms"] = int((time.time() - single_flight_since) * 1000)
+
+        if llm_error:
             run.status = ReviewRunStatus.PARTIAL
             run.error = llm_error
         else:
             run.status = ReviewRunStatus.SUCCEEDED
             run.error = None
+            if checkpoints_enabled():
+                # Cleared here rather than in the pipeline: a retry after a persist failure can
+                # take the pipeline cache hit path, which never loads these checkpoints.
+                # Partial runs keep theirs so reprocessing only pays for failed batches.
+                RunCheckpoints(run).clear()
         run.completed_at = timezone.now()
         run.current_stage = None
         run.token_usage = token_usage
         run.stage_timings = stage_timings
+        run.cache_stats = pipeline_cache.describe(cache_stats)
         run.save(
             update_fields=[
                 "status",
@@ -395,16 +542,385 @@ def process_review_run(run_id: str) -> ReviewRun:
                 "current_stage",
                 "token_usage",
                 "stage_timings",
+                "cache_stats",
             ]
         )
+        _publish_final_status(run)
         return run
+    except FlightInProgress:
+        # Not a failure: the run goes back to the queue until the lock owner has finished.
+        run.status = ReviewRunStatus.QUEUED
+        run.current_stage = None
+        run.save(update_fields=["status", "current_stage"])
+        raise
     except Exception as exc:
         run.status = ReviewRunStatus.FAILED
         run.error = str(exc)
         run.completed_at = timezone.now()
         run.stage_timings = stage_timings
         run.token_usage = token_usage
+        run.cache_stats = pipeline_cache.describe(cache_stats)
         run.save(
-            update_fields=["status", "error", "completed_at", "stage_timings", "token_usage"]
+            update_fields=[
+                "status",
+                "error",
+                "completed_at",
+                "stage_timings",
+                "token_usage",
+                "cache_stats",
+            ]
         )
+        _publish_final_status(run)
         raise
+
+
+def _run_batch_pipeline(
+    run: ReviewRun,
+    cache_key: str,
+    stage_timings: Dict[str, int],
+    token_usage: Dict[str, Any],
+    flight: Optional[ExitStack] = None,
+) -> Optional[str]:
+    """
+    Whole-document pipeline with pipeline-level caching. Returns the LLM error, if any.
+    On a cache miss the single-flight lock is entered on ``flight`` when given, so it is held
+    until the caller closes the stack.
+    """
+    doc = run.document
+    llm_error: Optional[str] = None
+    writer: Optional[_IncrementalFindingWriter] = None
+    checkpoints: Optional[RunCheckpoints] = None
+    pipeline_start = time.perf_counter()
+
+    cache_lookup_start = time.perf_counter()
+    cached_payload = None
+    if settings.REVIEW_ENABLE_PIPELINE_CACHE:
+        cached_payload = pipeline_cache.get(cache_key)
+        if cached_payload is None and flight is not None:
+            # Identical documents reviewed concurrently share one computation: the lock owner
+            # computes; other runs raise FlightInProgress and are re-enqueued for its payload.
+            cached_payload = flight.enter_context(
+                pipeline_cache.single_flight(cache_key, ttl=settings.REVIEW_SINGLE_FLIGHT_LOCK_TTL_SECONDS)
+            )
+    stage_timings["cache_lookup_ms"] = int((time.perf_counter() - cache_lookup_start) * 1000)
+
+    if cached_payload:
+        run.cache_hits += 1
+        chunks = cached_payload.get("chunks", [])
+        clauses = [_clause_from_chunk(chunk) for chunk in chunks]
+        all_findings = cached_payload.get("findings", [])
+        token_usage.update(cached_payload.get("token_usage") or {})
+        if cached_payload.get("llm_model"):
+            run.llm_model = cached_payload.get("llm_model")
+        if cached_payload.get("prompt_rev"):
+            run.prompt_rev = cached_payload.get("prompt_rev")
+        run.save(update_fields=["cache_hits", "llm_model", "prompt_rev"])
+    else:
+        run.cache_misses += 1
+        run.save(update_fields=["cache_misses"])
+
+        checkpoints = RunCheckpoints(run) if checkpoints_enabled() else None
+
+        _set_stage(run, ReviewRunStage.PREPROCESS)
+        preprocess_start = time.perf_counter()
+        chunks_key = f"{CHUNK_SCHEMA_VERSION}:{_document_hash(doc)[:32]}"
+        chunks = checkpoints.load(ReviewRunStage.PREPROCESS, chunks_key) if checkpoints else None
+        if chunks is None:
+            chunks = preprocess_document_to_chunks(
+                doc.text,
+                source_type=getattr(doc, "source_type", "text"),
+                ingestion_metadata=document_ingestion_metadata(doc),
+            )
+            if checkpoints:
+                checkpoints.save(ReviewRunStage.PREPROCESS, chunks_key, chunks)
+        clauses = [_clause_from_chunk(chunk) for chunk in chunks]
+        stage_timings["preprocess_ms"] = int((time.perf_counter() - preprocess_start) * 1000)
+
+        llm_clauses = clauses
+        if triage_enabled():
+            triage_start = time.perf_counter()
+            triage = triage_clauses(clauses)
+            llm_clauses = triage.selected
+            token_usage.update(triage.usage())
+            stage_timings["triage_ms"] = int((time.perf_counter() - triage_start) * 1000)
+
+        if llm_streaming_enabled():
+            writer = _IncrementalFindingWriter(run, chunks, clauses, stage_timings, pipeline_start)
+            writer.begin()
+
+        # Rules (CPU) and LLM (I/O) only depend on the chunks, so the LLM stage runs in a
+        # worker thread while rules run here; rules stay off the critical path.
+        analysis_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="review-llm") as executor:
+            llm_future = executor.submit(
+                contextvars.copy_context().run,
+                _run_llm_stage,
+                llm_clauses,
+                writer.queue.put if writer else None,
+                checkpoints.llm_batches() if checkpoints else None,
+                partial(_publish_batch_progress, run.id),
+            )
+
+            try:
+                _set_stage(run, ReviewRunStage.RULES)
+                rules_start = time.perf_counter()
+                rules_key = get_rule_registry().content_hash[:32]
+                rule_findings = checkpoints.load(ReviewRunStage.RULES, rules_key) if checkpoints else None
+                if rule_findings is None:
+                    rule_findings = run_rules(clauses, preferred_jurisdiction="California")
+                    if checkpoints:
+                        checkpoints.save(ReviewRunStage.RULES, rules_key, rule_findings)
+                stage_timings["rules_ms"] = int((time.perf_counter() - rules_start) * 1000)
+
+                if not llm_future.done():
+                    _set_stage(run, ReviewRunStage.LLM)
+                if writer is not None:
+                    writer.add(rule_findings)
+                    writer.drain_until_done(llm_future)
+                llm_result = llm_future.result()
+            finally:
+                if checkpoints:
+                    # Also when rules or the incremental writes raised: wait for the LLM stage
+                    # and save the batches it finished (even if a later one failed), so a
+                    # retry only pays for unfinished ones.
+                    wait([llm_future])
+                    checkpoints.flush_llm_batches()
+
+        llm_error = llm_result.error
+        token_usage.update(llm_result.usage)
+        if checkpoints:
+            checkpoints.record_resumed_llm(llm_result.usage)
+            if checkpoints.resumed:
+                stage_timings["resumed_stages"] = list(checkpoints.resumed)
+        stage_timings["llm_ms"] = llm_result.elapsed_ms
+        stage_timings["analysis_ms"] = int((time.perf_counter() - analysis_start) * 1000)
+        _record_clause_cache_usage(run, token_usage)
+
+        if llm_error:
+            all_findings = rule_findings
+        else:
+            all_findings = rule_findings + llm_result.findings
+        _attach_chunk_pointers_to_findings(all_findings, chunks)
+
+        if settings.REVIEW_ENABLE_PIPELINE_CACHE:
+            # Cache only fully successful runs.
+            if not llm_error:
+                pipeline_cache.set(
+                    cache_key,
+                    {
+                        "chunks": chunks,
+                        "findings": all_findings,
+                        "llm_model": llm_result.model,
+                        "prompt_rev": PROMPT_REV,
+                        "token_usage": dict(token_usage),
+                    },
+                    timeout=settings.REVIEW_CACHE_TTL_SECONDS,
+                )
+
+    _set_stage(run, ReviewRunStage.PERSIST)
+    persist_start = time.perf_counter()
+    if writer is not None:
+        writer.finish(all_findings, llm_error)
+    else:
+        persist_chunks_for_run(run, chunks)
+        persist_findings_for_run(run, clauses, all_findings)
+    stage_timings["persist_ms"] = int((time.perf_counter() - persist_start) * 1000)
+    return llm_error
+
+
+class _StreamingReviewPipeline:
+    """Producer/consumer pipeline for large documents.
+
+    Chunks are consumed from the preprocessing generator as they are split. Each chunk is
+    run through the rules immediately and appended to the current LLM batch; full batches
+    are sent concurrently (at most REVIEW_LLM_MAX_CONCURRENCY in flight), and chunk and
+    finding rows are written in small batches as they become available. Only the current
+    batch, the in-flight batches and the unflushed rows are held in memory. The
+    whole-document pipeline cache is skipped; the per-clause LLM cache still applies.
+    """
+
+    def __init__(
+        self, run: ReviewRun, stage_timings: Dict[str, int], token_usage: Dict[str, Any]
+    ) -> None:
+        self.run = run
+        self.stage_timings = stage_timings
+        self.token_usage = token_usage
+        self.max_batch_tokens = int(getattr(settings, "REVIEW_LLM_BATCH_MAX_TOKENS", 6000))
+        self.max_in_flight = max(1, int(getattr(settings, "REVIEW_LLM_MAX_CONCURRENCY", 4)))
+        self.triage_threshold = triage_threshold() if triage_enabled() else None
+        self.flush_rows = max(1, int(getattr(settings, "REVIEW_STREAMING_FLUSH_ROWS", 100)))
+        self.flush_seconds = float(getattr(settings, "REVIEW_STREAMING_FLUSH_SECONDS", 1.0))
+
+        self.llm_error: Optional[str] = None
+        self.llm_model: Optional[str] = None
+        self.usages: List[Dict[str, Any]] = []
+        self.in_flight: Dict[Future, List[Dict[str, Any]]] = {}
+        self.batch: List[Dict[str, Any]] = []
+        self.batch_tokens = 0
+        self.chunk_rows: List[ReviewChunk] = []
+        self.finding_rows: List[Finding] = []
+
+        self.started = time.perf_counter()
+        self.last_flush = self.started
+        self.llm_started: Optional[float] = None
+        self.preprocess_s = 0.0
+        self.rules_s = 0.0
+        self.triage_s = 0.0
+        self.persist_s = 0.0
+        self.chunk_count = 0
+        self.batches_submitted = 0
+        self.batches_done = 0
+        self.triage_skipped = 0
+        self.triage_saved_tokens = 0
+
+    def execute(self) -> Optional[str]:
+        run = self.run
+        doc = run.document
+        ReviewChunk.objects.filter(run=run).delete()
+        Finding.objects.filter(run=run).delete()
+        reset_finding_counts(run)
+
+        _set_stage(run, ReviewRunStage.PREPROCESS)
+        chunk_iter = iter_document_chunks(
+            doc.text,
+            source_type=getattr(doc, "source_type", "text"),
+            ingestion_metadata=document_ingestion_metadata(doc),
+        )
+        with ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="review-llm"
+        ) as self.executor:
+            while True:
+                split_start = time.perf_counter()
+                chunk = next(chunk_iter, None)
+                self.preprocess_s += time.perf_counter() - split_start
+                if chunk is None:
+                    break
+                self._consume_chunk(chunk)
+
+            self._submit_batch()
+            if self.in_flight:
+                _set_stage(run, ReviewRunStage.LLM)
+            while self.in_flight:
+                done, _ = wait(list(self.in_flight), return_when=FIRST_COMPLETED)
+                self._collect(done)
+
+        _set_stage(run, ReviewRunStage.PERSIST)
+        self._flush()
+        self._finish()
+        return self.llm_error
+
+    def _consume_chunk(self, chunk: Dict[str, Any]) -> None:
+        self.chunk_count += 1
+        self.chunk_rows.append(_chunk_row(self.run, chunk))
+
+        clause = _clause_from_chunk(chunk)
+        rules_start = time.perf_counter()
+        findings = run_rules([clause], preferred_jurisdiction="California")
+        self.rules_s += time.perf_counter() - rules_start
+        self._add_findings(findings, [chunk])
+
+        cost = estimate_clause_tokens(clause)
+        if not self._skip_llm(clause, cost):
+            if self.batch and self.batch_tokens + cost > self.max_batch_tokens:
+                self._submit_batch()
+            self.batch.append(chunk)
+            self.batch_tokens += cost
+
+        self._collect([future for future in self.in_flight if future.done()])
+        if (
+            len(self.chunk_rows) + len(self.finding_rows) >= self.flush_rows
+            or time.perf_counter() - self.last_flush >= self.flush_seconds
+        ):
+            self._flush()
+
+    def _skip_llm(self, clause: Dict[str, Any], cost: int) -> bool:
+        if self.triage_threshold is None:
+            return False
+        triage_start = time.perf_counter()
+        skip = score_clause(clause) < self.triage_threshold
+        self.triage_s += time.perf_counter() - triage_start
+        if skip:
+            self.triage_skipped += 1
+            self.triage_saved_tokens += cost
+        return skip
+
+    def _submit_batch(self) -> None:
+        batch, self.batch, self.batch_tokens = self.batch, [], 0
+        if not batch or self.llm_error:
+            # After an LLM failure the run is partial; stop paying for further batches.
+            return
+        if len(self.in_flight) >= self.max_in_flight:
+            done, _ = wait(list(self.in_flight), return_when=FIRST_COMPLETED)
+            self._collect(done)
+        if self.llm_started is None:
+            self.llm_started = time.perf_counter()
+        clauses = [_clause_from_chunk(chunk) for chunk in batch]
+        future = self.executor.submit(contextvars.copy_context().run, _run_llm_stage, clauses)
+        self.in_flight[future] = batch
+        self.batches_submitted += 1
+
+    def _collect(self, done) -> None:
+        for future in done:
+            batch = self.in_flight.pop(future)
+            result = future.result()
+            self.batches_done += 1
+            # The total grows while the document is still being chunked.
+            _publish_batch_progress(self.run.id, self.batches_done, self.batches_submitted)
+            if result.error:
+                self.llm_error = self.llm_error or result.error
+                continue
+            self.usages.append(result.usage)
+            if self.llm_error:
+                # The run is already partial: it keeps rule findings only.
+                continue
+            self.llm_model = self.llm_model or result.model
+            self._add_findings(result.findings, batch)
+            self._flush()
+
+    def _add_findings(self, findings: List[Dict[str, Any]], chunks: List[Dict[str, Any]]) -> None:
+        if not findings:
+            return
+        _attach_chunk_pointers_to_findings(findings, chunks)
+        clause_by_id = {chunk["chunk_id"]: chunk for chunk in chunks}
+        self.finding_rows.extend(_finding_rows(self.run, clause_by_id, findings))
+
+    def _flush(self) -> None:
+        persist_start = time.perf_counter()
+        if self.chunk_rows:
+            ReviewChunk.objects.bulk_create(self.chunk_rows)
+            self.chunk_rows = []
+        if self.finding_rows:
+            _insert_findings(self.run, self.finding_rows)
+            self.finding_rows = []
+            self.stage_timings.setdefault(
+                "first_finding_ms", int((time.perf_counter() - self.started) * 1000)
+            )
+        self.last_flush = time.perf_counter()
+        self.persist_s += self.last_flush - persist_start
+
+    def _finish(self) -> None:
+        run = self.run
+        if self.llm_error:
+            # Same policy as the non-streaming path: drop LLM findings flushed before the error.
+            Finding.objects.filter(run=run, source=FindingSource.LLM).delete()
+            refresh_finding_counts(run)
+            self.llm_model = None
+        self.token_usage.update(sum_token_usage(self.usages))
+        if self.triage_threshold is not None:
+            self.token_usage["triage_skipped_clauses"] = self.triage_skipped
+            self.token_usage["triage_saved_tokens_estimate"] = self.triage_saved_tokens
+        _record_clause_cache_usage(run, self.token_usage)
+        run.llm_model = self.llm_model
+        run.prompt_rev = PROMPT_REV if self.usages else None
+        run.save(update_fields=["llm_model", "prompt_rev"])
+
+        timings = self.stage_timings
+        timings["preprocess_ms"] = int(self.preprocess_s * 1000)
+        timings["rules_ms"] = int(self.rules_s * 1000)
+        if self.triage_threshold is not None:
+            timings["triage_ms"] = int(self.triage_s * 1000)
+        timings["llm_ms"] = (
+            int((time.perf_counter() - self.llm_started) * 1000) if self.llm_started else 0
+        )
+        timings["persist_ms"] = int(self.persist_s * 1000)
+        timings["streamed_chunks"] = self.chunk_count
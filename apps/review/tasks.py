@@ -1,6 +1,30 @@
-from celery import shared_task
+import time
+from typing import Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from django.conf import settings
 
+from apps.review.admission import release_run_slot
+from apps.review.cache import FlightInProgress
+from apps.review.llm.clients import close_openai_clients
+from apps.review.reevaluation import reevaluate_rules
+from apps.review.rules import get_rule_registry
 from apps.review.services import process_review_run
+from celery import shared_task
+
+
+@worker_process_init.connect
+def warm_rule_registry(**kwargs) -> None:
+    # Load and compile the rule packs once per worker process instead of on the first run.
+    get_rule_registry()
+
+
+@worker_process_shutdown.connect
+def close_llm_clients(**kwargs) -> None:
+    close_openai_clients()
+
+
+PROCESS_RUN_MAX_RETRIES = 3
 
 
 @shared_task(
@@ -8,7 +32,44 @@ from apps.review.services import process_review_run
     autoretry_for=(Exception,),
     retry_backoff=True,
     retry_jitter=True,
-    retry_kwargs={"max_retries": 3},
+    retry_kwargs={"max_retries": PROCESS_RUN_MAX_RETRIES},
 )
-def process_review_run_task(self, run_id: str) -> None:
-    process_review_run(run_id)
+def process_review_run_task(self, run_id: str, single_flight_since: Optional[float] = None) -> None:
+    # Past the wait budget the run computes on its own. Eager tasks never wait: re-enqueueing
+    # one would run it again immediately.
+    single_flight = not settings.CELERY_TASK_ALWAYS_EAGER and (
+        single_flight_since is None
+        or time.time() - single_flight_since < settings.REVIEW_SINGLE_FLIGHT_WAIT_SECONDS
+    )
+    try:
+        process_review_run(run_id, single_flight=single_flight, single_flight_since=single_flight_since)
+    except FlightInProgress:
+        # Another worker is reviewing an identical document. Come back for its cached result
+        # instead of blocking this worker; a fresh message keeps the retry budget for failures.
+        self.apply_async(
+            kwargs={"run_id": run_id, "single_flight_since": single_flight_since or time.time()},
+            countdown=settings.REVIEW_SINGLE_FLIGHT_RETRY_SECONDS,
+        )
+        return
+    except Exception:
+        # The run keeps its admission slot while Celery still has retries left.
+        if self.request.retries >= PROCESS_RUN_MAX_RETRIES:
+            release_run_slot(run_id)
+        raise
+    release_run_slot(run_id)
+
+
+@shared_task
+def reevaluate_rules_task(document_ids=None, preferred_jurisdiction: str = "California") -> dict:
+    # Celery prefork children are daemonic, so pages are evaluated inline there.
+    result = reevaluate_rules(
+        document_ids=document_ids,
+        preferred_jurisdiction=preferred_jurisdiction,
+    )
+    return {
+        "runs": result.runs,
+        "chunks": result.chunks,
+        "findings": result.findings,
+        "elapsed_s": round(result.elapsed_s, 3),
+        "chunks_per_sec": result.chunks_per_sec,
+    }
@@ -1,15 +1,64 @@
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+import uuid
 from datetime import timedelta
-from unittest.mock import patch
+from unittest import skipUnless
+from unittest.mock import MagicMock, patch
 
-from django.core.cache import cache
-from django.test import TestCase, override_settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import AsyncClient, TestCase, override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
 
+from apps.documents.ingestion.spreadsheet_reader import parse_csv_bytes
 from apps.documents.models import Document
-from apps.review.models import Finding, ReviewChunk, ReviewRun
+from apps.review import admission
+from apps.review import cache as cache_module
+from apps.review import services as services_module
+from apps.review.cache import FlightInProgress, TieredPipelineCache, pipeline_cache
+from apps.review.events import publish_run_event
+from apps.review.llm import clients as clients_module
+from apps.review.llm import provider as provider_module
+from apps.review.llm.provider import (
+    batch_clauses_by_token_budget,
+    estimate_clause_tokens,
+    generate_llm_findings_with_usage_for_clauses,
+)
 from apps.review.llm.schema import LLMValidationError, validate_llm_response
-from apps.review.services import create_queued_review_run, persist_findings_for_run, process_review_run
+from apps.review.llm.streaming import FindingsStreamParser
+from apps.review.models import (
+    AdmissionLock,
+    Finding,
+    ReviewChunk,
+    ReviewRun,
+    ReviewRunCheckpoint,
+    ReviewRunKind,
+    ReviewRunStatus,
+)
+from apps.review.reevaluation import iter_chunk_pages, reevaluate_rules
+from apps.review.rules import (
+    RulePackError,
+    RuleRegistry,
+    RuleScanner,
+    RuleTrigger,
+    get_rule_registry,
+    parse_rule_pack,
+    run_rules,
+)
+from apps.review.serializers import ReviewRunSerializer
+from apps.review.services import (
+    build_pipeline_cache_key,
+    create_queued_review_run,
+    persist_findings_for_run,
+    process_review_run,
+)
+from apps.review.tasks import process_review_run_task
+from apps.review.triage import score_clause, triage_clauses
 
 
 class LLMResponseSchemaTests(TestCase):
@@ -47,6 +96,289 @@ class LLMResponseSchemaTests(TestCase):
             validate_llm_response(payload)
 
 
+class LLMBatchingTests(TestCase):
+    def _clauses(self, count, body_len=400):
+        return [
+            {"id": f"chk_{idx}", "heading": f"Clause {idx}", "body": "x" * body_len}
+            for idx in range(count)
+        ]
+
+    def test_batches_respect_token_budget_and_keep_order(self):
+        clauses = self._clauses(10)
+        per_clause = estimate_clause_tokens(clauses[0])
+        batches = batch_clauses_by_token_budget(clauses, per_clause * 3)
+
+        self.assertEqual([len(b) for b in batches], [3, 3, 3, 1])
+        self.assertEqual([c["id"] for b in batches for c in b], [c["id"] for c in clauses])
+
+    def test_oversized_clause_gets_its_own_batch(self):
+        clauses = self._clauses(1, body_len=10_000) + self._clauses(2)
+        batches = batch_clauses_by_token_budget(clauses, 200)
+        self.assertEqual(len(batches), 3)
+        self.assertEqual(batches[0][0]["body"], "x" * 10_000)
+
+    @override_settings(REVIEW_LLM_BATCH_MAX_TOKENS=150, REVIEW_LLM_MAX_CONCURRENCY=3)
+    def test_batched_calls_merge_findings_and_sum_usage(self):
+        clauses = self._clauses(5)
+
+        def fake_call(batch):
+            findings = [
+                {
+                    "clause_id": c["id"],
+                    "severity": "low",
+                    "summary": "Summary",
+                    "explanation": "Explanation",
+                    "evidence_text": "xxxx",
+                    "evidence_span": {"start": 0, "end": 4},
+                    "confidence": 0.5,
+                }
+                for c in batch
+            ]
+            usage = {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+            return findings, "gpt-test", usage
+
+        with patch("apps.review.llm.provider.call_llm_for_clauses", side_effect=fake_call) as mock_call:
+            findings, model, usage = generate_llm_findings_with_usage_for_clauses(clauses)
+
+        self.assertEqual(mock_call.call_count, 5)
+        self.assertEqual(model, "gpt-test")
+        self.assertEqual([f["clause_id"] for f in findings], [c["id"] for c in clauses])
+        self.assertEqual(usage["prompt_tokens"], 50)
+        self.assertEqual(usage["completion_tokens"], 25)
+        self.assertEqual(usage["total_tokens"], 75)
+        self.assertEqual(usage["llm_batches"], 5)
+
+
+@override_settings(
+    LLM_PROVIDER="openai",
+    OPENAI_API_KEY="test-key",
+    OPENAI_BASE_URL="http://llm-stub.local/v1",
+    OPENAI_TIMEOUT_SECONDS=12,
+    REVIEW_ENABLE_CLAUSE_CACHE=False,
+)
+class PooledLLMClientTests(TestCase):
+    def setUp(self):
+        clients_module.close_openai_clients()
+        self.addCleanup(clients_module.close_openai_clients)
+
+    def test_client_is_built_once_per_process_and_configuration(self):
+        first = clients_module.get_openai_client("test-key")
+        self.assertIs(clients_module.get_openai_client("test-key"), first)
+        self.assertEqual(str(first.base_url), "http://llm-stub.local/v1/")
+        self.assertEqual(first.timeout.read, 12)
+
+        with override_settings(OPENAI_TIMEOUT_SECONDS=30):
+            self.assertIsNot(clients_module.get_openai_client("test-key"), first)
+
+        with patch.object(clients_module.os, "getpid", return_value=os.getpid() + 1):
+            self.assertIsNot(clients_module.get_openai_client("test-key"), first)
+
+    def test_llm_batches_reuse_the_pooled_client(self):
+        content = json.dumps({"findings": []})
+        response = type(
+            "Response",
+            (),
+            {
+                "choices": [type("Choice", (), {"message": type("Msg", (), {"content": content})()})()],
+                "usage": None,
+            },
+        )()
+        fake_client = type("Client", (), {"close": lambda self: None})()
+        fake_client.chat = type("Chat", (), {})()
+        fake_client.chat.completions = type("Completions", (), {"create": lambda self, **kw: response})()
+
+        clauses = [{"id": f"c{idx}", "heading": "H", "body": "x" * 400} for idx in range(4)]
+        with patch.object(clients_module, "build_openai_client", return_value=fake_client) as build:
+            _, _, usage = provider_module.call_llm_for_clause_batches(
+                clauses, max_batch_tokens=150, max_concurrency=2
+            )
+
+        self.assertEqual(usage["llm_batches"], 4)
+        self.assertEqual(build.call_count, 1)
+
+
+class CompiledRuleScannerTests(TestCase):
+    CLAUSE_TEXTS = [
+        ("1. Termination", "Either party may terminate this agreement with 15 days notice."),
+        ("Termination", "Termination requires 45 business days written notice."),
+        ("Indemnity", "Vendor agrees to INDEMNIFY and hold harmless the customer."),
+        ("Confidentiality", "Confidential Information must be protected in perpetuity."),
+        ("NDA", "This nondisclosure obligation survives for 7 years."),
+        ("Non-Disclosure", "The non-disclosure terms last 3 years."),
+        ("Governing Law", "This agreement is governed by the laws of New York."),
+        ("Governing Law", "Governing law: the laws of California apply."),
+        ("Mixed", "Upon termination within 10 days, the confidentiality and indemnification terms survive 10 years."),
+        ("Unicode", "The vendor shall ındemnify the customer and the \u212aey terms apply."),
+        ("Boilerplate", "This Agreement may be executed in counterparts."),
+        (None, "Either party may terminate with 20 days notice."),
+    ]
+
+    # Output of the original hand-written rule functions for CLAUSE_TEXTS, pinned so the
+    # compiled scanner and the default rule pack are checked against a fixed reference.
+    EXPECTED_FINDINGS = [
+        ("chk_0", "TERM_NOTICE_MIN", "high", "Short termination notice period (< 30 days)."),
+        ("chk_1", "TERM_NOTICE_MIN", "medium", "Termination notice period between 30 and 60 days."),
+        ("chk_2", "INDEMNITY_PRESENT", "high", "Indemnity clause present."),
+        ("chk_3", "CONF_PERPETUAL", "high", "Confidentiality obligations appear perpetual."),
+        ("chk_4", "CONF_LONG_TERM", "medium", "Confidentiality obligations longer than 5 years."),
+        ("chk_6", "GOV_LAW_MISMATCH", "medium", "Governing law differs from preferred jurisdiction (California)."),
+        ("chk_8", "TERM_NOTICE_MIN", "high", "Short termination notice period (< 30 days)."),
+        ("chk_8", "INDEMNITY_PRESENT", "high", "Indemnity clause present."),
+        ("chk_8", "CONF_LONG_TERM", "medium", "Confidentiality obligations longer than 5 years."),
+        ("chk_9", "INDEMNITY_PRESENT", "high", "Indemnity clause present."),
+        ("chk_11", "TERM_NOTICE_MIN", "high", "Short termination notice period (< 30 days)."),
+    ]
+
+    def test_findings_match_the_original_rules(self):
+        clauses = [
+            {"id": f"chk_{idx}", "heading": heading, "body": body}
+            for idx, (heading, body) in enumerate(self.CLAUSE_TEXTS)
+        ]
+        findings = run_rules(clauses)
+        self.assertEqual(
+            [(f["clause_id"], f["rule_code"], f["severity"], f["summary"]) for f in findings],
+            self.EXPECTED_FINDINGS,
+        )
+        self.assertEqual(findings[0]["evidence_text"], "1. Termination\n" + self.CLAUSE_TEXTS[0][1])
+        self.assertEqual(findings[0]["evidence_span"], {"start": 0, "end": len(findings[0]["evidence_text"])})
+
+    def test_clauses_without_keywords_dispatch_no_rules(self):
+        text = "Boilerplate\nThis Agreement may be executed in counterparts."
+        scanner = get_rule_registry().scanner
+        self.assertEqual(scanner.candidates(text), [])
+        self.assertEqual(scanner.matching(text), [])
+
+    def test_keyword_prefixes_are_reported_at_shared_positions(self):
+        scanner = RuleScanner(
+            [
+                RuleTrigger(lambda clause, **kw: [], "law", frozenset({"law"})),
+                RuleTrigger(lambda clause, **kw: [], "lawsuit", frozenset({"lawsuit"})),
+            ]
+        )
+        self.assertEqual(scanner.candidates("Any LAWSUIT is excluded."), [0, 1])
+
+
+class RulePackTests(TestCase):
+    PACK = {
+        "name": "custom",
+        "version": "2",
+        "rules": [
+            {
+                "code": "AUTO_RENEWAL",
+                "trigger": r"auto(matic(ally)?)?[- ]renew",
+                "keywords": ["auto"],
+                "measure": "min_days",
+                "bands": [{"lt": 30, "severity": "medium", "summary": "Renewal opt-out under 30 days."}],
+                "explanation": "Opt-out window is {value} days.",
+            }
+        ],
+    }
+
+    def test_default_pack_produces_expected_findings(self):
+        clause = {
+            "id": "chk_1",
+            "heading": "Termination",
+            "body": "Either party may terminate with 45 days notice under the laws of Texas.",
+        }
+        findings = run_rules([clause])
+        self.assertEqual(
+            [(f["rule_code"], f["severity"]) for f in findings],
+            [("TERM_NOTICE_MIN", "medium"), ("GOV_LAW_MISMATCH", "medium")],
+        )
+        self.assertEqual(
+            findings[0]["explanation"],
+            "The termination clause appears to allow termination with only 45 days' notice. "
+            "This may be shorter than a typical minimum of 30 days.",
+        )
+        self.assertEqual(
+            findings[1]["summary"],
+            "Governing law differs from preferred jurisdiction (California).",
+        )
+        self.assertEqual(run_rules([clause], preferred_jurisdiction="Texas")[-1]["rule_code"], "TERM_NOTICE_MIN")
+
+    def test_custom_pack_compiles_measured_bands(self):
+        registry = RuleRegistry([parse_rule_pack(self.PACK)])
+        clause = {"id": "chk_1", "heading": "Renewal", "body": "This auto-renews unless cancelled 10 days prior."}
+        findings = run_rules([clause], scanner=registry.scanner)
+        self.assertEqual(len(findings), 1)
+        self.assertEqual(findings[0]["explanation"], "Opt-out window is 10 days.")
+        self.assertTrue(registry.label.startswith("custom@2:"))
+
+    def test_content_hash_tracks_rule_changes_only(self):
+        first = parse_rule_pack(self.PACK)
+        reordered = parse_rule_pack(dict(reversed(list(self.PACK.items()))))
+        changed = json.loads(json.dumps(self.PACK))
+        changed["rules"][0]["bands"][0]["lt"] = 45
+        self.assertEqual(first.content_hash, reordered.content_hash)
+        self.assertNotEqual(first.content_hash, parse_rule_pack(changed).content_hash)
+
+    def test_invalid_specs_are_rejected(self):
+        bad = json.loads(json.dumps(self.PACK))
+        bad["rules"][0]["measure"] = "max_words"
+        with self.assertRaises(RulePackError):
+            parse_rule_pack(bad)
+        with self.assertRaises(RulePackError):
+            RuleRegistry([parse_rule_pack(self.PACK), parse_rule_pack(self.PACK)])
+
+    def test_trigger_matches_must_contain_a_keyword(self):
+        def pack_with(trigger, keywords):
+            pack = json.loads(json.dumps(self.PACK))
+            pack["rules"][0].update({"trigger": trigger, "keywords": keywords})
+            return pack
+
+        for trigger, keywords in [
+            (r"auto[- ]renew|evergreen", ["auto"]),
+            (r"renew(al)?", ["renewal"]),
+            (r"\w+ renew", ["auto"]),
+            (r"(auto)?renew", ["auto"]),
+        ]:
+            with self.subTest(trigger=trigger), self.assertRaises(RulePackError):
+                parse_rule_pack(pack_with(trigger, keywords))
+
+        for trigger, keywords in [
+            (r"\bAUTO(matic(ally)?)?[- ]renew", ["auto"]),
+            (r"auto[- ]renew|evergreen", ["auto", "evergreen"]),
+            (r"\w+ (?:auto|self)-renew(s|ing)?", ["auto-renew", "self-renew"]),
+            (r"renewal\s+term", ["renewal"]),
+        ]:
+            with self.subTest(trigger=trigger):
+                parse_rule_pack(pack_with(trigger, keywords))
+
+    def test_non_literal_triggers_cannot_prove_a_keyword(self):
+        # Relies on the private stdlib regex parser; a change to its shape must fail here.
+        for trigger, keywords in [
+            (r"[a-z]+ment", ["agreement"]),
+            (r".*renew", ["auto"]),
+            (r"\d+ days", ["30 days"]),
+            (r"(?:auto|self)*renew", ["auto"]),
+        ]:
+            with self.subTest(trigger=trigger), self.assertRaises(RulePackError):
+                parse_rule_pack(self._pack_with_rule(trigger=trigger, keywords=keywords))
+        parse_rule_pack(self._pack_with_rule(trigger=r"30\s*days", keywords=["30"]))
+
+    def test_templates_are_validated_when_the_pack_loads(self):
+        for summary in ["Renews for {term} years.", "Unbalanced {value", "Positional {}."]:
+            band = {"lt": 30, "severity": "medium", "summary": summary}
+            with self.subTest(summary=summary), self.assertRaises(RulePackError):
+                parse_rule_pack(self._pack_with_rule(bands=[band]))
+        for explanation in ["Attribute {value.real}.", "Nested {value:{width}}.", "Stray } brace."]:
+            with self.subTest(explanation=explanation), self.assertRaises(RulePackError):
+                parse_rule_pack(self._pack_with_rule(explanation=explanation))
+        parse_rule_pack(
+            self._pack_with_rule(explanation="Not {preferred_jurisdiction}; {value!r:>4}")
+        )
+
+    def _pack_with_rule(self, **fields):
+        pack = json.loads(json.dumps(self.PACK))
+        pack["rules"][0].update(fields)
+        return pack
+
+    def test_pipeline_cache_key_includes_rule_pack_hash(self):
+        document = Document.objects.create(title="Doc", text="Body")
+        key = build_pipeline_cache_key(document)
+        self.assertTrue(key.endswith(get_rule_registry().content_hash[:16]))
+
+
 @override_settings(LLM_PROVIDER="mock")
 class EvidenceSpanPersistenceTests(TestCase):
     def setUp(self):
@@ -166,6 +498,115 @@ class AsyncReviewRunEagerExecutionTests(TestCase):
         self.assertGreaterEqual(len(findings_resp.data["findings"]), 1)
 
 
+@override_settings(REVIEW_EVENTS_REDIS_URL="", REVIEW_EVENTS_HEARTBEAT_SECONDS=1)
+class ReviewRunEventStreamTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(
+            title="Streamed Progress Contract",
+            text=(
+                "1. Termination\n"
+                "Either party may terminate this agreement with 15 days notice.\n\n"
+                "2. Indemnity\n"
+                "Vendor agrees to indemnify and hold harmless the customer."
+            ),
+        )
+
+    @staticmethod
+    def _parse(frame: str):
+        lines = dict(line.split(": ", 1) for line in frame.strip().split("\n"))
+        return lines["event"], json.loads(lines["data"])
+
+    @staticmethod
+    async def _next(stream) -> str:
+        chunk = await stream.__anext__()
+        return chunk.decode() if isinstance(chunk, bytes) else chunk
+
+    async def test_stream_relays_published_events_until_final_status(self):
+        run = await ReviewRun.objects.acreate(document=self.document, status="running", current_stage="llm")
+        response = await AsyncClient().get(f"/v1/review-runs/{run.id}/events")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+
+        event, data = self._parse(await self._next(stream))
+        self.assertEqual((event, data["status"], data["current_stage"]), ("snapshot", "running", "llm"))
+
+        publish_run_event(run.id, "llm_batch", {"done": 1, "total": 2})
+        publish_run_event(run.id, "status", {"status": "succeeded"})
+        self.assertEqual(self._parse(await self._next(stream)), ("llm_batch", {"run_id": str(run.id), "done": 1, "total": 2}))
+        self.assertEqual(self._parse(await self._next(stream))[0], "status")
+        with self.assertRaises(StopAsyncIteration):
+            await self._next(stream)
+
+    async def test_finished_run_gets_snapshot_and_status_then_closes(self):
+        run = await ReviewRun.objects.acreate(
+            document=self.document, status="succeeded", completed_at=timezone.now()
+        )
+        response = await AsyncClient().get(f"/v1/review-runs/{run.id}/events")
+        frames = [chunk.decode() async for chunk in response.streaming_content]
+        self.assertEqual([self._parse(frame)[0] for frame in frames], ["snapshot", "status"])
+
+    async def test_unknown_run_is_404(self):
+        response = await AsyncClient().get(f"/v1/review-runs/{uuid.uuid4()}/events")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(
+        LLM_PROVIDER="mock",
+        REVIEW_ENABLE_PIPELINE_CACHE=False,
+        REVIEW_ENABLE_CLAUSE_CACHE=False,
+        REVIEW_LLM_BATCH_MAX_TOKENS=40,
+    )
+    def test_pipeline_publishes_stages_batches_and_final_status(self):
+        run = create_queued_review_run(self.document)
+        with patch("apps.review.services.publish_run_event") as publish:
+            process_review_run(str(run.id))
+
+        events = [(call.args[1], call.args[2]) for call in publish.call_args_list]
+        stages = [data["stage"] for name, data in events if name == "stage"]
+        self.assertEqual(stages[0], "preprocess")
+        self.assertIn("rules", stages)
+        self.assertEqual(stages[-1], "persist")
+        self.assertEqual(
+            sorted(data["done"] for name, data in events if name == "llm_batch"), [1, 2]
+        )
+        run.refresh_from_db()
+        self.assertEqual(
+            events[-1],
+            (
+                "status",
+                {
+                    "status": "succeeded",
+                    "error": None,
+                    "completed_at": run.completed_at.isoformat(),
+                    "findings_count": 4,
+                },
+            ),
+        )
+
+
+class ReviewRunConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.document = Document.objects.create(title="Polled Contract", text="Contract text.")
+
+    def test_finished_run_answers_revalidation_with_304(self):
+        run = ReviewRun.objects.create(document=self.document, status="succeeded", completed_at=timezone.now())
+        url = f"/v1/review-runs/{run.id}"
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+
+        with self.assertNumQueries(1):
+            by_etag = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(by_etag.status_code, 304)
+        by_date = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(by_date.status_code, 304)
+
+    def test_running_run_has_no_validators(self):
+        run = ReviewRun.objects.create(document=self.document, status="running")
+        resp = self.client.get(f"/v1/review-runs/{run.id}", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("ETag", resp)
+
+
 @override_settings(LLM_PROVIDER="mock")
 class IdempotencyRunTests(TestCase):
     def setUp(self):
@@ -249,6 +690,174 @@ class WorkerRetrySafetyTests(TestCase):
         self.assertEqual(second_chunk_ids, first_chunk_ids)
 
 
+@override_settings(
+    LLM_PROVIDER="mock",
+    REVIEW_ENABLE_PIPELINE_CACHE=False,
+    REVIEW_ENABLE_CLAUSE_CACHE=False,
+    REVIEW_ENABLE_CHECKPOINTS=True,
+    REVIEW_LLM_BATCH_MAX_TOKENS=40,
+)
+class StageCheckpointResumeTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(
+            title="Checkpoint Contract",
+            text=(
+                "1. Termination\n"
+                "Either party may terminate this agreement with 15 days notice.\n\n"
+                "2. Indemnity\n"
+                "Vendor agrees to indemnify and hold harmless the customer."
+            ),
+        )
+        self.run = create_queued_review_run(self.document)
+
+    def test_retry_after_persist_failure_resumes_every_stage(self):
+        with patch("apps.review.services.persist_findings_for_run", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                process_review_run(str(self.run.id))
+        self.assertEqual(
+            sorted(ReviewRunCheckpoint.objects.filter(run=self.run).values_list("stage", flat=True)),
+            ["llm", "llm", "preprocess", "rules"],
+        )
+
+        with patch(
+            "apps.review.services.preprocess_document_to_chunks", side_effect=AssertionError("re-chunked")
+        ), patch("apps.review.services.run_rules", side_effect=AssertionError("re-ran rules")), patch.object(
+            provider_module, "call_llm_for_clauses", side_effect=AssertionError("paid again")
+        ):
+            process_review_run(str(self.run.id))
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, "succeeded")
+        self.assertEqual(self.run.stage_timings["resumed_stages"], ["preprocess", "rules", "llm"])
+        self.assertEqual(self.run.token_usage["llm_batches_resumed"], 2)
+        self.assertEqual(Finding.objects.filter(run=self.run, source="llm").count(), 2)
+        self.assertEqual(Finding.objects.filter(run=self.run, source="rule").count(), 2)
+        self.assertFalse(ReviewRunCheckpoint.objects.filter(run=self.run).exists())
+
+    def test_finished_llm_batches_are_saved_when_the_rules_stage_raises(self):
+        real_llm = provider_module.generate_llm_findings_with_usage_for_clauses
+        llm_done = threading.Event()
+
+        def finishing_llm(clauses, **kwargs):
+            try:
+                return real_llm(clauses, **kwargs)
+            finally:
+                llm_done.set()
+
+        def failing_rules(*args, **kwargs):
+            self.assertTrue(llm_done.wait(timeout=5))
+            raise RuntimeError("rule crashed")
+
+        with patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=finishing_llm,
+        ), patch("apps.review.services.run_rules", side_effect=failing_rules):
+            with self.assertRaises(RuntimeError):
+                process_review_run(str(self.run.id))
+
+        self.assertEqual(
+            ReviewRunCheckpoint.objects.filter(run=self.run, stage="llm").count(),
+            2,
+        )
+
+    @override_settings(REVIEW_ENABLE_PIPELINE_CACHE=True)
+    def test_retry_served_from_pipeline_cache_still_clears_checkpoints(self):
+        pipeline_cache.clear()
+        with patch("apps.review.services.persist_findings_for_run", side_effect=RuntimeError("db down")):
+            with self.assertRaises(RuntimeError):
+                process_review_run(str(self.run.id))
+        self.assertTrue(ReviewRunCheckpoint.objects.filter(run=self.run).exists())
+
+        with patch("apps.review.services.run_rules", side_effect=AssertionError("cache missed")):
+            process_review_run(str(self.run.id))
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, "succeeded")
+        self.assertEqual(Finding.objects.filter(run=self.run).count(), 4)
+        self.assertFalse(ReviewRunCheckpoint.objects.filter(run=self.run).exists())
+
+    def test_only_unfinished_llm_batches_are_called_again(self):
+        real_call = provider_module.call_llm_for_clauses
+        called = []
+
+        def flaky_call(batch, **kwargs):
+            called.append(batch[0]["heading"])
+            if batch[0]["heading"] == "2. Indemnity" and called.count("2. Indemnity") == 1:
+                raise TimeoutError("batch timeout")
+            return real_call(batch, **kwargs)
+
+        with patch.object(provider_module, "call_llm_for_clauses", side_effect=flaky_call):
+            process_review_run(str(self.run.id))
+            self.run.refresh_from_db()
+            self.assertEqual(self.run.status, "partial")
+            self.assertEqual(ReviewRunCheckpoint.objects.filter(run=self.run, stage="llm").count(), 1)
+
+            process_review_run(str(self.run.id))
+
+        self.run.refresh_from_db()
+        self.assertEqual(self.run.status, "succeeded")
+        self.assertEqual(sorted(called), ["1. Termination", "2. Indemnity", "2. Indemnity"])
+        self.assertIn("llm", self.run.stage_timings["resumed_stages"])
+        self.assertEqual(self.run.token_usage["llm_batches_resumed"], 1)
+
+
+@override_settings(LLM_PROVIDER="mock", REVIEW_ENABLE_PIPELINE_CACHE=False, REVIEW_ENABLE_CLAUSE_CACHE=False)
+class FindingCountersTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(
+            title="Counter Contract",
+            text=(
+                "1. Termination\n"
+                "Either party may terminate this agreement with 15 days notice.\n\n"
+                "2. Indemnity\n"
+                "Vendor agrees to indemnify and hold harmless the customer."
+            ),
+        )
+
+    def _assert_counters_match_table(self, run):
+        run.refresh_from_db()
+        findings = list(Finding.objects.filter(run=run))
+        self.assertEqual(run.findings_count, len(findings))
+        self.assertEqual(sum(run.findings_by_severity.values()), len(findings))
+        self.assertEqual(
+            run.findings_by_source,
+            {source: sum(1 for f in findings if f.source == source) for source in {f.source for f in findings}},
+        )
+        self.assertEqual(
+            run.findings_by_rule_code,
+            {code: sum(1 for f in findings if f.rule_code == code) for code in {f.rule_code for f in findings} if code},
+        )
+        return run
+
+    def test_counters_are_written_at_persist_time(self):
+        run = process_review_run(str(create_queued_review_run(self.document).id))
+        run = self._assert_counters_match_table(run)
+        self.assertEqual(run.findings_by_rule_code, {"INDEMNITY_PRESENT": 1, "TERM_NOTICE_MIN": 1})
+        self.assertEqual(run.findings_by_source, {"llm": 2, "rule": 2})
+
+        # Reprocessing replaces the findings and the counters instead of adding to them.
+        process_review_run(str(run.id))
+        self.assertEqual(self._assert_counters_match_table(run).findings_count, 4)
+
+    @override_settings(REVIEW_LLM_STREAM_FINDINGS=True)
+    def test_incremental_writer_keeps_counters_exact_on_llm_failure(self):
+        with patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=TimeoutError("upstream timeout"),
+        ):
+            run = process_review_run(str(create_queued_review_run(self.document).id))
+        run = self._assert_counters_match_table(run)
+        self.assertEqual(run.findings_by_source, {"rule": 2})
+
+    def test_serializing_a_run_issues_no_queries(self):
+        run = process_review_run(str(create_queued_review_run(self.document).id))
+        run = ReviewRun.objects.get(id=run.id)
+        with self.assertNumQueries(0):
+            data = ReviewRunSerializer(run).data
+        self.assertEqual(data["findings_count"], 4)
+        self.assertEqual(data["document_id"], str(self.document.id))
+
+
 @override_settings(REVIEW_ENABLE_EMBEDDINGS=True, REVIEW_EMBEDDING_PROVIDER="mock", REVIEW_EMBEDDING_DIM=32)
 class RecommendationPersistenceTests(TestCase):
     def test_recommendation_and_embedding_are_persisted(self):
@@ -365,7 +974,7 @@ class SpreadsheetEvidencePointerTests(TestCase):
 @override_settings(LLM_PROVIDER="mock", CELERY_TASK_ALWAYS_EAGER=True, REVIEW_ENABLE_PIPELINE_CACHE=True)
 class RunInstrumentationCacheTests(TestCase):
     def setUp(self):
-        cache.clear()
+        pipeline_cache.clear()
         self.client = APIClient()
         self.document = Document.objects.create(
             title="Cache Contract",
@@ -387,7 +996,8 @@ class RunInstrumentationCacheTests(TestCase):
         first_run_id = first_resp.data["run"]["id"]
         first_run = ReviewRun.objects.get(id=first_run_id)
         self.assertEqual(first_run.status, "succeeded")
-        self.assertEqual(first_run.cache_misses, 1)
+        # One pipeline-level miss plus one per-clause miss for each of the two clauses.
+        self.assertEqual(first_run.cache_misses, 3)
         self.assertEqual(first_run.cache_hits, 0)
         self.assertIn("preprocess_ms", first_run.stage_timings)
         self.assertIn("rules_ms", first_run.stage_timings)
@@ -410,11 +1020,726 @@ class RunInstrumentationCacheTests(TestCase):
         self.assertIn("cache_lookup_ms", second_run.stage_timings)
         self.assertIn("persist_ms", second_run.stage_timings)
         self.assertTrue(second_run.cache_key)
+        self.assertEqual(second_run.cache_stats["l1_hits"], 1)
+        self.assertEqual(second_run.cache_stats["hit_rate"], 1.0)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pipeline-cache-tests",
+        },
+    },
+    REVIEW_CACHE_ALIAS="shared",
+)
+class TieredPipelineCacheTests(TestCase):
+    """The "shared" LocMem alias stands in for Redis as the cross-worker L2."""
+
+    def setUp(self):
+        self.worker_a = TieredPipelineCache()
+        self.worker_b = TieredPipelineCache()
+        self.worker_a.clear()
+
+    def test_stats_counters_do_not_lose_updates_across_threads(self):
+        def count():
+            for _ in range(20000):
+                self.worker_a._count(misses=1, sets=1)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with self.worker_a.collect_stats() as stats:
+                threads = [
+                    threading.Thread(target=contextvars.copy_context().run, args=(count,))
+                    for _ in range(8)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual((stats.misses, stats.sets), (160000, 160000))
+        self.assertEqual(self.worker_a.totals.misses, 160000)
+
+    def test_l2_hits_are_shared_across_processes_and_promoted_to_l1(self):
+        payload = {"findings": [{"summary": "Indemnity clause present."}] * 50}
+        self.worker_a.set("review:doc", payload, timeout=60)
+
+        with self.worker_b.collect_stats() as stats:
+            self.assertEqual(self.worker_b.get("review:doc"), payload)
+            self.assertEqual(self.worker_b.get("review:doc"), payload)
+            self.assertIsNone(self.worker_b.get("review:missing"))
+
+        self.assertEqual((stats.l2_hits, stats.l1_hits, stats.misses), (1, 1, 1))
+        self.assertAlmostEqual(stats.hit_rate, 0.6667, places=3)
+
+    def test_payloads_are_compressed(self):
+        payload = {"chunks": [{"body": "Vendor agrees to indemnify the customer. " * 20}] * 20}
+        with self.worker_a.collect_stats() as stats:
+            self.assertIsNone(self.worker_a.get("review:big"))
+            self.worker_a.set("review:big", payload, timeout=60)
+        raw_size = len(json.dumps(payload, separators=(",", ":")))
+        self.assertLess(stats.bytes_written, raw_size / 10)
+        self.assertEqual(self.worker_a.l1_size_bytes, stats.bytes_written)
+
+    def test_l1_is_bounded_by_bytes_and_evicts_least_recently_used(self):
+        with override_settings(REVIEW_CACHE_L1_MAX_BYTES=200):
+            with self.worker_a.collect_stats() as stats:
+                for idx in range(20):
+                    self.worker_a.set(f"review:key:{idx}", {"idx": idx, "pad": os.urandom(8).hex()})
+
+        self.assertLessEqual(self.worker_a.l1_size_bytes, 200)
+        self.assertGreater(stats.l1_evictions, 0)
+        # Evicted entries are still served from the shared tier.
+        with self.worker_a.collect_stats() as stats:
+            self.assertEqual(self.worker_a.get("review:key:0")["idx"], 0)
+        self.assertEqual(stats.l2_hits, 1)
+
+
+@override_settings(
+    LLM_PROVIDER="mock",
+    REVIEW_ENABLE_PIPELINE_CACHE=True,
+    REVIEW_ENABLE_CLAUSE_CACHE=False,
+    REVIEW_SINGLE_FLIGHT_RETRY_SECONDS=7,
+    REVIEW_SINGLE_FLIGHT_WAIT_SECONDS=600,
+    CELERY_TASK_ALWAYS_EAGER=False,
+)
+class SingleFlightCoalescingTests(TestCase):
+    def setUp(self):
+        pipeline_cache.clear()
+        self.document = Document.objects.create(
+            title="Single Flight Contract",
+            text=(
+                "1. Termination\n"
+                "Either party may terminate this agreement with 15 days notice.\n\n"
+                "2. Indemnity\n"
+                "Vendor agrees to indemnify and hold harmless the customer."
+            ),
+        )
+        self.cache_key = build_pipeline_cache_key(self.document)
+
+    def test_only_one_concurrent_caller_owns_the_flight(self):
+        results = []
+        entered = threading.Barrier(6)
+        decided = threading.Barrier(6)
+
+        def contend():
+            worker = TieredPipelineCache()
+            entered.wait()
+            try:
+                with worker.single_flight("review:flight", ttl=60):
+                    results.append("owner")
+                    decided.wait()
+            except FlightInProgress:
+                results.append("deferred")
+                decided.wait()
+
+        threads = [threading.Thread(target=contend) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), ["deferred"] * 5 + ["owner"])
+        # Released on exit.
+        self.assertIsNotNone(pipeline_cache.acquire_flight("review:flight", ttl=60))
+
+    def test_redis_release_is_a_compare_and_delete_on_the_owner_token(self):
+        client = MagicMock()
+        client.set.return_value = True
+        with patch("apps.review.cache.redis_client", return_value=client):
+            token = pipeline_cache.acquire_flight("review:flight", ttl=60)
+            pipeline_cache.release_flight("review:flight", token)
+
+        redis_key = caches["pipeline"].make_and_validate_key("review:flight:flight")
+        client.set.assert_called_once_with(redis_key, token, nx=True, ex=60)
+        client.eval.assert_called_once_with(cache_module._RELEASE_FLIGHT_LUA, 1, redis_key, token)
+        client.delete.assert_not_called()
+
+    def test_task_is_reenqueued_while_the_key_is_in_flight_and_reuses_the_result(self):
+        process_review_run(str(create_queued_review_run(self.document).id))
+        payload = pipeline_cache.get(self.cache_key)
+        pipeline_cache.clear()
+        token = pipeline_cache.acquire_flight(self.cache_key, ttl=60)
+        run = create_queued_review_run(self.document)
+
+        with patch.object(process_review_run_task, "apply_async") as reenqueue, patch(
+            "apps.review.tasks.release_run_slot"
+        ) as release:
+            process_review_run_task.apply(args=(str(run.id),))
+        release.assert_not_called()
+        reenqueue.assert_called_once()
+        self.assertEqual(reenqueue.call_args.kwargs["countdown"], 7)
+        retry_kwargs = reenqueue.call_args.kwargs["kwargs"]
+        self.assertEqual(retry_kwargs["run_id"], str(run.id))
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.current_stage), ("queued", None))
+
+        pipeline_cache.set(self.cache_key, payload, timeout=60)
+        pipeline_cache.release_flight(self.cache_key, token)
+        with patch.object(provider_module, "call_llm_for_clauses", side_effect=AssertionError("recomputed")):
+            process_review_run_task.apply(kwargs=retry_kwargs)
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, "succeeded")
+        self.assertEqual(run.cache_hits, 1)
+        self.assertIn("single_flight_wait_ms", run.stage_timings)
+        self.assertEqual(Finding.objects.filter(run=run).count(), len(payload["findings"]))
+
+    def test_run_takes_over_when_owner_releases_without_a_result(self):
+        token = pipeline_cache.acquire_flight(self.cache_key, ttl=60)
+        run = create_queued_review_run(self.document)
+        with self.assertRaises(FlightInProgress):
+            process_review_run(str(run.id))
+
+        pipeline_cache.release_flight(self.cache_key, token)
+        run = process_review_run(str(run.id), single_flight_since=time.time())
+        self.assertEqual(run.status, "succeeded")
+        self.assertEqual(run.cache_misses, 1)
+        # The lock is released once the run has finished.
+        self.assertIsNotNone(pipeline_cache.acquire_flight(self.cache_key, ttl=60))
+
+    def test_run_computes_without_the_lock_once_the_wait_budget_is_spent(self):
+        pipeline_cache.acquire_flight(self.cache_key, ttl=60)
+        run = create_queued_review_run(self.document)
+        with patch.object(process_review_run_task, "apply_async") as reenqueue:
+            process_review_run_task.apply(
+                kwargs={"run_id": str(run.id), "single_flight_since": time.time() - 601}
+            )
+        reenqueue.assert_not_called()
+        run.refresh_from_db()
+        self.assertEqual(run.status, "succeeded")
+        self.assertGreaterEqual(run.stage_timings["single_flight_wait_ms"], 601000)
+
+
+@override_settings(LLM_PROVIDER="mock", REVIEW_ENABLE_PIPELINE_CACHE=False, REVIEW_ENABLE_CLAUSE_CACHE=True)
+class ClauseFindingsCacheTests(TestCase):
+    def setUp(self):
+        pipeline_cache.clear()
+        self.clauses = [
+            {"id": "chk_a", "heading": "1. Termination", "body": "Either party may terminate with 15 days notice."},
+            {"id": "chk_b", "heading": "2. Indemnity", "body": "Vendor agrees to indemnify the customer."},
+        ]
+
+    def test_only_unseen_clauses_are_sent_to_llm(self):
+        with patch(
+            "apps.review.llm.provider.call_llm_for_clause_batches",
+            wraps=provider_module.call_llm_for_clause_batches,
+        ) as spy:
+            first, _, first_usage = generate_llm_findings_with_usage_for_clauses(self.clauses)
+            edited = [
+                {"id": "chk_a2", "heading": "1. Termination", "body": self.clauses[0]["body"]},
+                {"id": "chk_b2", "heading": "2. Indemnity", "body": "Vendor shall indemnify the customer."},
+            ]
+            second, _, second_usage = generate_llm_findings_with_usage_for_clauses(edited)
+
+        self.assertEqual(first_usage["clause_cache_misses"], 2)
+        self.assertEqual(first_usage["clause_cache_hits"], 0)
+        self.assertEqual(second_usage["clause_cache_hits"], 1)
+        self.assertEqual(second_usage["clause_cache_misses"], 1)
+        self.assertEqual([c["id"] for c in spy.call_args_list[1].args[0]], ["chk_b2"])
+
+        # Cached findings are rebound to the new clause id with fresh finding ids.
+        self.assertEqual([f["clause_id"] for f in second], ["chk_a2", "chk_b2"])
+        self.assertEqual(second[0]["summary"], first[0]["summary"])
+        self.assertNotEqual(second[0]["id"], first[0]["id"])
+
+    def test_clause_cache_counts_feed_review_run(self):
+        document = Document.objects.create(
+            title="Clause Cache Contract",
+            text="1. Termination\nEither party may terminate with 15 days notice.",
+        )
+        first = create_queued_review_run(document)
+        process_review_run(str(first.id))
+        second = create_queued_review_run(document)
+        process_review_run(str(second.id))
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        # Each run also records one pipeline-level miss (that cache is disabled here).
+        self.assertEqual((first.cache_hits, first.cache_misses), (0, 2))
+        self.assertEqual((second.cache_hits, second.cache_misses), (1, 1))
+        self.assertEqual(
+            Finding.objects.filter(run=second, source="llm").count(),
+            Finding.objects.filter(run=first, source="llm").count(),
+        )
+
+
+@override_settings(LLM_PROVIDER="mock", REVIEW_ENABLE_PIPELINE_CACHE=False)
+class ConcurrentStageExecutionTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(
+            title="Overlap Contract",
+            text="1. Indemnity\nVendor agrees to indemnify and hold harmless the customer.",
+        )
+
+    def test_rules_run_while_llm_stage_is_in_flight(self):
+        llm_started = threading.Event()
+        rules_saw_llm_in_flight = []
+
+        def slow_llm(clauses, **kwargs):
+            llm_started.set()
+            time.sleep(0.05)
+            return [], "mock", {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+        def rules_waiting_for_llm(clauses, **kwargs):
+            # If stages ran back to back, the LLM would not have started yet.
+            rules_saw_llm_in_flight.append(llm_started.wait(timeout=2))
+            return run_rules(clauses, **kwargs)
+
+        run = create_queued_review_run(self.document)
+        with patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=slow_llm,
+        ), patch("apps.review.services.run_rules", side_effect=rules_waiting_for_llm):
+            process_review_run(str(run.id))
+
+        run.refresh_from_db()
+        self.assertEqual(rules_saw_llm_in_flight, [True])
+        self.assertEqual(run.status, "succeeded")
+        self.assertIsNone(run.current_stage)
+        for key in ("rules_ms", "llm_ms", "analysis_ms"):
+            self.assertIn(key, run.stage_timings)
+        self.assertGreaterEqual(run.stage_timings["llm_ms"], 50)
+        self.assertTrue(Finding.objects.filter(run=run, rule_code="INDEMNITY_PRESENT").exists())
+
+
+@override_settings(
+    LLM_PROVIDER="mock",
+    REVIEW_ENABLE_PIPELINE_CACHE=False,
+    REVIEW_ENABLE_CLAUSE_CACHE=False,
+    REVIEW_LLM_BATCH_MAX_TOKENS=60,
+    REVIEW_LLM_MAX_CONCURRENCY=2,
+    REVIEW_STREAMING_FLUSH_ROWS=4,
+)
+class StreamingPipelineTests(TestCase):
+    def setUp(self):
+        sections = []
+        for idx in range(1, 13):
+            sections.append(
+                f"{idx}. Indemnity\nVendor agrees to indemnify the customer for claim {idx}."
+            )
+        self.document = Document.objects.create(title="Large Contract", text="\n\n".join(sections))
+
+    def _run(self, streaming_min_chars):
+        run = create_queued_review_run(self.document)
+        with override_settings(REVIEW_STREAMING_MIN_CHARS=streaming_min_chars):
+            process_review_run(str(run.id))
+        run.refresh_from_db()
+        return run
+
+    def _finding_keys(self, run):
+        return sorted(
+            Finding.objects.filter(run=run).values_list("chunk_id", "source", "rule_code", "summary")
+        )
+
+    def test_streaming_matches_batch_output_and_persists_incrementally(self):
+        batch_run = self._run(streaming_min_chars=0)
+
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+        real_llm = provider_module.generate_llm_findings_with_usage_for_clauses
+
+        def tracking_llm(clauses, **kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            try:
+                return real_llm(clauses, **kwargs)
+            finally:
+                with lock:
+                    in_flight.pop()
+
+        with patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=tracking_llm,
+        ), patch.object(Finding.objects, "bulk_create", wraps=Finding.objects.bulk_create) as spy:
+            stream_run = self._run(streaming_min_chars=1)
+
+        self.assertEqual(stream_run.status, "succeeded")
+        self.assertEqual(self._finding_keys(stream_run), self._finding_keys(batch_run))
+        self.assertEqual(
+            ReviewChunk.objects.filter(run=stream_run).count(),
+            ReviewChunk.objects.filter(run=batch_run).count(),
+        )
+        self.assertGreater(spy.call_count, 1)
+        self.assertLessEqual(max(peak), 2)
+        self.assertGreater(stream_run.token_usage["llm_batches"], 1)
+        self.assertEqual(stream_run.stage_timings["streamed_chunks"], 12)
+        self.assertIn("first_finding_ms", stream_run.stage_timings)
+        self.assertLessEqual(
+            stream_run.stage_timings["first_finding_ms"], stream_run.stage_timings["llm_ms"] + 1000
+        )
+
+    def test_streaming_llm_failure_marks_partial_and_keeps_rule_findings(self):
+        with patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=TimeoutError("upstream timeout"),
+        ):
+            run = self._run(streaming_min_chars=1)
+
+        self.assertEqual(run.status, "partial")
+        self.assertIn("timeout", run.error)
+        findings = Finding.objects.filter(run=run)
+        self.assertEqual(findings.count(), 12)
+        self.assertTrue(all(f.source == "rule" for f in findings))
+
+    def test_streaming_llm_failure_drops_llm_findings_flushed_before_it(self):
+        real_llm = provider_module.generate_llm_findings_with_usage_for_clauses
+        calls = []
+        lock = threading.Lock()
+
+        def flaky_llm(clauses, **kwargs):
+            with lock:
+                calls.append(1)
+                attempt = len(calls)
+            if attempt == 3:
+                raise TimeoutError("upstream timeout")
+            return real_llm(clauses, **kwargs)
+
+        with patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=flaky_llm,
+        ):
+            run = self._run(streaming_min_chars=1)
+
+        self.assertEqual(run.status, "partial")
+        self.assertIsNone(run.llm_model)
+        findings = Finding.objects.filter(run=run)
+        self.assertEqual(findings.count(), 12)
+        self.assertTrue(all(f.source == "rule" for f in findings))
+        self.assertEqual(run.findings_count, 12)
+
+
+@override_settings(
+    LLM_PROVIDER="mock",
+    REVIEW_ENABLE_PIPELINE_CACHE=False,
+    REVIEW_LLM_TRIAGE_ENABLED=True,
+    REVIEW_LLM_TRIAGE_THRESHOLD=0.3,
+)
+class LLMTriageTests(TestCase):
+    SIGNATURES = "IN WITNESS WHEREOF the parties have executed this Agreement.\nBy: ________\nName: Jane Doe\nTitle: CEO"
+
+    def setUp(self):
+        self.document = Document.objects.create(
+            title="Triage Contract",
+            text=(
+                "1. Termination\n"
+                "Either party may terminate this agreement with 15 days notice.\n\n"
+                "2. Payment\n"
+                "Customer shall pay all fees within thirty days of invoice.\n\n"
+                f"3. Signatures\n{self.SIGNATURES}"
+            ),
+        )
+
+    def test_scores_rule_hits_above_boilerplate(self):
+        rule_clause = {"id": "a", "heading": "Indemnity", "body": "Vendor shall indemnify Customer."}
+        boilerplate = {"id": "b", "heading": "Signatures", "body": self.SIGNATURES}
+        numbers = {"id": "c", "heading": "Sheet1 rows 2-3", "body": "Row 2: 2024-01-01 | 1500.00\nRow 3: 2024-02-01 | 300.00"}
+        self.assertEqual(score_clause(rule_clause), 1.0)
+        self.assertLess(score_clause(boilerplate), 0.3)
+        self.assertLess(score_clause(numbers), 0.3)
+
+        result = triage_clauses([rule_clause, boilerplate, numbers])
+        self.assertEqual([c["id"] for c in result.selected], ["a"])
+        self.assertEqual(result.usage()["triage_skipped_clauses"], 2)
+        self.assertGreater(result.usage()["triage_saved_tokens_estimate"], 0)
+
+    def _run(self, streaming_min_chars):
+        sent = []
+        real_llm = provider_module.generate_llm_findings_with_usage_for_clauses
+
+        def recording_llm(clauses, **kwargs):
+            sent.extend(clause["heading"] for clause in clauses)
+            return real_llm(clauses, **kwargs)
+
+        run = create_queued_review_run(self.document)
+        with override_settings(REVIEW_STREAMING_MIN_CHARS=streaming_min_chars), patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=recording_llm,
+        ):
+            process_review_run(str(run.id))
+        run.refresh_from_db()
+        return run, sent
+
+    def test_batch_pipeline_skips_low_scoring_clauses(self):
+        run, sent = self._run(streaming_min_chars=0)
+        self.assertEqual(run.status, "succeeded")
+        self.assertEqual(sent, ["1. Termination", "2. Payment"])
+        self.assertEqual(run.token_usage["triage_skipped_clauses"], 1)
+        self.assertGreater(run.token_usage["triage_saved_tokens_estimate"], 0)
+        self.assertIn("triage_ms", run.stage_timings)
+        self.assertIn(":triage0.3", run.cache_key)
+
+    def test_streaming_pipeline_skips_low_scoring_clauses(self):
+        run, sent = self._run(streaming_min_chars=1)
+        self.assertEqual(run.status, "succeeded")
+        self.assertEqual(sent, ["1. Termination", "2. Payment"])
+        self.assertEqual(run.token_usage["triage_skipped_clauses"], 1)
+        self.assertIn("triage_ms", run.stage_timings)
+
+
+def _raw_llm_finding(clause_id, summary="Summary"):
+    return {
+        "clause_id": clause_id,
+        "severity": "medium",
+        "summary": summary,
+        "explanation": "Explanation with braces } and [brackets] and \"quotes\".",
+        "evidence_text": "Either",
+        "evidence_span": {"start": 0, "end": 6},
+        "confidence": 0.7,
+    }
+
+
+class FindingsStreamParserTests(TestCase):
+    def test_emits_each_finding_as_its_object_closes(self):
+        document = json.dumps({"findings": [_raw_llm_finding("a"), _raw_llm_finding("b")]}, indent=2)
+        parser = FindingsStreamParser()
+        emitted_at = []
+        for idx in range(0, len(document), 7):
+            for item in parser.feed(document[idx : idx + 7]):
+                emitted_at.append((idx, item["clause_id"]))
+
+        self.assertEqual([clause_id for _, clause_id in emitted_at], ["a", "b"])
+        self.assertLess(emitted_at[0][0], len(document) // 2 + 7)
+        self.assertEqual(len(parser.close()["findings"]), 2)
+
+    def test_close_rejects_invalid_documents(self):
+        parser = FindingsStreamParser()
+        parser.feed('{"findings": [')
+        with self.assertRaises(LLMValidationError):
+            parser.close()
+
+
+@override_settings(
+    LLM_PROVIDER="openai",
+    OPENAI_API_KEY="test-key",
+    REVIEW_LLM_STREAM_FINDINGS=True,
+    REVIEW_ENABLE_CLAUSE_CACHE=False,
+)
+class StreamedLLMResponseTests(TestCase):
+    def _fake_client(self, document, emitted):
+        observed = []
+
+        def stream(**kwargs):
+            assert kwargs["stream"] is True
+            for idx in range(0, len(document), 5):
+                observed.append(len(emitted))
+                delta = type("Delta", (), {"content": document[idx : idx + 5]})()
+                yield type("Event", (), {"choices": [type("Choice", (), {"delta": delta})()], "usage": None})()
+            usage = type("Usage", (), {"prompt_tokens": 11, "completion_tokens": 7, "total_tokens": 18})()
+            yield type("Event", (), {"choices": [], "usage": usage})()
+
+        client = type("Client", (), {})()
+        client.chat = type("Chat", (), {})()
+        client.chat.completions = type("Completions", (), {"create": lambda self, **kw: stream(**kw)})()
+        return client, observed
+
+    def test_findings_are_delivered_before_the_completion_ends(self):
+        clauses = [{"id": "c1", "heading": "Termination", "body": "Either party may terminate."}]
+        document = json.dumps({"findings": [_raw_llm_finding("c1", "First"), _raw_llm_finding("c1", "Second")]})
+        emitted = []
+        client, observed = self._fake_client(document, emitted)
+
+        with patch.object(provider_module, "get_openai_client", return_value=client):
+            findings, model, usage = generate_llm_findings_with_usage_for_clauses(
+                clauses, on_finding=emitted.append
+            )
+
+        self.assertEqual([f["summary"] for f in emitted], ["First", "Second"])
+        self.assertEqual([f["id"] for f in findings], [f["id"] for f in emitted])
+        # The first finding was handed over while later fragments were still streaming.
+        self.assertIn(1, observed)
+        self.assertEqual(usage["total_tokens"], 18)
+
+    def test_invalid_streamed_finding_fails_the_call(self):
+        clauses = [{"id": "c1", "heading": "Termination", "body": "Either party may terminate."}]
+        bad = _raw_llm_finding("c1")
+        bad["severity"] = "critical"
+        client, _ = self._fake_client(json.dumps({"findings": [bad]}), [])
+
+        with patch.object(provider_module, "get_openai_client", return_value=client):
+            with self.assertRaises(LLMValidationError):
+                generate_llm_findings_with_usage_for_clauses(clauses, on_finding=lambda f: None)
+
+
+@override_settings(
+    LLM_PROVIDER="mock",
+    REVIEW_ENABLE_PIPELINE_CACHE=False,
+    REVIEW_ENABLE_CLAUSE_CACHE=False,
+    REVIEW_LLM_STREAM_FINDINGS=True,
+)
+class IncrementalFindingPersistenceTests(TestCase):
+    def setUp(self):
+        self.document = Document.objects.create(
+            title="Incremental Contract",
+            text=(
+                "1. Termination\n"
+                "Either party may terminate this agreement with 15 days notice.\n\n"
+                "2. Indemnity\n"
+                "Vendor agrees to indemnify and hold harmless the customer."
+            ),
+        )
+
+    def _run_with_llm(self, fake_llm):
+        run = create_queued_review_run(self.document)
+        with patch(
+            "apps.review.services.generate_llm_findings_with_usage_for_clauses",
+            side_effect=fake_llm,
+        ):
+            process_review_run(str(run.id))
+        run.refresh_from_db()
+        return run
+
+    def test_llm_findings_are_persisted_while_the_stage_runs(self):
+        persisted = threading.Event()
+        real_add = services_module._IncrementalFindingWriter.add
+        seen_while_running = []
+
+        def tracking_add(writer, findings):
+            real_add(writer, findings)
+            if any(f.get("source") == "llm" for f in findings):
+                seen_while_running.append(writer.run.status)
+                persisted.set()
+
+        def fake_llm(clauses, **kwargs):
+            findings, model, usage = provider_module.generate_llm_findings_with_usage_for_clauses(
+                clauses, **kwargs
+            )
+            # Stay "in flight" until the orchestrating thread has written the first findings.
+            self.assertTrue(persisted.wait(timeout=5))
+            return findings, model, usage
+
+        with patch.object(services_module._IncrementalFindingWriter, "add", tracking_add):
+            run = self._run_with_llm(fake_llm)
+
+        self.assertEqual(run.status, "succeeded")
+        self.assertEqual(seen_while_running[0], "running")
+        self.assertIn("first_finding_ms", run.stage_timings)
+        self.assertEqual(run.llm_model, "mock")
+        findings = Finding.objects.filter(run=run)
+        self.assertEqual(findings.filter(source="llm").count(), 2)
+        self.assertEqual(findings.filter(source="rule").count(), 2)
+        self.assertEqual(findings.values("id").distinct().count(), findings.count())
+        self.assertEqual(ReviewChunk.objects.filter(run=run).count(), 2)
+
+    @override_settings(REVIEW_ENABLE_EMBEDDINGS=True, REVIEW_EMBEDDING_PROVIDER="mock")
+    def test_streamed_findings_are_embedded_with_one_pgvector_sync(self):
+        def fake_llm(clauses, **kwargs):
+            return provider_module.generate_llm_findings_with_usage_for_clauses(clauses, **kwargs)
+
+        with patch("apps.review.services.sync_pgvector_embeddings") as sync:
+            run = self._run_with_llm(fake_llm)
+
+        self.assertEqual(run.status, "succeeded")
+        findings = Finding.objects.filter(run=run)
+        self.assertEqual(sync.call_count, 1)
+        self.assertEqual(len(sync.call_args.args[0]), findings.count())
+        self.assertFalse(findings.filter(embedding__isnull=True).exists())
+
+    def test_llm_failure_after_streamed_findings_keeps_rule_findings_only(self):
+        def failing_llm(clauses, **kwargs):
+            provider_module.generate_llm_findings_with_usage_for_clauses(clauses[:1], **kwargs)
+            raise TimeoutError("stream interrupted")
+
+        run = self._run_with_llm(failing_llm)
+
+        self.assertEqual(run.status, "partial")
+        self.assertIsNone(run.llm_model)
+        findings = Finding.objects.filter(run=run)
+        self.assertGreater(findings.count(), 0)
+        self.assertTrue(all(f.source == "rule" for f in findings))
+
+
+@override_settings(LLM_PROVIDER="mock", REVIEW_ENABLE_PIPELINE_CACHE=False, REVIEW_ENABLE_EMBEDDINGS=False)
+class RulesReevaluationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.document = Document.objects.create(
+            title="Re-evaluation Contract",
+            text=(
+                "1. Termination\n"
+                "Either party may terminate this agreement with 15 days notice.\n\n"
+                "2. Indemnity\n"
+                "Vendor agrees to indemnify and hold harmless the customer.\n\n"
+                "3. Governing Law\n"
+                "This agreement is governed by the laws of New York."
+            ),
+        )
+        self.source_run = create_queued_review_run(self.document)
+        process_review_run(str(self.source_run.id))
+
+    def _rule_findings(self, run):
+        return sorted(
+            (f.chunk_id, f.rule_code, f.severity, f.summary, f.evidence)
+            for f in Finding.objects.filter(run=run, source="rule")
+        )
+
+    def test_keyset_pages_cover_every_chunk_once(self):
+        pages = list(iter_chunk_pages([str(self.source_run.id)], page_size=2))
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual([c["ordinal"] for page in pages for c in page], [1, 2, 3])
+
+    def test_writes_rules_only_run_without_calling_llm(self):
+        with patch.object(provider_module, "call_llm_for_clauses", side_effect=AssertionError("LLM called")):
+            result = reevaluate_rules(page_size=2, workers=1)
+
+        self.assertEqual((result.runs, result.chunks), (1, 3))
+        rules_run = ReviewRun.objects.get(kind=ReviewRunKind.RULES_ONLY)
+        self.assertEqual(rules_run.status, "succeeded")
+        self.assertEqual(rules_run.rule_pack, get_rule_registry().label)
+        self.assertEqual(rules_run.chunks.count(), 3)
+        self.assertFalse(Finding.objects.filter(run=rules_run, source="llm").exists())
+        self.assertEqual(self._rule_findings(rules_run), self._rule_findings(self.source_run))
+        self.assertEqual(result.findings, 3)
+
+        resp = self.client.get(f"/v1/documents/{self.document.id}/findings")
+        self.assertEqual(resp.data["run"]["id"], str(self.source_run.id))
+
+    def test_process_pool_matches_inline_evaluation(self):
+        reevaluate_rules(page_size=1, workers=2)
+        rules_run = ReviewRun.objects.get(kind=ReviewRunKind.RULES_ONLY)
+        self.assertEqual(self._rule_findings(rules_run), self._rule_findings(self.source_run))
+
+    def test_spreadsheet_findings_keep_their_evidence_pointers(self):
+        text, metadata = parse_csv_bytes(
+            b"Clause,Detail\n"
+            b"Termination,Either party may terminate with 15 days notice\n"
+            b"Indemnity,Vendor agrees to indemnify and hold harmless the customer\n"
+        )
+        sheet = Document.objects.create(
+            title="Spreadsheet", text=text, source_type="spreadsheet", ingestion_metadata=metadata
+        )
+        source_run = create_queued_review_run(sheet)
+        process_review_run(str(source_run.id))
+
+        reevaluate_rules(document_ids=[str(sheet.id)], workers=1)
+
+        rules_run = ReviewRun.objects.get(kind=ReviewRunKind.RULES_ONLY, document=sheet)
+        spans = sorted(
+            (f.chunk_id, f.rule_code, f.evidence_span["pointer"]["row_start"])
+            for f in Finding.objects.filter(run=rules_run)
+        )
+        self.assertEqual(len(spans), 2)
+        self.assertEqual(
+            spans,
+            sorted(
+                (f.chunk_id, f.rule_code, f.evidence_span["pointer"]["row_start"])
+                for f in Finding.objects.filter(run=source_run, source="rule")
+            ),
+        )
 
 
 @override_settings(LLM_PROVIDER="mock", REVIEW_MAX_CONCURRENT_RUNS=1, REVIEW_RATE_LIMIT_PER_MINUTE=10)
 class ConcurrencyLimitTests(TestCase):
     def setUp(self):
+        caches["pipeline"].clear()
+        admission._local_buckets.clear()
         self.client = APIClient()
         self.document = Document.objects.create(
             title="Concurrent Contract",
@@ -422,11 +1747,7 @@ class ConcurrencyLimitTests(TestCase):
         )
 
     def test_rejects_when_concurrency_cap_reached(self):
-        ReviewRun.objects.create(
-            document=self.document,
-            status="queued",
-            request_fingerprint="ip:127.0.0.1",
-        )
+        ReviewRun.objects.create(document=self.document, status=ReviewRunStatus.RUNNING)
         resp = self.client.post(
             "/v1/review/run",
             {"document_id": str(self.document.id)},
@@ -434,11 +1755,153 @@ class ConcurrencyLimitTests(TestCase):
         )
         self.assertEqual(resp.status_code, 429)
         self.assertIn("Too many concurrent review runs", resp.data["detail"])
+        self.assertEqual(admission.active_run_slots(), 1)
+
+    @patch("apps.review.views.process_review_run_task.delay")
+    def test_database_slot_count_runs_under_the_admission_lock(self, mock_delay):
+        lock = AdmissionLock.objects.select_for_update
+        with patch.object(AdmissionLock.objects, "select_for_update", wraps=lock) as spy:
+            first = self.client.post(
+                "/v1/review/run", {"document_id": str(self.document.id)}, format="json"
+            )
+            second = self.client.post(
+                "/v1/review/run", {"document_id": str(self.document.id)}, format="json"
+            )
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(second.status_code, 429)
+        self.assertEqual(spy.call_count, 2)
+        self.assertTrue(AdmissionLock.objects.filter(name="active-runs").exists())
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_slot_is_released_when_the_run_task_finishes(self):
+        for _ in range(2):
+            resp = self.client.post(
+                "/v1/review/run",
+                {"document_id": str(self.document.id)},
+                format="json",
+            )
+            self.assertEqual(resp.status_code, 202)
+            self.assertEqual(admission.active_run_slots(), 0)
+
+    @patch("apps.review.views.process_review_run_task.delay", side_effect=RuntimeError("broker down"))
+    def test_slot_is_released_when_enqueue_fails(self, mock_delay):
+        resp = self.client.post(
+            "/v1/review/run",
+            {"document_id": str(self.document.id)},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(admission.active_run_slots(), 0)
+
+    def test_web_and_worker_with_separate_caches_do_not_leak_slots(self):
+        # runserver and `celery worker` without REVIEW_CACHE_REDIS_URL each get their own
+        # LocMem "pipeline" cache: acquire happens in one, release in the other.
+        web_cache = LocMemCache("admission-web", {})
+        worker_cache = LocMemCache("admission-worker", {})
+
+        for _ in range(3):
+            with patch("apps.review.admission._cache", return_value=web_cache), patch(
+                "apps.review.views.process_review_run_task.delay"
+            ):
+                resp = self.client.post(
+                    "/v1/review/run",
+                    {"document_id": str(self.document.id)},
+                    format="json",
+                )
+            self.assertEqual(resp.status_code, 202)
+            with patch("apps.review.admission._cache", return_value=worker_cache):
+                process_review_run_task.apply(args=[resp.data["run"]["id"]])
+            self.assertEqual(ReviewRun.objects.get(id=resp.data["run"]["id"]).status, "succeeded")
+
+
+@skipUnless(os.getenv("REVIEW_TEST_REDIS_URL"), "set REVIEW_TEST_REDIS_URL to run against Redis")
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "pipeline": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REVIEW_TEST_REDIS_URL", ""),
+            "KEY_PREFIX": "ai-legal-tests",
+        },
+    },
+    REVIEW_MAX_CONCURRENT_RUNS=5,
+)
+class RedisAdmissionSlotTests(TestCase):
+    def setUp(self):
+        caches["pipeline"].clear()
+
+    def test_slots_are_exact_under_concurrent_acquires(self):
+        barrier = threading.Barrier(20)
+        admitted = []
+
+        def acquire():
+            barrier.wait()
+            admitted.append(admission.try_acquire_run_slot())
+
+        threads = [threading.Thread(target=acquire) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(token is not None for token in admitted), 5)
+        self.assertEqual(admission.active_run_slots(), 5)
+
+    def test_bound_slot_is_released_once_and_expired_slots_are_pruned(self):
+        token = admission.try_acquire_run_slot()
+        admission.bind_run_slot("run-1", token)
+        self.assertEqual(admission.active_run_slots(), 1)
+        self.assertTrue(admission.release_run_slot("run-1"))
+        self.assertFalse(admission.release_run_slot("run-1"))
+        self.assertEqual(admission.active_run_slots(), 0)
+
+        with self.settings(REVIEW_ADMISSION_SLOT_TTL_SECONDS=1, REVIEW_MAX_CONCURRENT_RUNS=1):
+            # A slot whose worker was killed (never released) expires on its own.
+            self.assertIsNotNone(admission.try_acquire_run_slot())
+            self.assertIsNone(admission.try_acquire_run_slot())
+            time.sleep(1.1)
+            self.assertIsNotNone(admission.try_acquire_run_slot())
 
 
-@override_settings(LLM_PROVIDER="mock", REVIEW_MAX_CONCURRENT_RUNS=50, REVIEW_RATE_LIMIT_PER_MINUTE=1)
+@skipUnless(os.getenv("REVIEW_TEST_REDIS_URL"), "set REVIEW_TEST_REDIS_URL to run against Redis")
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "pipeline": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REVIEW_TEST_REDIS_URL", ""),
+            "KEY_PREFIX": "ai-legal-tests",
+        },
+    },
+    REVIEW_CACHE_ALIAS="pipeline",
+)
+class RedisSingleFlightTests(TestCase):
+    def setUp(self):
+        caches["pipeline"].clear()
+
+    def test_expired_owner_does_not_release_the_next_owners_lock(self):
+        stale = pipeline_cache.acquire_flight("review:flight", ttl=1)
+        time.sleep(1.1)
+        current = pipeline_cache.acquire_flight("review:flight", ttl=60)
+        self.assertIsNotNone(current)
+
+        pipeline_cache.release_flight("review:flight", stale)
+        self.assertIsNone(pipeline_cache.acquire_flight("review:flight", ttl=60))
+        pipeline_cache.release_flight("review:flight", current)
+        self.assertIsNotNone(pipeline_cache.acquire_flight("review:flight", ttl=60))
+
+
+@override_settings(
+    LLM_PROVIDER="mock",
+    CELERY_TASK_ALWAYS_EAGER=True,
+    REVIEW_MAX_CONCURRENT_RUNS=50,
+    REVIEW_RATE_LIMIT_PER_MINUTE=1,
+)
 class RateLimitTests(TestCase):
     def setUp(self):
+        caches["pipeline"].clear()
+        admission._local_buckets.clear()
         self.client = APIClient()
         self.document = Document.objects.create(
             title="Rate Limit Contract",
@@ -446,11 +1909,12 @@ class RateLimitTests(TestCase):
         )
 
     def test_rejects_when_rate_limit_reached(self):
-        ReviewRun.objects.create(
-            document=self.document,
-            status="succeeded",
-            request_fingerprint="ip:127.0.0.1",
+        first = self.client.post(
+            "/v1/review/run",
+            {"document_id": str(self.document.id)},
+            format="json",
         )
+        self.assertEqual(first.status_code, 202)
         resp = self.client.post(
             "/v1/review/run",
             {"document_id": str(self.document.id)},
@@ -458,6 +1922,16 @@ class RateLimitTests(TestCase):
         )
         self.assertEqual(resp.status_code, 429)
         self.assertIn("Rate limit exceeded", resp.data["detail"])
+        # A rate-limited request does not hold on to a concurrency slot.
+        self.assertEqual(admission.active_run_slots(), 0)
+
+    @override_settings(REVIEW_RATE_LIMIT_PER_MINUTE=60)
+    def test_token_bucket_refills_continuously_per_requester(self):
+        with patch("apps.review.admission.time.time", return_value=1000.0):
+            self.assertEqual(sum(admission.take_rate_token("ip:10.0.0.1") for _ in range(61)), 60)
+            self.assertTrue(admission.take_rate_token("ip:10.0.0.2"))
+        with patch("apps.review.admission.time.time", return_value=1002.5):
+            self.assertEqual(sum(admission.take_rate_token("ip:10.0.0.1") for _ in range(5)), 2)
 
 
 @override_settings(LLM_PROVIDER="mock", REVIEW_ENABLE_PIPELINE_CACHE=False)
@@ -0,0 +1,102 @@
+"""Rule-signal triage ahead of the LLM stage.
+
+Each clause gets a cheap score in [0, 1]: clauses that fire a rule trigger always score 1.0;
+otherwise the score comes from legal-term density, discounted for signature blocks,
+definition lists and number-heavy rows. Only clauses at or above the threshold are sent to
+the LLM; the rules still run on every clause.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+from apps.review.llm.provider import estimate_clause_tokens
+from apps.review.rules import RuleScanner, get_rule_registry
+
+_LEGAL_TERMS_RE = re.compile(
+    r"\b(?:shall|must|may\s+not|agree[sd]?|liab\w*|warrant\w*|represent\w*|obligat\w*|"
+    r"indemn\w*|terminat\w*|breach\w*|remed\w*|penalt\w*|damages|fees?|pay(?:s|ment)?|"
+    r"exclusiv\w*|assign\w*|govern\w*|disputes?|arbitrat\w*|renew\w*|waive\w*|notice|"
+    r"confidential\w*|licen[cs]\w*|intellectual\s+property|limitation|insurance)\b",
+    re.IGNORECASE,
+)
+_SIGNATURE_LINE_RE = re.compile(
+    r"^\s*(?:by|name|title|date|signature|signed)\s*:|in\s+witness\s+whereof",
+    re.IGNORECASE | re.MULTILINE,
+)
+_DEFINITION_LINE_RE = re.compile(
+    r"^\s*[\"“][^\"”\n]{1,80}[\"”]\s+(?:means|shall\s+mean|has\s+the\s+meaning)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_WORD_RE = re.compile(r"[A-Za-z]{2,}")
+
+# Legal terms needed for a full lexical score.
+_FULL_SCORE_TERMS = 3
+
+
+@dataclass
+class TriageResult:
+    selected: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: List[Dict[str, Any]] = field(default_factory=list)
+    saved_tokens: int = 0
+
+    def usage(self) -> Dict[str, int]:
+        return {
+            "triage_skipped_clauses": len(self.skipped),
+            "triage_saved_tokens_estimate": self.saved_tokens,
+        }
+
+
+def triage_enabled() -> bool:
+    return bool(getattr(settings, "REVIEW_LLM_TRIAGE_ENABLED", False))
+
+
+def triage_threshold() -> float:
+    return float(getattr(settings, "REVIEW_LLM_TRIAGE_THRESHOLD", 0.3))
+
+
+def score_clause(clause: Dict[str, Any], scanner: Optional[RuleScanner] = None) -> float:
+    scanner = scanner or get_rule_registry().scanner
+    text = f"{clause.get('heading', '')}\n{clause.get('body', '')}"
+    if scanner.matching(text):
+        return 1.0
+
+    body = clause.get("body") or ""
+    words = _WORD_RE.findall(body)
+    if not words:
+        return 0.0
+
+    score = min(1.0, len(_LEGAL_TERMS_RE.findall(body)) / _FULL_SCORE_TERMS)
+
+    lines = [line for line in body.split("\n") if line.strip()] or [body]
+    if len(_SIGNATURE_LINE_RE.findall(body)) >= 2:
+        score *= 0.25
+    if len(_DEFINITION_LINE_RE.findall(body)) * 2 >= len(lines):
+        score *= 0.5
+    letters = sum(len(word) for word in words)
+    non_space = sum(1 for char in body if not char.isspace())
+    if non_space and letters / non_space < 0.5:
+        # Mostly numbers and punctuation, e.g. spreadsheet rows of amounts and dates.
+        score *= 0.5
+    return round(score, 4)
+
+
+def triage_clauses(
+    clauses: Sequence[Dict[str, Any]],
+    *,
+    threshold: Optional[float] = None,
+    scanner: Optional[RuleScanner] = None,
+) -> TriageResult:
+    """Split clauses into those worth an LLM call and those skipped as boilerplate."""
+    threshold = triage_threshold() if threshold is None else threshold
+    scanner = scanner or get_rule_registry().scanner
+    result = TriageResult()
+    for clause in clauses:
+        if score_clause(clause, scanner) >= threshold:
+            result.selected.append(clause)
+        else:
+            result.skipped.append(clause)
+            result.saved_tokens += estimate_clause_tokens(clause)
+    return result
@@ -1,14 +1,29 @@
-from datetime import timedelta
+import asyncio
+import json
 
 from django.conf import settings
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.documents.models import Document
+from apps.documents.models import Document, DocumentIngestionStatus
+from apps.review.admission import (
+    bind_run_slot,
+    concurrent_run_limit,
+    rate_limit_per_minute,
+    release_run_slot,
+    release_unbound_run_slot,
+    take_rate_token,
+    try_acquire_run_slot,
+)
+from apps.review.conditional import TERMINAL_STATUSES, conditional_run_response
+from apps.review.events import STATUS_EVENT, RunEventSubscription
 from apps.review.models import ReviewRun, ReviewRunStatus
+
 from .serializers import ReviewRunRequestSerializer, ReviewRunSerializer
 from .services import create_queued_review_run, find_idempotent_run
 from .tasks import process_review_run_task
@@ -23,13 +38,20 @@ def _request_fingerprint(request) -> str:
     return f"ip:{ip or 'unknown'}"
 
 
+def _ingestion_failed_response() -> Response:
+    return Response(
+        {"detail": "Document ingestion failed; upload it again to review it."},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
 class ReviewRunView(APIView):
     def post(self, request, *args, **kwargs):
         serializer = ReviewRunRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         document_id = serializer.validated_data["document_id"]
-        doc = get_object_or_404(Document, id=document_id)
+        doc = get_object_or_404(Document.objects.only("id", "title", "ingestion_status"), id=document_id)
 
         idempotency_key = request.headers.get("Idempotency-Key") or serializer.validated_data.get(
             "idempotency_key"
@@ -37,6 +59,9 @@ class ReviewRunView(APIView):
         if idempotency_key:
             idempotency_key = idempotency_key.strip()
 
+        if doc.ingestion_status == DocumentIngestionStatus.FAILED:
+            return _ingestion_failed_response()
+
         requester = _request_fingerprint(request)
         run, reused, expired_key = find_idempotent_run(doc, idempotency_key)
         if expired_key:
@@ -49,41 +74,51 @@ class ReviewRunView(APIView):
             )
 
         if not reused:
-            concurrent_limit = max(1, int(settings.REVIEW_MAX_CONCURRENT_RUNS))
-            active_count = ReviewRun.objects.filter(
-                status__in=[ReviewRunStatus.QUEUED, ReviewRunStatus.RUNNING]
-            ).count()
-            if active_count >= concurrent_limit:
-                return Response(
-                    {
-                        "detail": "Too many concurrent review runs. Try again shortly.",
-                        "limit": concurrent_limit,
-                    },
-                    status=status.HTTP_429_TOO_MANY_REQUESTS,
-                )
-
-            rate_limit = max(1, int(settings.REVIEW_RATE_LIMIT_PER_MINUTE))
-            window_start = timezone.now() - timedelta(minutes=1)
-            recent_count = ReviewRun.objects.filter(
-                request_fingerprint=requester,
-                created_at__gte=window_start,
-            ).count()
-            if recent_count >= rate_limit:
-                return Response(
-                    {
-                        "detail": "Rate limit exceeded for review run requests.",
-                        "limit_per_minute": rate_limit,
-                    },
-                    status=status.HTTP_429_TOO_MANY_REQUESTS,
-                )
-
-            run = create_queued_review_run(
-                doc,
-                idempotency_key=idempotency_key,
-                request_fingerprint=requester,
-            )
-
-        if not reused:
+            # Without Redis the slot is counted in the database under a row lock that is held
+            # until this transaction commits with the new run in it.
+            with transaction.atomic():
+                slot = try_acquire_run_slot()
+                if slot is None:
+                    return Response(
+                        {
+                            "detail": "Too many concurrent review runs. Try again shortly.",
+                            "limit": concurrent_run_limit(),
+                        },
+                        status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    )
+
+                if not take_rate_token(requester):
+                    release_unbound_run_slot(slot)
+                    return Response(
+                        {
+                            "detail": "Rate limit exceeded for review run requests.",
+                            "limit_per_minute": rate_limit_per_minute(),
+                        },
+                        status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    )
+
+                try:
+                    # Serialized with the end of ingestion (documents.services): a run created
+                    # while the document is still ingesting is enqueued when extraction finishes.
+                    doc = Document.objects.select_for_update().only("id", "title", "ingestion_status").get(id=doc.id)
+                    if doc.ingestion_status == DocumentIngestionStatus.FAILED:
+                        run = None
+                    else:
+                        run = create_queued_review_run(
+                            doc,
+                            idempotency_key=idempotency_key,
+                            request_fingerprint=requester,
+                        )
+                except Exception:
+                    release_unbound_run_slot(slot)
+                    raise
+            if run is None:
+                release_unbound_run_slot(slot)
+                return _ingestion_failed_response()
+            bind_run_slot(run.id, slot)
+
+        waiting_for_ingestion = doc.ingestion_status == DocumentIngestionStatus.INGESTING
+        if not reused and not waiting_for_ingestion:
             try:
                 process_review_run_task.delay(str(run.id))
             except Exception as exc:
@@ -91,6 +126,7 @@ class ReviewRunView(APIView):
                 run.error = f"Failed to enqueue review run: {exc}"
                 run.completed_at = timezone.now()
                 run.save(update_fields=["status", "error", "completed_at"])
+                release_run_slot(run.id)
                 return Response(
                     {
                         "detail": "Failed to enqueue review run.",
@@ -102,7 +138,11 @@ class ReviewRunView(APIView):
                 run.refresh_from_db()
 
         payload = {
-            "document": {"id": str(doc.id), "title": doc.title},
+            "document": {
+                "id": str(doc.id),
+                "title": doc.title,
+                "ingestion_status": doc.ingestion_status,
+            },
             "clauses": [],
             "findings": [],
             "run": ReviewRunSerializer(run).data,
@@ -115,10 +155,66 @@ class ReviewRunView(APIView):
 class ReviewRunStatusView(APIView):
     def get(self, request, run_id, *args, **kwargs):
         run = get_object_or_404(ReviewRun.objects.select_related("document"), id=run_id)
-        return Response(
-            {
-                "run": ReviewRunSerializer(run).data,
-                "document": {"id": str(run.document.id), "title": run.document.title},
-            },
-            status=status.HTTP_200_OK,
+        return conditional_run_response(
+            request,
+            run,
+            "status",
+            lambda: Response(
+                {
+                    "run": ReviewRunSerializer(run).data,
+                    "document": {"id": str(run.document.id), "title": run.document.title},
+                },
+                status=status.HTTP_200_OK,
+            ),
         )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _run_status_payload(run: ReviewRun) -> dict:
+    return {
+        "run_id": str(run.id),
+        "status": run.status,
+        "error": run.error,
+        "completed_at": run.completed_at.isoformat() if run.completed_at else None,
+        "findings_count": run.findings_count,
+    }
+
+
+async def _run_event_stream(run_id):
+    loop = asyncio.get_running_loop()
+    heartbeat = float(settings.REVIEW_EVENTS_HEARTBEAT_SECONDS)
+    deadline = loop.time() + float(settings.REVIEW_EVENTS_MAX_STREAM_SECONDS)
+    async with RunEventSubscription(run_id) as subscription:
+        # Subscribed before the snapshot is read, so no transition falls in between.
+        run = await ReviewRun.objects.aget(id=run_id)
+        yield _sse("snapshot", {**_run_status_payload(run), "current_stage": run.current_stage})
+        if run.status in TERMINAL_STATUSES:
+            yield _sse(STATUS_EVENT, _run_status_payload(run))
+            return
+
+        while loop.time() < deadline:
+            event = await subscription.next_event(timeout=heartbeat)
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(event["event"], event["data"])
+            if event["event"] == STATUS_EVENT and event["data"].get("status") in TERMINAL_STATUSES:
+                return
+
+
+async def review_run_events(request, run_id):
+    """Server-Sent Events for a run: GET /v1/review-runs/{id}/events.
+
+    Sends a snapshot of the run, then stage transitions, LLM batch progress, findings
+    counts and the final status as the pipeline publishes them, and closes once the run
+    has finished. Needs an ASGI server (backend/asgi.py) to stream.
+    """
+    if not await ReviewRun.objects.filter(id=run_id).aexists():
+        raise Http404("Review run not found.")
+    response = StreamingHttpResponse(_run_event_stream(run_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
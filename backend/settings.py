@@ -1,3 +1,4 @@
+import importlib.util
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -16,6 +17,13 @@ LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # or "gpt-4o"
 OPENAI_EMBEDDING_MODEL = os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small")
+# Point at any OpenAI-compatible endpoint (e.g. a local stand-in); empty uses the SDK default.
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "5"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "10"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -48,6 +56,10 @@ INSTALLED_APPS = [
     "apps.review",
 ]
 
+# With daphne installed, runserver serves backend/asgi.py so SSE responses stream.
+if importlib.util.find_spec("daphne") is not None:
+    INSTALLED_APPS.insert(0, "daphne")
+
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -77,6 +89,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 # Database
@@ -104,6 +117,31 @@ else:
     }
 
 
+# Caches
+# The "pipeline" alias is the shared L2 behind apps.review.cache. Point it at Redis so
+# every Celery worker shares hits; without a URL it falls back to a per-process cache.
+
+REVIEW_CACHE_REDIS_URL = os.getenv("REVIEW_CACHE_REDIS_URL", "")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "pipeline": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REVIEW_CACHE_REDIS_URL,
+            "KEY_PREFIX": "ai-legal",
+        }
+        if REVIEW_CACHE_REDIS_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "review-pipeline",
+        }
+    ),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -140,6 +178,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded documents are spooled here before ingestion; web and worker must share it.
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", str(BASE_DIR / "media"))
+MEDIA_URL = "media/"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -163,11 +205,44 @@ CELERY_TASK_TIME_LIMIT = int(os.getenv("CELERY_TASK_TIME_LIMIT", "1800"))
 CELERY_TASK_ALWAYS_EAGER = env_bool("CELERY_TASK_ALWAYS_EAGER", default=False)
 CELERY_TASK_EAGER_PROPAGATES = env_bool("CELERY_TASK_EAGER_PROPAGATES", default=True)
 
+# Document ingestion: extract text in a Celery worker instead of the upload request.
+DOCUMENT_INGESTION_ASYNC = env_bool("DOCUMENT_INGESTION_ASYNC", default=True)
+DOCUMENT_DEDUP_ENABLED = env_bool("DOCUMENT_DEDUP_ENABLED", default=False)
+DOCUMENT_SPREADSHEET_BLOB_MIN_BYTES = int(os.getenv("DOCUMENT_SPREADSHEET_BLOB_MIN_BYTES", "262144"))
+DOCUMENT_PDF_WORKERS = int(os.getenv("DOCUMENT_PDF_WORKERS", "0"))
+DOCUMENT_PDF_CELERY_FAN_OUT = env_bool("DOCUMENT_PDF_CELERY_FAN_OUT", default=True)
+DOCUMENT_PDF_PAGES_PER_TASK = int(os.getenv("DOCUMENT_PDF_PAGES_PER_TASK", "8"))
+DOCUMENT_PDF_PAGE_TIMEOUT_SECONDS = float(os.getenv("DOCUMENT_PDF_PAGE_TIMEOUT_SECONDS", "10"))
+DOCUMENT_PDF_PAGE_CACHE_ALIAS = os.getenv("DOCUMENT_PDF_PAGE_CACHE_ALIAS", "pipeline")
+DOCUMENT_PDF_PAGE_CACHE_TTL_SECONDS = int(os.getenv("DOCUMENT_PDF_PAGE_CACHE_TTL_SECONDS", "604800"))
+
 # Review orchestration controls (Phase 2.8)
 REVIEW_MAX_CONCURRENT_RUNS = int(os.getenv("REVIEW_MAX_CONCURRENT_RUNS", "5"))
 REVIEW_RATE_LIMIT_PER_MINUTE = int(os.getenv("REVIEW_RATE_LIMIT_PER_MINUTE", "20"))
+REVIEW_ADMISSION_CACHE_ALIAS = os.getenv("REVIEW_ADMISSION_CACHE_ALIAS", "pipeline")
+REVIEW_ADMISSION_SLOT_TTL_SECONDS = int(os.getenv("REVIEW_ADMISSION_SLOT_TTL_SECONDS", "7200"))
 REVIEW_CACHE_TTL_SECONDS = int(os.getenv("REVIEW_CACHE_TTL_SECONDS", "3600"))
 REVIEW_ENABLE_PIPELINE_CACHE = env_bool("REVIEW_ENABLE_PIPELINE_CACHE", default=True)
+REVIEW_CACHE_ALIAS = os.getenv("REVIEW_CACHE_ALIAS", "pipeline")
+REVIEW_CACHE_L1_MAX_BYTES = int(os.getenv("REVIEW_CACHE_L1_MAX_BYTES", str(64 * 1024 * 1024)))
+REVIEW_CACHE_L1_TTL_SECONDS = int(os.getenv("REVIEW_CACHE_L1_TTL_SECONDS", "300"))
+REVIEW_CACHE_COMPRESS_LEVEL = int(os.getenv("REVIEW_CACHE_COMPRESS_LEVEL", "6"))
+REVIEW_SINGLE_FLIGHT_ENABLED = env_bool("REVIEW_SINGLE_FLIGHT_ENABLED", default=True)
+REVIEW_SINGLE_FLIGHT_LOCK_TTL_SECONDS = int(os.getenv("REVIEW_SINGLE_FLIGHT_LOCK_TTL_SECONDS", "900"))
+REVIEW_SINGLE_FLIGHT_WAIT_SECONDS = int(os.getenv("REVIEW_SINGLE_FLIGHT_WAIT_SECONDS", "600"))
+REVIEW_SINGLE_FLIGHT_RETRY_SECONDS = int(os.getenv("REVIEW_SINGLE_FLIGHT_RETRY_SECONDS", "5"))
+REVIEW_ENABLE_CHECKPOINTS = env_bool("REVIEW_ENABLE_CHECKPOINTS", default=True)
+REVIEW_ENABLE_CLAUSE_CACHE = env_bool("REVIEW_ENABLE_CLAUSE_CACHE", default=True)
+REVIEW_CLAUSE_CACHE_TTL_SECONDS = int(os.getenv("REVIEW_CLAUSE_CACHE_TTL_SECONDS", "604800"))
+REVIEW_RULE_PACKS = [
+    path.strip()
+    for path in os.getenv(
+        "REVIEW_RULE_PACKS", str(BASE_DIR / "apps" / "review" / "rule_packs" / "default.json")
+    ).split(",")
+    if path.strip()
+]
+REVIEW_REEVALUATE_PAGE_SIZE = int(os.getenv("REVIEW_REEVALUATE_PAGE_SIZE", "500"))
+REVIEW_REEVALUATE_WORKERS = int(os.getenv("REVIEW_REEVALUATE_WORKERS", "0"))
 REVIEW_ENABLE_EMBEDDINGS = env_bool("REVIEW_ENABLE_EMBEDDINGS", default=True)
 REVIEW_EMBEDDING_PROVIDER = os.getenv(
     "REVIEW_EMBEDDING_PROVIDER",
@@ -176,3 +251,19 @@ REVIEW_EMBEDDING_PROVIDER = os.getenv(
 REVIEW_EMBEDDING_DIM = int(os.getenv("REVIEW_EMBEDDING_DIM", "1536"))
 REVIEW_FINDINGS_DEFAULT_PAGE_SIZE = int(os.getenv("REVIEW_FINDINGS_DEFAULT_PAGE_SIZE", "50"))
 REVIEW_FINDINGS_MAX_PAGE_SIZE = int(os.getenv("REVIEW_FINDINGS_MAX_PAGE_SIZE", "200"))
+REVIEW_EXPORT_CHUNK_SIZE = int(os.getenv("REVIEW_EXPORT_CHUNK_SIZE", "2000"))
+REVIEW_RESPONSE_CACHE_ALIAS = os.getenv("REVIEW_RESPONSE_CACHE_ALIAS", "pipeline")
+REVIEW_RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("REVIEW_RESPONSE_CACHE_TTL_SECONDS", "3600"))
+# Run progress pub/sub for SSE; defaults to the shared cache Redis so workers reach the web process.
+REVIEW_EVENTS_REDIS_URL = os.getenv("REVIEW_EVENTS_REDIS_URL", REVIEW_CACHE_REDIS_URL)
+REVIEW_EVENTS_HEARTBEAT_SECONDS = int(os.getenv("REVIEW_EVENTS_HEARTBEAT_SECONDS", "15"))
+REVIEW_EVENTS_MAX_STREAM_SECONDS = int(os.getenv("REVIEW_EVENTS_MAX_STREAM_SECONDS", "1800"))
+REVIEW_LLM_BATCH_MAX_TOKENS = int(os.getenv("REVIEW_LLM_BATCH_MAX_TOKENS", "6000"))
+REVIEW_LLM_MAX_CONCURRENCY = int(os.getenv("REVIEW_LLM_MAX_CONCURRENCY", "4"))
+REVIEW_LLM_STREAM_FINDINGS = env_bool("REVIEW_LLM_STREAM_FINDINGS", default=False)
+REVIEW_LLM_TRIAGE_ENABLED = env_bool("REVIEW_LLM_TRIAGE_ENABLED", default=False)
+REVIEW_LLM_TRIAGE_THRESHOLD = float(os.getenv("REVIEW_LLM_TRIAGE_THRESHOLD", "0.3"))
+# Documents at least this long use the streaming pipeline (0 disables streaming).
+REVIEW_STREAMING_MIN_CHARS = int(os.getenv("REVIEW_STREAMING_MIN_CHARS", "500000"))
+REVIEW_STREAMING_FLUSH_ROWS = int(os.getenv("REVIEW_STREAMING_FLUSH_ROWS", "100"))
+REVIEW_STREAMING_FLUSH_SECONDS = float(os.getenv("REVIEW_STREAMING_FLUSH_SECONDS", "1.0"))
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.http import JsonResponse
 from django.urls import include, path
 
-from apps.review.views import ReviewRunStatusView
+from apps.review.views import ReviewRunStatusView, review_run_events
 
 def health(request):
     return JsonResponse({"status": "ok", "app": "ai-legal-assistant-mvp"})
@@ -14,4 +14,5 @@ urlpatterns = [
     path("v1/documents/", include("apps.documents.urls")),
     path("v1/review/", include("apps.review.urls")),
     path("v1/review-runs/<uuid:run_id>", ReviewRunStatusView.as_view(), name="review-run-status"),
+    path("v1/review-runs/<uuid:run_id>/events", review_run_events, name="review-run-events"),
 ]
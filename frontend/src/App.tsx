@@ -1,8 +1,8 @@
 import { useMemo, useState } from "react";
 
-import { getDocumentFindings, uploadDocument } from "./services/documents";
+import { getDocumentFindings, uploadDocument, waitForIngestion } from "./services/documents";
 import { ApiError } from "./services/http";
-import { runReview } from "./services/review";
+import { isRunPending, runReview, waitForRun } from "./services/review";
 import type { DocumentSummary, Finding, ReviewRun } from "./types/api";
 
 type EvidenceExpandedState = Record<string, boolean>;
@@ -36,6 +36,7 @@ export default function App() {
   const [run, setRun] = useState<ReviewRun | null>(null);
   const [findings, setFindings] = useState<Finding[]>([]);
   const [isUploading, setIsUploading] = useState(false);
+  const [isIngesting, setIsIngesting] = useState(false);
   const [isRunning, setIsRunning] = useState(false);
   const [isRefreshing, setIsRefreshing] = useState(false);
   const [error, setError] = useState<string | null>(null);
@@ -58,16 +59,25 @@ export default function App() {
     setError(null);
     setIsUploading(true);
     try {
-      const uploaded = await uploadDocument(title.trim(), file);
+      let uploaded = await uploadDocument(title.trim(), file);
       setDocument(uploaded);
       setRun(null);
       setFindings([]);
       setExpandedEvidence({});
+      if (uploaded.ingestion_status === "ingesting") {
+        setIsIngesting(true);
+        uploaded = await waitForIngestion(uploaded.id);
+        setDocument(uploaded);
+      }
+      if (uploaded.ingestion_status === "failed") {
+        setError("Text extraction failed for this document. Upload it again.");
+      }
     } catch (err) {
       const message = err instanceof ApiError ? err.message : "Failed to upload document.";
       setError(message);
     } finally {
       setIsUploading(false);
+      setIsIngesting(false);
     }
   }
 
@@ -84,6 +94,11 @@ export default function App() {
       setRun(result.run);
       setFindings(result.findings);
       setExpandedEvidence({});
+      if (isRunPending(result.run)) {
+        const finished = await waitForRun(document.id, result.run.id);
+        setRun(finished.run);
+        setFindings(finished.findings);
+      }
     } catch (err) {
       const message = err instanceof ApiError ? err.message : "Failed to run analysis.";
       setError(message);
@@ -149,7 +164,7 @@ export default function App() {
             />
           </label>
           <button type="submit" className="btn-primary" disabled={isUploading}>
-            {isUploading ? "Uploading..." : "Upload"}
+            {isIngesting ? "Extracting text..." : isUploading ? "Uploading..." : "Upload"}
           </button>
         </form>
 
@@ -163,13 +178,21 @@ export default function App() {
           <div>
             <strong>Uploaded:</strong> {formatTimestamp(document?.created_at)}
           </div>
+          <div>
+            <strong>Ingestion:</strong> {document?.ingestion_status ?? "-"}
+          </div>
         </div>
       </section>
 
       <section className="panel">
         <h2>2. Run Analysis</h2>
         <div className="action-row">
-          <button type="button" className="btn-primary" disabled={!document || isRunning} onClick={onRunAnalysis}>
+          <button
+            type="button"
+            className="btn-primary"
+            disabled={!document || isIngesting || document.ingestion_status === "failed" || isRunning}
+            onClick={onRunAnalysis}
+          >
             {isRunning ? "Running..." : "Run Analysis"}
           </button>
           <button
@@ -1,4 +1,4 @@
-import { requestJson } from "./http";
+import { pollUntil, requestJson } from "./http";
 import type { DocumentFindingsResponse, DocumentSummary } from "../types/api";
 
 export async function uploadDocument(title: string, file: File): Promise<DocumentSummary> {
@@ -12,6 +12,18 @@ export async function uploadDocument(title: string, file: File): Promise<Documen
   });
 }
 
+export async function getDocument(documentId: string): Promise<DocumentSummary> {
+  return requestJson<DocumentSummary>(`/v1/documents/${documentId}`);
+}
+
+// Uploads return 202 with ingestion_status "ingesting" while text extraction runs in a worker.
+export async function waitForIngestion(documentId: string): Promise<DocumentSummary> {
+  return pollUntil(
+    () => getDocument(documentId),
+    (document) => document.ingestion_status !== "ingesting",
+  );
+}
+
 export async function getDocumentFindings(
   documentId: string,
   runId?: string,
@@ -44,3 +44,24 @@ export async function requestJson<T>(path: string, init?: RequestInit): Promise<
 
   return (await response.json()) as T;
 }
+
+const POLL_INTERVAL_MS = 1000;
+const POLL_TIMEOUT_MS = 10 * 60 * 1000;
+
+function sleep(ms: number): Promise<void> {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+export async function pollUntil<T>(load: () => Promise<T>, isDone: (value: T) => boolean): Promise<T> {
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  for (;;) {
+    const value = await load();
+    if (isDone(value)) {
+      return value;
+    }
+    if (Date.now() >= deadline) {
+      throw new ApiError("Timed out waiting for the server to finish.", 408);
+    }
+    await sleep(POLL_INTERVAL_MS);
+  }
+}
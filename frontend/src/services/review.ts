@@ -1,5 +1,12 @@
-import { requestJson } from "./http";
-import type { ReviewRunResponse } from "../types/api";
+import { getDocumentFindings } from "./documents";
+import { pollUntil, requestJson } from "./http";
+import type { DocumentFindingsResponse, ReviewRun, ReviewRunResponse } from "../types/api";
+
+const PENDING_RUN_STATUSES = ["queued", "running"];
+
+export function isRunPending(run: ReviewRun | null): boolean {
+  return !!run && PENDING_RUN_STATUSES.includes(run.status);
+}
 
 interface RunReviewRequest {
   document_id: string;
@@ -15,3 +22,11 @@ export async function runReview(documentId: string): Promise<ReviewRunResponse>
     body: JSON.stringify(payload),
   });
 }
+
+// Runs are processed by a Celery worker; poll the findings endpoint until the run finishes.
+export async function waitForRun(documentId: string, runId: string): Promise<DocumentFindingsResponse> {
+  return pollUntil(
+    () => getDocumentFindings(documentId, runId),
+    (result) => !isRunPending(result.run),
+  );
+}
@@ -1,7 +1,12 @@
 export interface DocumentSummary {
   id: string;
   title: string;
+  source_type?: string;
+  ingestion_status?: "ingesting" | "ready" | "failed";
+  ingestion?: Record<string, unknown> | null;
   created_at: string;
+  deduplicated?: boolean;
+  latest_run?: ReviewRun | null;
 }
 
 export interface ReviewRun {
@@ -29,7 +34,7 @@ export interface Finding {
   run_id: string | null;
   clause_id: string | null;
   clause_heading: string | null;
-  clause_body: string | null;
+  clause_body?: string | null;
   summary: string;
   explanation: string | null;
   severity: "low" | "medium" | "high" | string;